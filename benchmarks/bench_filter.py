@@ -0,0 +1,53 @@
+"""
+Measure how much parsing work a `PackageFilter` saves on large project pages by
+comparing the time taken to parse a page with and without a filter that
+selects a single version, for both HTML and JSON pages.
+
+Usage: python benchmarks/bench_filter.py [--files N] [--rounds N]
+"""
+
+from __future__ import annotations
+import argparse
+from collections.abc import Callable
+import json
+import time
+from common import make_project_json, make_project_page
+from pypi_simple import PackageFilter, ProjectPage
+
+
+def best_of(rounds: int, func: Callable[[], ProjectPage]) -> tuple[float, int]:
+    best = float("inf")
+    npkgs = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        page = func()
+        best = min(best, time.perf_counter() - start)
+        npkgs = len(page.packages)
+    return best, npkgs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    html = make_project_page("proj", args.files)
+    data = json.loads(make_project_json("proj", args.files))
+    filters = {
+        "none": None,
+        "version": PackageFilter(version=f"{args.files // 8}.1"),
+        "glob": PackageFilter(filename="*-1?.*"),
+        "not yanked": PackageFilter(yanked=False),
+    }
+    print(f"{'format':>6}  {'filter':>10}  {'packages':>8}  {'seconds':>8}")
+    for label, pkg_filter in filters.items():
+        for fmt, func in [
+            ("html", lambda: ProjectPage.from_html("proj", html, filter=pkg_filter)),
+            ("json", lambda: ProjectPage.from_json_data(data, filter=pkg_filter)),
+        ]:
+            elapsed, npkgs = best_of(args.rounds, func)
+            print(f"{fmt:>6}  {label:>10}  {npkgs:>8}  {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
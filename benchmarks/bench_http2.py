@@ -0,0 +1,117 @@
+"""
+Compare throughput of many small `PyPISimple.get_project_page()` requests made
+over HTTP/1.1 with requests against the same requests multiplexed over a single
+HTTP/2 connection with `pypi_simple.http2.HTTP2Adapter`.
+
+The local server is run with Hypercorn using cleartext HTTP/2 ("h2c") with
+prior knowledge, so no TLS setup is needed.
+
+Requirements: pypi-simple[http2], hypercorn
+
+Usage: python benchmarks/bench_http2.py [--threads N] [--requests N]
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import socket
+import threading
+import time
+from typing import Any
+from common import make_project_page
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+from pypi_simple import ConnectionOptions, PyPISimple
+from pypi_simple.http2 import HTTP2Adapter
+
+
+def make_app(body: bytes, latency: float) -> Any:
+    async def app(scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                msg = await receive()
+                if msg["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif msg["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        assert scope["type"] == "http"
+        if latency:
+            await asyncio.sleep(latency)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/html"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+@contextmanager
+def h2c_server(body: bytes, latency: float) -> Iterator[str]:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.loglevel = "WARNING"
+    loop = asyncio.new_event_loop()
+    shutdown = asyncio.Event()
+
+    def run() -> None:
+        loop.run_until_complete(
+            serve(make_app(body, latency), config, shutdown_trigger=shutdown.wait)
+        )
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    time.sleep(1)
+    try:
+        yield f"http://127.0.0.1:{port}/simple/"
+    finally:
+        loop.call_soon_threadsafe(shutdown.set)
+        thread.join(5)
+
+
+def run(client: PyPISimple, threads: int, nrequests: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for _ in pool.map(
+            client.get_project_page, [f"proj{i % 50}" for i in range(nrequests)]
+        ):
+            pass
+    return nrequests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=5)
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Server latency in seconds"
+    )
+    args = parser.parse_args()
+    body = make_project_page("proj", args.files)
+    with h2c_server(body, args.latency) as url:
+        opts = ConnectionOptions(pool_maxsize=args.threads, pool_block=True)
+        with PyPISimple(url, connection=opts) as client:
+            rate = run(client, args.threads, args.requests)
+            print(f"requests (HTTP/1.1, {args.threads} connections): {rate:.1f} req/s")
+        with PyPISimple(url) as client:
+            client.s.mount("http://", HTTP2Adapter(http1=False))
+            rate = run(client, args.threads, args.requests)
+            print(f"httpx (HTTP/2, 1 connection): {rate:.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Measure `PyPISimple.get_project_page()` throughput against a local server for
+a range of connection pool sizes at a fixed number of client threads.
+
+Usage: python benchmarks/bench_pool_size.py [--threads N] [--requests N]
+"""
+
+from __future__ import annotations
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+from common import local_server, make_project_page
+from pypi_simple import ConnectionOptions, PyPISimple
+
+
+def run(url: str, pool_size: int, threads: int, nrequests: int) -> float:
+    opts = ConnectionOptions(pool_maxsize=pool_size, pool_block=True)
+    with PyPISimple(url, connection=opts) as client:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for _ in pool.map(
+                client.get_project_page, [f"proj{i % 50}" for i in range(nrequests)]
+            ):
+                pass
+        return nrequests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="Server latency in seconds"
+    )
+    args = parser.parse_args()
+    body = make_project_page("proj", args.files)
+    with local_server(body, latency=args.latency) as url:
+        print(f"{'pool size':>10}  {'requests/s':>12}")
+        for size in [1, 2, 4, 8, 10, 16, 32]:
+            rate = run(url, size, args.threads, args.requests)
+            print(f"{size:>10}  {rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
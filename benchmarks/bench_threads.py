@@ -0,0 +1,93 @@
+"""
+Measure how parsing and fetching project pages scale with the number of threads.
+The parse benchmark runs `ProjectPage.from_html()` and
+`ProjectPage.from_json_data()` on the same large page from every thread, and the
+fetch benchmark runs `PyPISimple.get_project_pages()` against a local server,
+with and without per-thread sessions.  Each row reports throughput and speedup
+relative to the first (by default, single) thread count.
+
+Parsing only scales past one thread on a free-threaded ("no-GIL") build of
+CPython, such as ``python3.13t``; on a regular build, expect speedups of about
+1x for parsing, with any gains in fetching coming from overlapping I/O.
+
+Usage: python benchmarks/bench_threads.py [--files N] [--pages N]
+    [--threads N,N,...] [--latency SECONDS]
+"""
+
+from __future__ import annotations
+import argparse
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import json
+import sys
+import sysconfig
+import time
+from common import local_server, make_project_json, make_project_page
+from pypi_simple import ProjectPage, PyPISimple
+
+
+def gil_status() -> str:
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        return "GIL build"
+    is_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    return "free-threaded build, GIL " + ("enabled" if is_enabled() else "disabled")
+
+
+def run_threads(nthreads: int, ntasks: int, func: Callable[[int], object]) -> float:
+    with ThreadPoolExecutor(max_workers=nthreads) as pool:
+        # Start the workers before timing:
+        list(pool.map(lambda _: None, range(nthreads)))
+        start = time.perf_counter()
+        list(pool.map(func, range(ntasks)))
+        return time.perf_counter() - start
+
+
+def report(label: str, nthreads: int, ntasks: int, elapsed: float, base: float) -> None:
+    print(
+        f"{label:>16}  {nthreads:>7}  {ntasks / elapsed:>10.1f}"
+        f"  {base / elapsed:>7.2f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument(
+        "--threads",
+        type=lambda s: [int(n) for n in s.split(",")],
+        default=[1, 2, 4, 8],
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    print(f"Python {sys.version.split()[0]} ({gil_status()})")
+    html = make_project_page("proj", args.files)
+    data = json.loads(make_project_json("proj", args.files))
+    parsers: dict[str, Callable[[int], object]] = {
+        "parse html": lambda _: ProjectPage.from_html("proj", html),
+        "parse json": lambda _: ProjectPage.from_json_data(data),
+    }
+    print(f"{'benchmark':>16}  {'threads':>7}  {'pages/sec':>10}  {'speedup':>8}")
+    for label, func in parsers.items():
+        base = 0.0
+        for nthreads in args.threads:
+            elapsed = run_threads(nthreads, args.pages, func)
+            base = base or elapsed
+            report(label, nthreads, args.pages, elapsed, base)
+    projects = [f"proj{i}" for i in range(args.pages)]
+    with local_server(html, latency=args.latency) as url:
+        for thread_sessions in [False, True]:
+            label = "fetch " + ("per-thread" if thread_sessions else "shared")
+            base = 0.0
+            for nthreads in args.threads:
+                with PyPISimple(url, thread_sessions=thread_sessions) as client:
+                    start = time.perf_counter()
+                    for r in client.get_project_pages(projects, nthreads):
+                        r.unwrap()
+                    elapsed = time.perf_counter() - start
+                base = base or elapsed
+                report(label, nthreads, args.pages, elapsed, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Helpers shared by the benchmark scripts"""
+
+from __future__ import annotations
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+
+def make_project_page(project: str, nfiles: int) -> bytes:
+    """Generate a PEP 503 HTML project page listing ``nfiles`` files"""
+    lines = ["<!DOCTYPE html>", "<html><head>"]
+    lines.append('<meta name="pypi:repository-version" content="1.0">')
+    lines.append(f"<title>Links for {project}</title></head><body>")
+    for i in range(nfiles):
+        fname = f"{project}-{i // 4}.{i % 4}.0-py3-none-any.whl"
+        lines.append(
+            f'<a href="../../files/{fname}#sha256={i:064x}"'
+            f' data-requires-python="&gt;=3.{i % 12}">{fname}</a><br/>'
+        )
+    lines.append("</body></html>")
+    return "\n".join(lines).encode("utf-8")
+
+
+def make_project_json(project: str, nfiles: int) -> bytes:
+    """
+    Generate a PEP 691 JSON project page listing the same files as
+    `make_project_page()`
+    """
+    files = []
+    for i in range(nfiles):
+        fname = f"{project}-{i // 4}.{i % 4}.0-py3-none-any.whl"
+        files.append(
+            {
+                "filename": fname,
+                "url": f"../../files/{fname}",
+                "hashes": {"sha256": f"{i:064x}"},
+                "requires-python": f">=3.{i % 12}",
+                "yanked": i % 10 == 0,
+            }
+        )
+    data = {"meta": {"api-version": "1.1"}, "name": project, "files": files}
+    return json.dumps(data).encode("utf-8")
+
+
+@contextmanager
+def local_server(
+    body: bytes,
+    content_type: str = "text/html",
+    latency: float = 0.0,
+) -> Iterator[str]:
+    """
+    Run a threaded HTTP/1.1 server on localhost that answers every ``GET``
+    request with ``body`` after sleeping for ``latency`` seconds, and yield
+    its base URL
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:  # noqa: N802
+            if latency:
+                time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host!s}:{port}/simple/"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -67,46 +67,96 @@ ACCEPT_HTML_PREFERRED = ", ".join(
     ]
 )
 
-from .classes import DistributionPackage, IndexPage, ProjectPage
+from .adapters import ConnectionOptions
+from .batch import BatchResult
+from .classes import DistributionPackage, IndexPage, ProjectPage, ProjectPageMeta
 from .client import PyPISimple
+from .concurrency import (
+    AdaptiveConcurrency,
+    ConcurrencyDecision,
+    ConcurrencyLimiter,
+    FixedConcurrency,
+    Outcome,
+)
 from .enums import ProjectStatus
 from .errors import (
     DigestMismatchError,
     NoDigestsError,
     NoMetadataError,
+    NoMirrorsAvailableError,
     NoProvenanceError,
     NoSuchProjectError,
+    SnapshotError,
     UnexpectedRepoVersionWarning,
     UnparsableFilenameError,
     UnsupportedContentTypeError,
     UnsupportedRepoVersionError,
 )
 from .filenames import parse_filename
+from .filters import PackageFilter
 from .html import Link, RepositoryPage
-from .html_stream import parse_links_stream, parse_links_stream_response
+from .html_stream import (
+    parse_head_stream,
+    parse_links_stream,
+    parse_links_stream_response,
+)
+from .mirrors import CircuitBreaker, CircuitState, Mirror, MultiMirrorClient
 from .progress import ProgressTracker, tqdm_progress_factory
+from .ratelimit import RateLimiter, TokenBucket
+from .retry import RetryEvent, RetryPolicy
+from .singleflight import SingleFlight
+from .specifiers import SpecifierCache, filter_requires_python
+from .stats import TransferStats
+from .versions import VersionIndex
+from .wheeltags import WheelTagIndex
 
 __all__ = [
+    "AdaptiveConcurrency",
+    "BatchResult",
+    "CircuitBreaker",
+    "CircuitState",
+    "ConcurrencyDecision",
+    "ConcurrencyLimiter",
+    "ConnectionOptions",
     "DigestMismatchError",
     "DistributionPackage",
+    "FixedConcurrency",
     "IndexPage",
     "Link",
+    "Mirror",
+    "MultiMirrorClient",
     "NoDigestsError",
     "NoMetadataError",
+    "NoMirrorsAvailableError",
     "NoProvenanceError",
     "NoSuchProjectError",
+    "Outcome",
     "PYPI_SIMPLE_ENDPOINT",
+    "PackageFilter",
     "ProgressTracker",
     "ProjectPage",
+    "ProjectPageMeta",
     "ProjectStatus",
     "PyPISimple",
+    "RateLimiter",
     "RepositoryPage",
+    "RetryEvent",
+    "RetryPolicy",
     "SUPPORTED_REPOSITORY_VERSION",
+    "SingleFlight",
+    "SnapshotError",
+    "SpecifierCache",
+    "TokenBucket",
+    "TransferStats",
     "UnexpectedRepoVersionWarning",
     "UnparsableFilenameError",
     "UnsupportedContentTypeError",
     "UnsupportedRepoVersionError",
+    "VersionIndex",
+    "WheelTagIndex",
+    "filter_requires_python",
     "parse_filename",
+    "parse_head_stream",
     "parse_links_stream",
     "parse_links_stream_response",
     "tqdm_progress_factory",
@@ -0,0 +1,102 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import socket
+from typing import Any
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+#: Type of an entry in a list of socket options, as passed to
+#: `socket.socket.setsockopt()`
+SocketOption = tuple[int, int, int]
+
+
+@dataclass
+class ConnectionOptions:
+    """
+    .. versionadded:: 1.9.0
+
+    Connection-pool and socket settings for the HTTP(S) transport used by
+    `PyPISimple`.  Pass an instance as the ``connection`` argument to the
+    `PyPISimple` constructor in order to mount a suitably-configured transport
+    adapter on the client's session.
+
+    The defaults match those of a plain `requests.Session`.
+    """
+
+    #: The number of per-host connection pools to keep cached
+    pool_connections: int = 10
+
+    #: The maximum number of connections to keep open to a single host.  This
+    #: should be at least as large as the number of threads that will be using
+    #: the client concurrently.
+    pool_maxsize: int = 10
+
+    #: Whether to block when all of a host's connections are in use instead of
+    #: opening a new connection that will be discarded after use
+    pool_block: bool = False
+
+    #: The number of times to retry a request that failed because a connection
+    #: to the server could not be established.  Requests that fail while
+    #: reading the response are never retried at this level.
+    connect_retries: int = 0
+
+    #: Whether to enable TCP keep-alive probes on idle pooled connections so
+    #: that connections dropped by middleboxes are detected
+    tcp_keepalive: bool = False
+
+    #: Size in bytes of each socket's receive buffer (``SO_RCVBUF``), or `None`
+    #: to use the operating system's default
+    receive_buffer_size: int | None = None
+
+    #: Size in bytes of each socket's send buffer (``SO_SNDBUF``), or `None` to
+    #: use the operating system's default
+    send_buffer_size: int | None = None
+
+    def socket_options(self) -> list[SocketOption]:
+        """
+        Return the list of socket options to set on new connections, including
+        urllib3's default options
+        """
+        opts = list(HTTPConnection.default_socket_options)
+        if self.tcp_keepalive:
+            opts.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        if self.receive_buffer_size is not None:
+            opts.append((socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_size))
+        if self.send_buffer_size is not None:
+            opts.append((socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size))
+        return opts
+
+    def make_adapter(self) -> HTTPAdapter:
+        """Construct a transport adapter configured with these options"""
+        return TunedHTTPAdapter(self)
+
+
+class TunedHTTPAdapter(HTTPAdapter):
+    """
+    A `requests.adapters.HTTPAdapter` that applies the pool sizes, connection
+    retries, and socket options from a `ConnectionOptions` instance
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["socket_options"]
+
+    def __init__(self, options: ConnectionOptions) -> None:
+        self.socket_options: list[SocketOption] = options.socket_options()
+        super().__init__(
+            pool_connections=options.pool_connections,
+            pool_maxsize=options.pool_maxsize,
+            max_retries=Retry(
+                total=options.connect_retries,
+                connect=options.connect_retries,
+                read=False,
+            ),
+            pool_block=options.pool_block,
+        )
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any) -> Any:
+        proxy_kwargs.setdefault("socket_options", self.socket_options)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+import threading
+import time
+from typing import Generic, TypeVar
+import requests
+from .concurrency import ConcurrencyLimiter, FixedConcurrency, Outcome
+from .retry import RETRIABLE_ERRORS, RETRY_STATUSES
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+#: The default number of concurrent requests made by batch operations
+DEFAULT_CONCURRENCY = 8
+
+#: Thread-local state used to mark the threads started by this library
+worker_state = threading.local()
+
+
+@dataclass
+class BatchResult(Generic[T, R]):
+    """
+    .. versionadded:: 1.9.0
+
+    The result of processing a single input to a batch operation, such as
+    `PyPISimple.get_project_pages()`.  Exactly one of `value` and `error` will
+    be non-`None` (unless the operation itself returns `None`).
+    """
+
+    #: The input item that was processed
+    item: T
+
+    #: The result of processing the item, or `None` if an error occurred
+    value: R | None = None
+
+    #: The exception raised while processing the item, if any
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was processed without error"""
+        return self.error is None
+
+    def unwrap(self) -> R:
+        """Return `value`, or raise `error` if it is set"""
+        if self.error is not None:
+            raise self.error
+        return self.value  # type: ignore[return-value]
+
+
+def classify(error: Exception | None) -> Outcome:
+    """
+    Classify the result of a request for the benefit of a
+    `ConcurrencyLimiter`
+    """
+    if error is None:
+        return Outcome.OK
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        if status in (429, 503):
+            return Outcome.THROTTLED
+        elif status in RETRY_STATUSES:
+            return Outcome.ERROR
+        else:
+            return Outcome.OK
+    if isinstance(error, RETRIABLE_ERRORS):
+        return Outcome.ERROR
+    return Outcome.OK
+
+
+def mark_worker_thread() -> None:
+    """
+    Mark the current thread as a worker thread started by this library.  This
+    is used as the initializer for the library's thread pools so that
+    `PyPISimple` clients give such threads their own sessions by default.
+    """
+    worker_state.is_worker = True
+
+
+def is_worker_thread() -> bool:
+    """
+    Return whether the current thread was marked with `mark_worker_thread()`
+    """
+    return getattr(worker_state, "is_worker", False)
+
+
+def as_limiter(concurrency: int | ConcurrencyLimiter) -> ConcurrencyLimiter:
+    if isinstance(concurrency, int):
+        return FixedConcurrency(concurrency)
+    return concurrency
+
+
+def run_batch(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int | ConcurrencyLimiter = DEFAULT_CONCURRENCY,
+) -> Iterator[BatchResult[T, R]]:
+    """
+    Apply ``func`` to each element of ``items`` in a thread pool, starting new
+    calls only when permitted by the given concurrency limit or limiter, and
+    yield a `BatchResult` for each item in the order that they complete.
+
+    If the returned generator is closed before it is exhausted, no further
+    calls are started, and the calls already in progress are allowed to
+    finish.
+    """
+    limiter = as_limiter(concurrency)
+
+    def call(item: T) -> BatchResult[T, R]:
+        start = time.monotonic()
+        error: Exception | None = None
+        try:
+            result = BatchResult[T, R](item, func(item))
+        except Exception as e:
+            error = e
+            result = BatchResult(item, error=e)
+        finally:
+            limiter.release(time.monotonic() - start, classify(error))
+        return result
+
+    pool = ThreadPoolExecutor(
+        max_workers=limiter.max_limit, initializer=mark_worker_thread
+    )
+    pending: set[Future[BatchResult[T, R]]] = set()
+    try:
+        for item in items:
+            limiter.acquire()
+            pending.add(pool.submit(call, item))
+            done = {f for f in pending if f.done()}
+            pending -= done
+            for f in done:
+                yield f.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                yield f.result()
+    finally:
+        pool.shutdown(wait=True)
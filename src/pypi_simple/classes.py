@@ -1,17 +1,26 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 import re
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse, urlunparse
 from mailbits import ContentType
+from packaging.utils import canonicalize_name
+from packaging.version import Version
 import requests
 from .enums import ProjectStatus
 from .errors import UnparsableFilenameError, UnsupportedContentTypeError
 from .filenames import parse_filename
 from .html import Link, RepositoryPage
 from .pep691 import File, Project, ProjectList
+from .specifiers import DEFAULT_SPECIFIER_CACHE, SpecifierCache
 from .util import basejoin, check_repo_version, url_add_suffix
+from .versions import VersionIndex
+from .wheeltags import WheelTagIndex
+
+if TYPE_CHECKING:
+    from .filters import PackageFilter
 
 
 @dataclass
@@ -286,6 +295,52 @@ class ProjectPage:
     #: Freeform text contextualizing `status`, or `None` if not specified
     status_reason: str | None = None
 
+    @cached_property
+    def version_index(self) -> VersionIndex:
+        """
+        .. versionadded:: 1.9.0
+
+        A `VersionIndex` of the page's packages and `versions`, built the first
+        time this attribute is accessed and then cached.  If `packages` or
+        `versions` is modified afterwards, ``del page.version_index`` must be
+        done to rebuild the index.
+        """
+        return VersionIndex(self.packages, self.versions)
+
+    @cached_property
+    def wheel_tag_index(self) -> WheelTagIndex:
+        """
+        .. versionadded:: 1.9.0
+
+        A `WheelTagIndex` of the page's wheels, built the first time this
+        attribute is accessed and then cached.  If `packages` is modified
+        afterwards, ``del page.wheel_tag_index`` must be done to rebuild the
+        index.
+        """
+        return WheelTagIndex(self.packages)
+
+    def filter_requires_python(
+        self, python: str | Version, cache: SpecifierCache | None = None
+    ) -> list[DistributionPackage]:
+        """
+        .. versionadded:: 1.9.0
+
+        Return the packages on the page whose `~DistributionPackage.requires_python`
+        specifiers allow the given Python version, in their original order.
+        Packages without specifiers or with invalid specifiers are always
+        included.
+
+        Specifiers are parsed & evaluated via ``cache`` (by default, a cache
+        shared by all pages), so each distinct specifier string is only
+        evaluated once per Python version.
+
+        :param python: the Python version to filter for, e.g. ``"3.11.4"``
+        :type python: str | packaging.version.Version
+        :param Optional[SpecifierCache] cache: the specifier cache to use
+        :rtype: list[DistributionPackage]
+        """
+        return (cache or DEFAULT_SPECIFIER_CACHE).filter(self.packages, python)
+
     @classmethod
     def from_html(
         cls,
@@ -293,6 +348,7 @@ class ProjectPage:
         html: str | bytes,
         base_url: str | None = None,
         from_encoding: str | None = None,
+        filter: PackageFilter | None = None,  # noqa: A002
     ) -> ProjectPage:
         """
         .. versionadded:: 1.0.0
@@ -300,6 +356,10 @@ class ProjectPage:
         Parse an HTML project page from a simple repository into a
         `ProjectPage`.  Note that the `last_serial` attribute will be `None`.
 
+        .. versionchanged:: 1.9.0
+
+            ``filter`` parameter added
+
         :param str project: The name of the project whose page is being parsed
         :param html: the HTML to parse
         :type html: str or bytes
@@ -310,17 +370,24 @@ class ProjectPage:
             an optional hint to Beautiful Soup as to the encoding of ``html``
             when it is `bytes` (usually the ``charset`` parameter of the
             response's :mailheader:`Content-Type` header)
+        :param Optional[PackageFilter] filter:
+            an optional filter; links to packages rejected by the filter are
+            skipped
         :rtype: ProjectPage
         :raises UnsupportedRepoVersionError:
             if the repository version has a greater major component than the
             supported repository version
         """
         page = RepositoryPage.from_html(html, base_url, from_encoding)
+        links = page.links
+        if filter is not None:
+            links = [link for link in links if filter.match_link(link, project)]
+        packages = [DistributionPackage.from_link(link, project) for link in links]
+        if filter is not None:
+            packages = filter.finish(packages)
         return cls(
             project=project,
-            packages=[
-                DistributionPackage.from_link(link, project) for link in page.links
-            ],
+            packages=packages,
             repository_version=page.repository_version,
             last_serial=None,
             versions=None,
@@ -331,7 +398,12 @@ class ProjectPage:
         )
 
     @classmethod
-    def from_json_data(cls, data: Any, base_url: str | None = None) -> ProjectPage:
+    def from_json_data(
+        cls,
+        data: Any,
+        base_url: str | None = None,
+        filter: PackageFilter | None = None,  # noqa: A002
+    ) -> ProjectPage:
         """
         .. versionadded:: 1.0.0
 
@@ -340,24 +412,44 @@ class ProjectPage:
         :pep:`691`) into a `ProjectPage`.  The `last_serial` attribute will be
         set to the value of the ``.meta._last-serial`` field, if any.
 
+        .. versionchanged:: 1.9.0
+
+            ``filter`` parameter added
+
         :param data: The decoded body of the JSON response
         :param Optional[str] base_url:
             an optional URL to join to the front of any relative file URLs
             (usually the URL of the page being parsed)
+        :param Optional[PackageFilter] filter:
+            an optional filter; file entries rejected by the filter are
+            discarded before being validated
         :rtype: ProjectPage
         :raises ValueError: if ``data`` is not a `dict`
         :raises UnsupportedRepoVersionError:
             if the repository version has a greater major component than the
             supported repository version
         """
+        if (
+            filter is not None
+            and isinstance(data, dict)
+            and isinstance(data.get("files"), list)
+        ):
+            hint = data.get("name") if isinstance(data.get("name"), str) else None
+            data = {
+                **data,
+                "files": [f for f in data["files"] if filter.match_file_data(f, hint)],
+            }
         project = Project.model_validate(data)
         check_repo_version(project.meta.api_version)
+        packages = [
+            DistributionPackage.from_file(f, project.name, base_url)
+            for f in project.files
+        ]
+        if filter is not None:
+            packages = filter.finish(packages)
         return ProjectPage(
             project=project.name,
-            packages=[
-                DistributionPackage.from_file(f, project.name, base_url)
-                for f in project.files
-            ],
+            packages=packages,
             repository_version=project.meta.api_version,
             last_serial=project.meta.last_serial,
             versions=project.versions,
@@ -368,7 +460,12 @@ class ProjectPage:
         )
 
     @classmethod
-    def from_response(cls, r: requests.Response, project: str) -> ProjectPage:
+    def from_response(
+        cls,
+        r: requests.Response,
+        project: str,
+        filter: PackageFilter | None = None,  # noqa: A002
+    ) -> ProjectPage:
         """
         .. versionadded:: 1.0.0
 
@@ -376,8 +473,14 @@ class ProjectPage:
         (non-streaming) request to a simple repository, and return a
         `ProjectPage`.
 
+        .. versionchanged:: 1.9.0
+
+            ``filter`` parameter added
+
         :param requests.Response r: the response object to parse
         :param str project: the name of the project whose page is being parsed
+        :param Optional[PackageFilter] filter:
+            an optional filter to apply to the page's packages while parsing
         :rtype: ProjectPage
         :raises UnsupportedRepoVersionError:
             if the repository version has a greater major component than the
@@ -387,7 +490,7 @@ class ProjectPage:
         """
         ct = ContentType.parse(r.headers.get("content-type", "text/html"))
         if ct.content_type == "application/vnd.pypi.simple.v1+json":
-            page = cls.from_json_data(r.json(), r.url)
+            page = cls.from_json_data(r.json(), r.url, filter=filter)
         elif (
             ct.content_type == "application/vnd.pypi.simple.v1+html"
             or ct.content_type == "text/html"
@@ -397,6 +500,7 @@ class ProjectPage:
                 html=r.content,
                 base_url=r.url,
                 from_encoding=ct.params.get("charset"),
+                filter=filter,
             )
         else:
             raise UnsupportedContentTypeError(r.url, str(ct))
@@ -405,6 +509,76 @@ class ProjectPage:
         return page
 
 
+@dataclass
+class ProjectPageMeta:
+    """
+    .. versionadded:: 1.9.0
+
+    The page-level metadata of a project page, i.e., the attributes of a
+    `ProjectPage` other than its packages and versions, as returned by
+    `PyPISimple.get_project_page_meta()`
+    """
+
+    #: The name of the project the page is for
+    project: str
+
+    #: The repository version reported by the page, or `None` if not specified
+    repository_version: str | None
+
+    #: The value of the :mailheader:`X-PyPI-Last-Serial` response header
+    #: returned when fetching the page, or the value of the JSON page's
+    #: ``.meta._last-serial`` field, or `None` if not specified
+    last_serial: str | None
+
+    #: Repository "tracks" metadata.  See `PEP 708`__.
+    #:
+    #: __ https://peps.python.org/pep-0708/#repository-tracks-metadata
+    tracks: list[str] = field(default_factory=list)
+
+    #: Repository "alternate locations" metadata.  See `PEP 708`__.
+    #:
+    #: __ https://peps.python.org/pep-0708/#alternate-locations-metadata
+    alternate_locations: list[str] = field(default_factory=list)
+
+    #: Project status marker, or `None` if not specified.  See :pep:`792`.
+    status: ProjectStatus | None = None
+
+    #: Freeform text contextualizing `status`, or `None` if not specified
+    status_reason: str | None = None
+
+    @classmethod
+    def from_page(cls, page: ProjectPage) -> ProjectPageMeta:
+        """Return the page-level metadata of a `ProjectPage`"""
+        return cls(
+            project=page.project,
+            repository_version=page.repository_version,
+            last_serial=page.last_serial,
+            tracks=list(page.tracks),
+            alternate_locations=list(page.alternate_locations),
+            status=page.status,
+            status_reason=page.status_reason,
+        )
+
+    @classmethod
+    def from_repository_page(
+        cls, project: str, page: RepositoryPage
+    ) -> ProjectPageMeta:
+        """
+        Return the page-level metadata of an HTML project page parsed into a
+        `RepositoryPage`.  Note that the `last_serial` attribute will be
+        `None`.
+        """
+        return cls(
+            project=project,
+            repository_version=page.repository_version,
+            last_serial=None,
+            tracks=page.tracks,
+            alternate_locations=page.alternate_locations,
+            status=page.status,
+            status_reason=page.status_reason,
+        )
+
+
 @dataclass
 class IndexPage:
     """A parsed index/root page from a simple repository"""
@@ -419,6 +593,18 @@ class IndexPage:
     #: returned when fetching the page, or `None` if not specified
     last_serial: str | None
 
+    @cached_property
+    def normalized_projects(self) -> frozenset[str]:
+        """
+        .. versionadded:: 1.9.0
+
+        The normalized names of the projects in `projects`, computed the first
+        time this attribute is accessed and then cached.  If `projects` is
+        modified afterwards, ``del page.normalized_projects`` must be done to
+        recompute the set.
+        """
+        return frozenset(map(canonicalize_name, self.projects))
+
     @classmethod
     def from_html(
         cls, html: str | bytes, from_encoding: str | None = None
@@ -1,25 +1,56 @@
 from __future__ import annotations
-from collections.abc import Callable, Iterator
+from collections import OrderedDict
+from collections.abc import Callable, Generator, Hashable, Iterable, Iterator
+from concurrent.futures import Executor
+from contextlib import closing
+from copy import copy
+from dataclasses import replace
+from functools import partial
+from glob import escape
 import json
 import os
 from pathlib import Path
 import platform
+import shutil
+import threading
 from types import TracebackType
-from typing import Any, AnyStr
+from typing import Any, AnyStr, TypeVar
+from weakref import WeakSet
 from mailbits import ContentType
-from packaging.utils import canonicalize_name as normalize
 import requests
+from requests.structures import CaseInsensitiveDict
 from . import ACCEPT_ANY, PYPI_SIMPLE_ENDPOINT, __url__, __version__
-from .classes import DistributionPackage, IndexPage, ProjectPage
+from .adapters import ConnectionOptions
+from .batch import DEFAULT_CONCURRENCY, BatchResult, is_worker_thread, run_batch
+from .classes import DistributionPackage, IndexPage, ProjectPage, ProjectPageMeta
+from .concurrency import ConcurrencyLimiter
 from .errors import (
     NoMetadataError,
     NoProvenanceError,
     NoSuchProjectError,
     UnsupportedContentTypeError,
 )
-from .html_stream import parse_links_stream_response
+from .filters import PackageFilter
+from .html_stream import iterdecode, parse_head_stream, parse_links_stream
+from .json_stream import (
+    iter_project_items_json,
+    iter_project_packages_json,
+    scan_project_meta_json,
+)
+from .local import FileAdapter, file_url_to_path
+from .nameindex import NameIndex
 from .progress import ProgressTracker, null_progress_tracker
-from .util import AbstractDigestChecker, DigestChecker, NullDigestChecker
+from .ratelimit import RateLimiter
+from .retry import NO_RETRY, RETRIABLE_ERRORS, RetryEvent, RetryPolicy, RetryState
+from .singleflight import SingleFlight
+from .snapshot import loads, parse_project_page
+from .stats import TransferStats, wire_bytes_read
+from .util import (
+    AbstractDigestChecker,
+    DigestChecker,
+    NullDigestChecker,
+    normalize,
+)
 
 #: The User-Agent header used for requests; not used when the user provides eir
 #: own session object
@@ -31,6 +62,12 @@ USER_AGENT: str = "pypi-simple/{} ({}) requests/{} {}/{}".format(
     platform.python_version(),
 )
 
+T = TypeVar("T")
+
+#: The size of the chunks in which locally-copied packages are read back for
+#: verification
+COPY_VERIFY_CHUNK_SIZE = 1 << 20
+
 
 class PyPISimple:
     """
@@ -51,12 +88,75 @@ class PyPISimple:
     automatically close its session on exit, regardless of where the session
     object came from.
 
+    Connection pool sizes, connection retries, and socket options can be tuned
+    by passing a `ConnectionOptions` instance as the ``connection`` parameter;
+    a transport adapter configured accordingly will then be mounted on the
+    session for both ``http://`` and ``https://`` URLs.
+
+    If ``http2`` is true, ``https://`` requests are instead sent over HTTP/2
+    using `httpx <https://www.python-httpx.org>`_ (which must be installed via
+    the ``http2`` extra), allowing concurrent requests to the same host to be
+    multiplexed over a single connection.
+
+    Failed requests can be retried automatically with exponential backoff by
+    passing a `RetryPolicy` instance as the ``retry`` parameter.  By default,
+    requests are not retried.
+
+    The rate at which requests are made and data is received can be capped by
+    passing a `RateLimiter` instance as the ``rate_limiter`` parameter.
+
+    A `PyPISimple` instance may be shared between threads, including on
+    free-threaded builds of Python.  As the thread-safety of
+    `requests.Session` is not guaranteed, threads other than the one that
+    created the client can send their requests through their own sessions,
+    each created on first use as a copy of the client's session (see
+    `~pypi_simple.client.copy_session()`).  By default (``thread_sessions=None``),
+    this is only done for the threads that this library starts itself, i.e.,
+    the workers of batch methods like `get_project_pages()`, of
+    `~pypi_simple.sync.LocalMirror` and `~pypi_simple.crawl.Crawler`, of
+    `~pypi_simple.mirrors.MultiMirrorClient`, and of
+    `~pypi_simple.proxy.ProxyServer`.  Passing ``thread_sessions=True`` extends
+    this to all threads, including ones started by the caller, while
+    ``thread_sessions=False`` makes every thread use the client's session.
+    The copies share the original session's transport adapters, and thus its
+    connection pools, so connections are still reused across threads.  Changes
+    made to the client's session after a thread's copy has been created are
+    not seen by that thread.
+
+    Static repository trees on local or network filesystems can be read
+    directly, without an HTTP server, by passing a ``file://`` URL or a
+    filesystem path as the endpoint; see `~pypi_simple.local.FileAdapter` for
+    details.  ``file://`` URLs are only followed (whether in redirects or in
+    package URLs) when the endpoint is itself local, so that a remote
+    repository cannot cause local files to be read.
+
+    If ``coalesce`` is true, concurrent identical calls to `get_index_page()`,
+    `get_project_page()`, `get_package_metadata_bytes()`, or
+    `get_package_metadata()` (i.e., calls made from different threads for the
+    same URL with the same :mailheader:`Accept` and custom headers) share a
+    single request and a single parsed result, and so the callers receive the
+    same object, which should not be modified.  Only calls that overlap in time
+    are coalesced; nothing is cached afterwards.
+
     .. versionchanged:: 1.0.0
 
         ``accept`` parameter added
 
-    :param str endpoint: The base URL of the simple API instance to query;
-        defaults to the base URL for PyPI's simple API
+    .. versionchanged:: 1.9.0
+
+        ``connection``, ``http2``, ``retry``, ``rate_limiter``, ``coalesce``,
+        and ``thread_sessions`` parameters added
+
+    .. versionchanged:: 1.9.0
+
+        ``endpoint`` may now be a ``file://`` URL or a filesystem path
+
+    :param endpoint: The base URL of the simple API instance to query;
+        defaults to the base URL for PyPI's simple API.  A local directory
+        containing a static repository tree may be given as either a
+        ``file://`` URL or a path; a `str` without a URL scheme is treated as
+        a path.
+    :type endpoint: str | os.PathLike[str]
 
     :param auth: Optional login/authentication details for the repository;
         either a ``(username, password)`` pair or `another authentication
@@ -70,16 +170,48 @@ class PyPISimple:
         The :mailheader:`Accept` header to send in requests in order to specify
         what serialization format the server should return; defaults to
         `ACCEPT_ANY`
+
+    :param Optional[ConnectionOptions] connection:
+        Optional connection-pool and socket settings to apply to the session
+
+    :param bool http2:
+        Whether to send ``https://`` requests over HTTP/2
+
+    :param Optional[RetryPolicy] retry:
+        Optional policy for retrying failed requests
+
+    :param Optional[RateLimiter] rate_limiter:
+        Optional rate limiter to apply to all requests
+
+    :param bool coalesce:
+        Whether to share a single request among concurrent identical calls
+
+    :param Optional[bool] thread_sessions:
+        Whether to give each thread its own copy of the session: `True` for
+        all threads, `None` (the default) for only threads started by this
+        library, and `False` for no threads
     """
 
     def __init__(
         self,
-        endpoint: str = PYPI_SIMPLE_ENDPOINT,
+        endpoint: str | os.PathLike[str] = PYPI_SIMPLE_ENDPOINT,
         auth: Any = None,
         session: requests.Session | None = None,
         accept: str = ACCEPT_ANY,
+        connection: ConnectionOptions | None = None,
+        http2: bool = False,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        coalesce: bool = False,
+        thread_sessions: bool | None = None,
     ) -> None:
+        if not isinstance(endpoint, str) or "://" not in endpoint:
+            endpoint = Path(endpoint).resolve().as_uri()
         self.endpoint: str = endpoint.rstrip("/") + "/"
+        #: .. versionadded:: 1.9.0
+        #:
+        #: Whether the endpoint is a ``file://`` URL for a local directory
+        self.is_local: bool = self.endpoint.lower().startswith("file:")
         self.s: requests.Session
         if session is not None:
             self.s = session
@@ -88,7 +220,38 @@ class PyPISimple:
             self.s.headers["User-Agent"] = USER_AGENT
         if auth is not None:
             self.s.auth = auth
+        if self.is_local:
+            self.s.mount("file://", FileAdapter())
+        if connection is not None:
+            adapter = connection.make_adapter()
+            self.s.mount("https://", adapter)
+            self.s.mount("http://", adapter)
+        if http2:
+            from .http2 import HTTP2Adapter
+
+            self.s.mount("https://", HTTP2Adapter(connection))
         self.accept = accept
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        #: .. versionadded:: 1.9.0
+        #:
+        #: Running totals of the data transferred by this client
+        self.stats = TransferStats()
+        #: .. versionadded:: 1.9.0
+        #:
+        #: The `SingleFlight` used to coalesce concurrent identical calls, or
+        #: `None` if coalescing is disabled
+        self.flights: SingleFlight | None = SingleFlight() if coalesce else None
+        self.thread_sessions = thread_sessions
+        self.owner = threading.get_ident()
+        self.local = threading.local()
+        #: .. versionadded:: 1.9.0
+        #:
+        #: The per-thread copies of the session that are currently in use when
+        #: ``thread_sessions`` is not false.  Each copy is only referenced weakly
+        #: here and is discarded once its thread exits.
+        self.sessions: WeakSet[requests.Session] = WeakSet()
+        self.sessions_lock = threading.Lock()
 
     def __enter__(self) -> PyPISimple:
         return self
@@ -99,8 +262,114 @@ class PyPISimple:
         _exc_val: BaseException | None,
         _exc_tb: TracebackType | None,
     ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        .. versionadded:: 1.9.0
+
+        Close the client's session, including the transport adapters (and
+        thus the connection pools) that it shares with any per-thread copies
+        """
         self.s.close()
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        .. versionadded:: 1.9.0
+
+        The session through which the current thread sends its requests: a
+        copy of `s` specific to the current thread if ``thread_sessions`` is
+        true or (when it is `None`) if the current thread was started by this
+        library, unless the current thread is the one that created the client;
+        otherwise, `s` itself
+        """
+        if threading.get_ident() == self.owner:
+            return self.s
+        if self.thread_sessions is None:
+            if not is_worker_thread():
+                return self.s
+        elif not self.thread_sessions:
+            return self.s
+        session: requests.Session | None = getattr(self.local, "session", None)
+        if session is None:
+            session = copy_session(self.s)
+            with self.sessions_lock:
+                self.sessions.add(session)
+            self.local.session = session
+        return session
+
+    def _retry_state(self, url: str) -> RetryState:
+        return (self.retry or NO_RETRY).start(url, self._on_retry)
+
+    def _on_retry(self, _event: RetryEvent) -> None:
+        self.stats.record_retry()
+
+    def _coalesce(
+        self,
+        func: Callable[[], T],
+        url: str,
+        headers: dict[str, str] | None,
+        *extra: Hashable,
+    ) -> T:
+        """
+        Call ``func()``, sharing the call with any concurrent calls of the same
+        function for the same URL, headers, & ``extra`` values if coalescing is
+        enabled
+        """
+        if self.flights is None:
+            return func()
+        key = (func.__name__, url, tuple(sorted((headers or {}).items())), *extra)
+        return self.flights.do(key, func)
+
+    def _get(
+        self, url: str, retry: RetryState | None = None, **kwargs: Any
+    ) -> requests.Response:
+        """
+        Perform a ``GET`` request for ``url``, subject to the client's rate
+        limiter and retrying according to the client's retry policy.  If the
+        retries are exhausted, the last response received is returned, or the
+        last exception is raised.
+
+        The transfer of a non-streaming response's body is recorded in
+        `stats`; for streaming responses, use `_iter_body()`.
+        """
+        return self._request(self.session.get, url, retry, **kwargs)
+
+    def _head(
+        self, url: str, retry: RetryState | None = None, **kwargs: Any
+    ) -> requests.Response:
+        """Like `_get()`, but performs a ``HEAD`` request"""
+        return self._request(self.session.head, url, retry, **kwargs)
+
+    def _request(
+        self,
+        send: Callable[..., requests.Response],
+        url: str,
+        retry: RetryState | None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        if retry is None:
+            retry = self._retry_state(url)
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire_request(url)
+            try:
+                r = send(url, **kwargs)
+            except RETRIABLE_ERRORS as e:
+                if retry.should_retry_error(e):
+                    continue
+                raise
+            if not kwargs.get("stream"):
+                size = len(r.content)
+                self.stats.record(r, size)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.consume_bytes(url, wire_bytes_read(r, size))
+            if retry.should_retry_response(r):
+                r.close()
+                continue
+            return r
+
     def get_index_page(
         self,
         timeout: float | tuple[float, float] | None = None,
@@ -149,13 +418,17 @@ class PyPISimple:
         request_headers = {"Accept": accept or self.accept}
         if headers:
             request_headers.update(headers)
-        r = self.s.get(
-            self.endpoint,
-            timeout=timeout,
-            headers=request_headers,
-        )
-        r.raise_for_status()
-        return IndexPage.from_response(r)
+
+        def get_index_page() -> IndexPage:
+            r = self._get(
+                self.endpoint,
+                timeout=timeout,
+                headers=request_headers,
+            )
+            r.raise_for_status()
+            return IndexPage.from_response(r)
+
+        return self._coalesce(get_index_page, self.endpoint, request_headers)
 
     def stream_project_names(
         self,
@@ -179,12 +452,6 @@ class PyPISimple:
             support for web encodings, encoding detection, or handling invalid
             HTML.
 
-        .. note::
-
-            If the server responds with a JSON representation of the Simple API
-            rather than an HTML representation, the response body will be
-            loaded & parsed in its entirety before yielding anything.
-
         .. versionchanged:: 1.0.0
 
             ``accept`` parameter added
@@ -193,6 +460,11 @@ class PyPISimple:
 
             ``headers`` parameter added
 
+        .. versionchanged:: 1.9.0
+
+            JSON responses are now parsed incrementally as well instead of
+            being loaded in their entirety before yielding anything
+
         :param int chunk_size: how many bytes to read from the response at a
             time
         :param timeout: optional timeout to pass to the ``requests`` call
@@ -211,26 +483,93 @@ class PyPISimple:
         :raises UnsupportedRepoVersionError: if the repository version has a
             greater major component than the supported repository version
         """
+        for name, _ in self.stream_project_serials(
+            chunk_size=chunk_size, timeout=timeout, accept=accept, headers=headers
+        ):
+            yield name
+
+    def stream_project_serials(
+        self,
+        chunk_size: int = 65535,
+        timeout: float | tuple[float, float] | None = None,
+        accept: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Iterator[tuple[str, int | None]]:
+        """
+        .. versionadded:: 1.9.0
+
+        Like `stream_project_names()`, but returns a generator of ``(name,
+        last_serial)`` pairs, where ``last_serial`` is the project's last
+        serial as reported in the ``_last-serial`` field of a JSON index page
+        (as provided by PyPI), or `None` if the repository does not report it
+        (as is always the case for HTML index pages).
+
+        :param int chunk_size: how many bytes to read from the response at a
+            time
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the request.
+        :rtype: Iterator[tuple[str, Optional[int]]]
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code
+        :raises UnsupportedContentTypeError: if the repository responds with an
+            unsupported :mailheader:`Content-Type`
+        :raises UnsupportedRepoVersionError: if the repository version has a
+            greater major component than the supported repository version
+        """
         request_headers = {"Accept": accept or self.accept}
         if headers:
             request_headers.update(headers)
-        with self.s.get(
+        retry = self._retry_state(self.endpoint)
+        while True:
+            yielded = False
+            try:
+                for item in self._stream_projects(
+                    retry, chunk_size, timeout, request_headers
+                ):
+                    yielded = True
+                    yield item
+            except RETRIABLE_ERRORS as e:
+                if yielded or not retry.should_retry_error(e):
+                    raise
+            else:
+                return
+
+    def _stream_projects(
+        self,
+        retry: RetryState,
+        chunk_size: int,
+        timeout: float | tuple[float, float] | None,
+        headers: dict[str, str],
+    ) -> Iterator[tuple[str, int | None]]:
+        with self._get(
             self.endpoint,
+            retry,
             stream=True,
             timeout=timeout,
-            headers=request_headers,
+            headers=headers,
         ) as r:
             r.raise_for_status()
             ct = ContentType.parse(r.headers.get("content-type", "text/html"))
             if ct.content_type == "application/vnd.pypi.simple.v1+json":
-                page = IndexPage.from_json_data(r.json())
-                yield from page.projects
+                yield from iter_project_items_json(
+                    iterdecode(self._iter_body(r, chunk_size), "utf-8")
+                )
             elif (
                 ct.content_type == "application/vnd.pypi.simple.v1+html"
                 or ct.content_type == "text/html"
             ):
-                for link in parse_links_stream_response(r, chunk_size):
-                    yield link.text
+                for link in parse_links_stream(
+                    self._iter_body(r, chunk_size),
+                    base_url=r.url,
+                    http_charset=r.encoding,
+                ):
+                    yield (link.text, None)
             else:
                 raise UnsupportedContentTypeError(r.url, str(ct))
 
@@ -240,6 +579,7 @@ class PyPISimple:
         timeout: float | tuple[float, float] | None = None,
         accept: str | None = None,
         headers: dict[str, str] | None = None,
+        filter: PackageFilter | None = None,  # noqa: A002
     ) -> ProjectPage:
         """
         Fetches the page for the given project from the simple repository and
@@ -258,6 +598,10 @@ class PyPISimple:
 
             ``headers`` parameter added
 
+        .. versionchanged:: 1.9.0
+
+            ``filter`` parameter added
+
         :param str project: The name of the project to fetch information on.
             The name does not need to be normalized.
         :param timeout: optional timeout to pass to the ``requests`` call
@@ -268,6 +612,10 @@ class PyPISimple:
             defaults to the value supplied on client instantiation
         :param Optional[dict[str, str]] headers:
             Custom headers to provide for the request.
+        :param Optional[PackageFilter] filter:
+            An optional filter to apply to the page's packages.  Entries
+            rejected by the filter are discarded during parsing, before the
+            corresponding `DistributionPackage` objects would be constructed.
         :rtype: ProjectPage
         :raises NoSuchProjectError: if the repository responds with a 404 error
             code
@@ -282,11 +630,375 @@ class PyPISimple:
         if headers:
             request_headers.update(headers)
         url = self.get_project_url(project)
-        r = self.s.get(url, timeout=timeout, headers=request_headers)
+
+        def get_project_page() -> ProjectPage:
+            r = self._get(url, timeout=timeout, headers=request_headers)
+            if r.status_code == 404:
+                raise NoSuchProjectError(project, url)
+            r.raise_for_status()
+            return ProjectPage.from_response(r, project, filter=filter)
+
+        return self._coalesce(get_project_page, url, request_headers, filter)
+
+    def stream_project_packages(
+        self,
+        project: str,
+        filter: PackageFilter | None = None,  # noqa: A002
+        chunk_size: int = 65535,
+        timeout: float | tuple[float, float] | None = None,
+        accept: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Generator[DistributionPackage, None, None]:
+        """
+        .. versionadded:: 1.9.0
+
+        Returns a generator of the packages listed on the given project's page
+        in the repository, optionally filtered by ``filter``.
+
+        Like `stream_project_names()`, this function makes a streaming request
+        to the server and parses the document in chunks, yielding each package
+        as soon as its entry has been read, so that only the accepted packages
+        are ever constructed and the whole page is never held in memory.  Page
+        metadata (such as the :pep:`700` versions) is not made available; use
+        `get_project_page()` if that is needed.
+
+        :param str project: The name of the project to fetch information on.
+            The name does not need to be normalized.
+        :param Optional[PackageFilter] filter:
+            An optional filter to apply to the page's packages
+        :param int chunk_size: how many bytes to read from the response at a
+            time
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the request.
+        :rtype: Iterator[DistributionPackage]
+        :raises NoSuchProjectError: if the repository responds with a 404 error
+            code
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code other than 404
+        :raises UnsupportedContentTypeError: if the repository responds with an
+            unsupported :mailheader:`Content-Type`
+        :raises UnsupportedRepoVersionError: if the repository version has a
+            greater major component than the supported repository version
+        """
+        request_headers = {"Accept": accept or self.accept}
+        if headers:
+            request_headers.update(headers)
+        url = self.get_project_url(project)
+        retry = self._retry_state(url)
+        while True:
+            yielded = False
+            try:
+                with closing(
+                    self._stream_packages(
+                        url,
+                        project,
+                        filter,
+                        retry,
+                        chunk_size,
+                        timeout,
+                        request_headers,
+                    )
+                ) as packages:
+                    for pkg in packages:
+                        yielded = True
+                        yield pkg
+            except RETRIABLE_ERRORS as e:
+                if yielded or not retry.should_retry_error(e):
+                    raise
+            else:
+                return
+
+    def find_package(
+        self,
+        project: str,
+        filename: str | None = None,
+        version: str | None = None,
+        filter: PackageFilter | None = None,  # noqa: A002
+        chunk_size: int = 65535,
+        timeout: float | tuple[float, float] | None = None,
+        accept: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> DistributionPackage | None:
+        """
+        .. versionadded:: 1.9.0
+
+        Look up a single package on the given project's page, returning the
+        first package in the page that has the given filename and/or version
+        and passes ``filter`` (if given), or `None` if there is no such
+        package.
+
+        The page is streamed as with `stream_project_packages()`, and the
+        response is closed as soon as a match is found, so finding a package
+        near the top of a large page only transfers and parses the part of the
+        page up to the match.
+
+        :param str project: The name of the project to search.  The name does
+            not need to be normalized.
+        :param Optional[str] filename: the exact filename of the package to
+            find
+        :param Optional[str] version: the version of the package to find;
+            versions are compared after normalization
+        :param Optional[PackageFilter] filter: an optional filter that the
+            package must also pass; ``filename`` and ``version``, if given,
+            override the filter's own filename & version criteria
+        :param int chunk_size: how many bytes to read from the response at a
+            time
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the request.
+        :rtype: Optional[DistributionPackage]
+        :raises ValueError: if none of ``filename``, ``version``, or
+            ``filter`` is given
+        :raises NoSuchProjectError: if the repository responds with a 404 error
+            code
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code other than 404
+        :raises UnsupportedContentTypeError: if the repository responds with an
+            unsupported :mailheader:`Content-Type`
+        :raises UnsupportedRepoVersionError: if the repository version has a
+            greater major component than the supported repository version
+        """
+        if filename is None and version is None and filter is None:
+            raise ValueError("At least one of filename, version, or filter must be set")
+        pkg_filter = filter or PackageFilter()
+        if filename is not None:
+            pkg_filter = replace(pkg_filter, filename=escape(filename))
+        if version is not None:
+            pkg_filter = replace(pkg_filter, version=version)
+        with closing(
+            self.stream_project_packages(
+                project,
+                filter=pkg_filter,
+                chunk_size=chunk_size,
+                timeout=timeout,
+                accept=accept,
+                headers=headers,
+            )
+        ) as packages:
+            return next(packages, None)
+
+    def _stream_packages(
+        self,
+        url: str,
+        project: str,
+        pkg_filter: PackageFilter | None,
+        retry: RetryState,
+        chunk_size: int,
+        timeout: float | tuple[float, float] | None,
+        headers: dict[str, str],
+    ) -> Generator[DistributionPackage, None, None]:
+        with self._get(url, retry, stream=True, timeout=timeout, headers=headers) as r:
+            if r.status_code == 404:
+                raise NoSuchProjectError(project, url)
+            r.raise_for_status()
+            ct = ContentType.parse(r.headers.get("content-type", "text/html"))
+            if ct.content_type == "application/vnd.pypi.simple.v1+json":
+                yield from iter_project_packages_json(
+                    iterdecode(self._iter_body(r, chunk_size), "utf-8"),
+                    project_hint=project,
+                    base_url=r.url,
+                    filter=pkg_filter,
+                )
+            elif (
+                ct.content_type == "application/vnd.pypi.simple.v1+html"
+                or ct.content_type == "text/html"
+            ):
+                for link in parse_links_stream(
+                    self._iter_body(r, chunk_size),
+                    base_url=r.url,
+                    http_charset=r.encoding,
+                ):
+                    if pkg_filter is None:
+                        yield DistributionPackage.from_link(link, project)
+                    elif pkg_filter.match_link(link, project):
+                        pkg = DistributionPackage.from_link(link, project)
+                        if pkg_filter.match_predicate(pkg):
+                            yield pkg
+            else:
+                raise UnsupportedContentTypeError(r.url, str(ct))
+
+    def get_project_snapshot(
+        self,
+        project: str,
+        parse_executor: Executor | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        accept: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> bytes:
+        """
+        .. versionadded:: 1.9.0
+
+        Fetches the page for the given project and returns it as a snapshot
+        (See `pypi_simple.snapshot`) instead of as a `ProjectPage`.
+
+        If ``parse_executor`` is given, the raw body of the response is parsed
+        by submitting `pypi_simple.snapshot.parse_project_page()` to the
+        executor, and the calling thread waits for the result.  With a
+        `~concurrent.futures.ProcessPoolExecutor`, this moves the CPU-bound
+        work of parsing out of the calling process; only the response body is
+        sent to the worker, and only the compact snapshot is sent back.
+
+        :param str project: The name of the project to fetch information on.
+            The name does not need to be normalized.
+        :param Optional[concurrent.futures.Executor] parse_executor:
+            an optional executor in which to parse the page
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the request.
+        :rtype: bytes
+        :raises NoSuchProjectError: if the repository responds with a 404 error
+            code
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code other than 404
+        :raises UnsupportedContentTypeError: if the repository responds with an
+            unsupported :mailheader:`Content-Type`
+        :raises UnsupportedRepoVersionError: if the repository version has a
+            greater major component than the supported repository version
+        """
+        request_headers = {"Accept": accept or self.accept}
+        if headers:
+            request_headers.update(headers)
+        url = self.get_project_url(project)
+        r = self._get(url, timeout=timeout, headers=request_headers)
         if r.status_code == 404:
             raise NoSuchProjectError(project, url)
         r.raise_for_status()
-        return ProjectPage.from_response(r, project)
+        args = (
+            project,
+            r.content,
+            r.headers.get("content-type", "text/html"),
+            r.url,
+            r.headers.get("X-PyPI-Last-Serial"),
+        )
+        if parse_executor is None:
+            return parse_project_page(*args)
+        return parse_executor.submit(parse_project_page, *args).result()
+
+    def get_project_page_meta(
+        self,
+        project: str,
+        chunk_size: int = 8192,
+        timeout: float | tuple[float, float] | None = None,
+        accept: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> ProjectPageMeta:
+        """
+        .. versionadded:: 1.9.0
+
+        Fetches only the page-level metadata of the given project's page —
+        its repository version, :pep:`708` tracks & alternate locations,
+        :pep:`792` project status, and last serial — and returns it as a
+        `ProjectPageMeta` instance.  Raises `NoSuchProjectError` if the
+        repository responds with a 404.
+
+        The page is streamed, and the response is closed as soon as the
+        metadata has been read: for HTML pages, this is once the end of the
+        ``<head>`` has been reached; for JSON pages, this is once the ``meta``
+        field and the optional project-level fields have been read, which may
+        require reading the whole page if the optional fields are absent.
+        Packages are never constructed.
+
+        :param str project: The name of the project to fetch information on.
+            The name does not need to be normalized.
+        :param int chunk_size: how many bytes to read from the response at a
+            time
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the request.
+        :rtype: ProjectPageMeta
+        :raises NoSuchProjectError: if the repository responds with a 404 error
+            code
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code other than 404
+        :raises UnsupportedContentTypeError: if the repository responds with an
+            unsupported :mailheader:`Content-Type`
+        :raises UnsupportedRepoVersionError: if the repository version has a
+            greater major component than the supported repository version
+        """
+        request_headers = {"Accept": accept or self.accept}
+        if headers:
+            request_headers.update(headers)
+        url = self.get_project_url(project)
+        retry = self._retry_state(url)
+        while True:
+            try:
+                return self._scan_project_meta(
+                    url, project, retry, chunk_size, timeout, request_headers
+                )
+            except RETRIABLE_ERRORS as e:
+                if not retry.should_retry_error(e):
+                    raise
+
+    def _scan_project_meta(
+        self,
+        url: str,
+        project: str,
+        retry: RetryState,
+        chunk_size: int,
+        timeout: float | tuple[float, float] | None,
+        headers: dict[str, str],
+    ) -> ProjectPageMeta:
+        with self._get(url, retry, stream=True, timeout=timeout, headers=headers) as r:
+            if r.status_code == 404:
+                raise NoSuchProjectError(project, url)
+            r.raise_for_status()
+            ct = ContentType.parse(r.headers.get("content-type", "text/html"))
+            with closing(self._iter_body(r, chunk_size)) as body:
+                if ct.content_type == "application/vnd.pypi.simple.v1+json":
+                    meta = scan_project_meta_json(iterdecode(body, "utf-8"), project)
+                elif (
+                    ct.content_type == "application/vnd.pypi.simple.v1+html"
+                    or ct.content_type == "text/html"
+                ):
+                    meta = ProjectPageMeta.from_repository_page(
+                        project, parse_head_stream(body, http_charset=r.encoding)
+                    )
+                else:
+                    raise UnsupportedContentTypeError(r.url, str(ct))
+            if meta.last_serial is None:
+                meta.last_serial = r.headers.get("X-PyPI-Last-Serial")
+            return meta
+
+    def _iter_body(
+        self, r: requests.Response, chunk_size: int
+    ) -> Generator[bytes, None, None]:
+        """
+        Iterate over the decompressed body of a streaming response, recording
+        the transfer in `stats` once the iteration finishes or is abandoned
+        """
+        size = 0
+        charged = 0
+        try:
+            for chunk in r.iter_content(chunk_size):
+                size += len(chunk)
+                if self.rate_limiter is not None:
+                    wire = wire_bytes_read(r, size)
+                    self.rate_limiter.consume_bytes(r.url, wire - charged)
+                    charged = wire
+                yield chunk
+        finally:
+            self.stats.record(r, size)
 
     def get_project_url(self, project: str) -> str:
         """
@@ -298,6 +1010,45 @@ class PyPISimple:
         """
         return self.endpoint + normalize(project) + "/"
 
+    def project_exists(
+        self,
+        project: str,
+        timeout: float | tuple[float, float] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> bool:
+        """
+        .. versionadded:: 1.9.0
+
+        Check whether the repository has a page for the given project without
+        downloading the page: a ``HEAD`` request is made for the project's URL,
+        and, if the server does not support ``HEAD`` requests, a streaming
+        ``GET`` request is made instead and closed as soon as its status line
+        has been received.
+
+        :param str project: The name of the project to check.  The name does
+            not need to be normalized.
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the request.
+        :rtype: bool
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code other than 404
+        """
+        request_headers = {"Accept": self.accept}
+        if headers:
+            request_headers.update(headers)
+        url = self.get_project_url(project)
+        r = self._head(
+            url, timeout=timeout, headers=request_headers, allow_redirects=True
+        )
+        if r.status_code in (405, 501):
+            with self._get(
+                url, stream=True, timeout=timeout, headers=request_headers
+            ) as r:
+                return page_exists(r)
+        return page_exists(r)
+
     def download_package(
         self,
         pkg: DistributionPackage,
@@ -350,12 +1101,50 @@ class PyPISimple:
         """
         target = Path(os.fsdecode(path))
         target.parent.mkdir(parents=True, exist_ok=True)
+        retry = self._retry_state(pkg.url)
+        while True:
+            try:
+                self._download_package(
+                    pkg,
+                    target,
+                    verify,
+                    keep_on_error,
+                    progress,
+                    timeout,
+                    headers,
+                    retry,
+                )
+            except RETRIABLE_ERRORS as e:
+                if not retry.should_retry_error(e):
+                    raise
+            else:
+                return
+
+    def _download_package(
+        self,
+        pkg: DistributionPackage,
+        target: Path,
+        verify: bool,
+        keep_on_error: bool,
+        progress: Callable[[int | None], ProgressTracker] | None,
+        timeout: float | tuple[float, float] | None,
+        headers: dict[str, str] | None,
+        retry: RetryState,
+    ) -> None:
         digester: AbstractDigestChecker
         if verify:
             digester = DigestChecker(pkg.digests, pkg.url)
         else:
             digester = NullDigestChecker()
-        with self.s.get(pkg.url, stream=True, timeout=timeout, headers=headers) as r:
+        source = file_url_to_path(pkg.url) if self.is_local else None
+        if source is not None and source.is_file():
+            self._copy_package(
+                source, target, verify, digester, keep_on_error, progress
+            )
+            return
+        with self._get(
+            pkg.url, retry, stream=True, timeout=timeout, headers=headers
+        ) as r:
             r.raise_for_status()
             try:
                 content_length = int(r.headers["Content-Length"])
@@ -366,7 +1155,7 @@ class PyPISimple:
             try:
                 with progress(content_length) as p:
                     with target.open("wb") as fp:
-                        for chunk in r.iter_content(65535):
+                        for chunk in self._iter_body(r, 65535):
                             fp.write(chunk)
                             digester.update(chunk)
                             p.update(len(chunk))
@@ -379,6 +1168,39 @@ class PyPISimple:
                         pass
                 raise
 
+    def _copy_package(
+        self,
+        source: Path,
+        target: Path,
+        verify: bool,
+        digester: AbstractDigestChecker,
+        keep_on_error: bool,
+        progress: Callable[[int | None], ProgressTracker] | None,
+    ) -> None:
+        """
+        "Download" a package from a local repository by copying it, letting
+        the OS use the fastest available method (e.g., ``copy_file_range()``
+        or a reflink), and then verify the copy's digests
+        """
+        if progress is None:
+            progress = null_progress_tracker()
+        try:
+            with progress(source.stat().st_size) as p:
+                shutil.copyfile(source, target)
+                p.update(target.stat().st_size)
+            if verify:
+                with target.open("rb") as fp:
+                    while chunk := fp.read(COPY_VERIFY_CHUNK_SIZE):
+                        digester.update(chunk)
+            digester.finalize()
+        except Exception:
+            if not keep_on_error:
+                try:
+                    target.unlink()
+                except FileNotFoundError:
+                    pass
+            raise
+
     def get_package_metadata_bytes(
         self,
         pkg: DistributionPackage,
@@ -423,18 +1245,26 @@ class PyPISimple:
             if ``verify`` is true and the digest of the downloaded data does
             not match the expected value
         """
-        digester: AbstractDigestChecker
-        if verify:
-            digester = DigestChecker(pkg.metadata_digests or {}, pkg.metadata_url)
-        else:
-            digester = NullDigestChecker()
-        r = self.s.get(pkg.metadata_url, timeout=timeout, headers=headers)
-        if r.status_code == 404:
-            raise NoMetadataError(pkg.filename, pkg.metadata_url)
-        r.raise_for_status()
-        digester.update(r.content)
-        digester.finalize()
-        return r.content
+
+        def get_package_metadata_bytes() -> bytes:
+            digester: AbstractDigestChecker
+            if verify:
+                digester = DigestChecker(pkg.metadata_digests or {}, pkg.metadata_url)
+            else:
+                digester = NullDigestChecker()
+            r = self._get(pkg.metadata_url, timeout=timeout, headers=headers)
+            if r.status_code == 404:
+                raise NoMetadataError(pkg.filename, pkg.metadata_url)
+            r.raise_for_status()
+            digester.update(r.content)
+            digester.finalize()
+            return r.content
+
+        # Include `verify` in the key so that an unverified call cannot satisfy
+        # a verified one
+        return self._coalesce(
+            get_package_metadata_bytes, pkg.metadata_url, headers, verify
+        )
 
     def get_package_metadata(
         self,
@@ -532,8 +1362,268 @@ class PyPISimple:
         url = pkg.provenance_url
         if url is None:
             raise NoProvenanceError(pkg.filename, None)
-        r = self.s.get(url, timeout=timeout, headers=headers)
+        r = self._get(url, timeout=timeout, headers=headers)
         if r.status_code == 404:
             raise NoProvenanceError(pkg.filename, url)
         r.raise_for_status()
         return json.loads(r.content)  # type: ignore[no-any-return]
+
+    def get_project_pages(
+        self,
+        projects: Iterable[str],
+        concurrency: int | ConcurrencyLimiter = DEFAULT_CONCURRENCY,
+        timeout: float | tuple[float, float] | None = None,
+        accept: str | None = None,
+        headers: dict[str, str] | None = None,
+        parse_executor: Executor | None = None,
+    ) -> Iterator[BatchResult[str, ProjectPage]]:
+        """
+        .. versionadded:: 1.9.0
+
+        Fetch the pages for multiple projects concurrently, yielding a
+        `BatchResult` for each project as its page is retrieved.  Results are
+        yielded in the order in which the requests complete.  Errors (such as
+        `NoSuchProjectError`) are reported via the results' ``error``
+        attributes rather than raised.
+
+        The number of concurrent requests is controlled by ``concurrency``,
+        which may be either a fixed number or a `ConcurrencyLimiter` such as
+        `AdaptiveConcurrency`.  To avoid discarding connections, the client's
+        connection pool size (See `ConnectionOptions`) should be at least the
+        maximum concurrency.
+
+        :param Iterable[str] projects: the names of the projects to fetch
+        :param concurrency:
+            the maximum number of simultaneous requests or a limiter
+        :type concurrency: int | ConcurrencyLimiter
+        :param timeout: optional timeout to pass to the ``requests`` calls
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the requests.
+        :param Optional[concurrent.futures.Executor] parse_executor:
+            If given, each page is parsed by submitting
+            `pypi_simple.snapshot.parse_project_page()` to this executor
+            (usually a `~concurrent.futures.ProcessPoolExecutor`) rather than
+            in the fetching thread; see `get_project_snapshot()`.  Parsing
+            HTML and validating JSON is CPU-bound, so this lets parsing
+            throughput scale with the number of cores.
+        :rtype: Iterator[BatchResult[str, ProjectPage]]
+        """
+        if parse_executor is None:
+            func: Callable[[str], ProjectPage] = partial(
+                self.get_project_page, timeout=timeout, accept=accept, headers=headers
+            )
+        else:
+            executor = parse_executor
+
+            def func(project: str) -> ProjectPage:
+                page = loads(
+                    self.get_project_snapshot(
+                        project,
+                        parse_executor=executor,
+                        timeout=timeout,
+                        accept=accept,
+                        headers=headers,
+                    )
+                )
+                assert isinstance(page, ProjectPage)
+                return page
+
+        return run_batch(func, projects, concurrency)
+
+    def projects_exist(
+        self,
+        projects: Iterable[str],
+        index: IndexPage | NameIndex | None = None,
+        concurrency: int | ConcurrencyLimiter = DEFAULT_CONCURRENCY,
+        timeout: float | tuple[float, float] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> dict[str, bool]:
+        """
+        .. versionadded:: 1.9.0
+
+        Check whether the repository has pages for multiple projects, returning
+        a `dict` mapping each given project name (as given) to a `bool`.
+
+        If ``index`` is given, the names are looked up in it, and no requests
+        are made; this is intended for use with a cached copy of the
+        repository's index page (e.g., one loaded with
+        `pypi_simple.snapshot.load()`) or with a `~pypi_simple.nameindex.NameIndex`.
+        The normalized names of an `IndexPage` are computed on first use and
+        cached on the page (See `IndexPage.normalized_projects`).
+        Otherwise, `project_exists()` is called for each distinct normalized
+        name concurrently, in the same manner as `get_project_pages()`.
+
+        :param Iterable[str] projects: the names of the projects to check.  The
+            names do not need to be normalized.
+        :param index: an optional cached index of the repository's projects
+        :type index: IndexPage | pypi_simple.nameindex.NameIndex | None
+        :param concurrency:
+            the maximum number of simultaneous requests or a limiter
+        :type concurrency: int | ConcurrencyLimiter
+        :param timeout: optional timeout to pass to the ``requests`` calls
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the requests.
+        :rtype: dict[str, bool]
+        :raises requests.HTTPError: if the repository responds to any request
+            with an HTTP error code other than 404
+        """
+        names = list(projects)
+        if isinstance(index, IndexPage):
+            known = index.normalized_projects
+            return {name: normalize(name) in known for name in names}
+        elif index is not None:
+            return {name: name in index for name in names}
+        exists: dict[str, bool] = {}
+        for r in run_batch(
+            partial(self.project_exists, timeout=timeout, headers=headers),
+            {normalize(name) for name in names},
+            concurrency,
+        ):
+            exists[r.item] = r.unwrap()
+        return {name: exists[normalize(name)] for name in names}
+
+    def get_packages_metadata(
+        self,
+        pkgs: Iterable[DistributionPackage],
+        verify: bool = True,
+        concurrency: int | ConcurrencyLimiter = DEFAULT_CONCURRENCY,
+        timeout: float | tuple[float, float] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Iterator[BatchResult[DistributionPackage, str]]:
+        """
+        .. versionadded:: 1.9.0
+
+        Retrieve the distribution metadata for multiple packages concurrently,
+        yielding a `BatchResult` for each package as its metadata is retrieved.
+        See `get_package_metadata()` and `get_project_pages()` for more
+        information.
+
+        :param Iterable[DistributionPackage] pkgs:
+            the distribution packages to retrieve the metadata of
+        :param bool verify:
+            whether to verify the metadata's digests against the retrieved data
+        :param concurrency:
+            the maximum number of simultaneous requests or a limiter
+        :type concurrency: int | ConcurrencyLimiter
+        :param timeout: optional timeout to pass to the ``requests`` calls
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the requests.
+        :rtype: Iterator[BatchResult[DistributionPackage, str]]
+        """
+        return run_batch(
+            partial(
+                self.get_package_metadata,
+                verify=verify,
+                timeout=timeout,
+                headers=headers,
+            ),
+            pkgs,
+            concurrency,
+        )
+
+    def download_packages(
+        self,
+        pkgs: Iterable[DistributionPackage],
+        directory: AnyStr | os.PathLike[AnyStr],
+        verify: bool = True,
+        keep_on_error: bool = False,
+        concurrency: int | ConcurrencyLimiter = DEFAULT_CONCURRENCY,
+        timeout: float | tuple[float, float] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Iterator[BatchResult[DistributionPackage, Path]]:
+        """
+        .. versionadded:: 1.9.0
+
+        Download multiple packages concurrently into the given directory, each
+        one saved under its `~DistributionPackage.filename`, yielding a
+        `BatchResult` containing the path to each downloaded file as it
+        completes.  See `download_package()` and `get_project_pages()` for more
+        information.
+
+        :param Iterable[DistributionPackage] pkgs:
+            the distribution packages to download
+        :param directory:
+            the directory in which to save the downloaded files; it will be
+            created if it does not already exist
+        :param bool verify:
+            whether to verify the packages' digests against the downloaded
+            files
+        :param bool keep_on_error:
+            whether to keep (true) or delete (false; default) a downloaded file
+            if an error occurs
+        :param concurrency:
+            the maximum number of simultaneous requests or a limiter
+        :type concurrency: int | ConcurrencyLimiter
+        :param timeout: optional timeout to pass to the ``requests`` calls
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[dict[str, str]] headers:
+            Custom headers to provide for the requests.
+        :rtype: Iterator[BatchResult[DistributionPackage, pathlib.Path]]
+        """
+        dirpath = Path(os.fsdecode(directory))
+
+        def download(pkg: DistributionPackage) -> Path:
+            target = dirpath / pkg.filename
+            self.download_package(
+                pkg,
+                target,
+                verify=verify,
+                keep_on_error=keep_on_error,
+                timeout=timeout,
+                headers=headers,
+            )
+            return target
+
+        return run_batch(download, pkgs, concurrency)
+
+
+def page_exists(r: requests.Response) -> bool:
+    """
+    Return whether a response to a request for a project page indicates that
+    the page exists
+    """
+    if r.status_code == 404:
+        return False
+    r.raise_for_status()
+    return True
+
+
+def copy_session(session: requests.Session) -> requests.Session:
+    """
+    .. versionadded:: 1.9.0
+
+    Create a new session with the same configuration as ``session``.  The
+    headers, query parameters, proxies, and hooks are copied, while the cookie
+    jar (which does its own locking) and the mounted transport adapters (whose
+    connection pools are thread-safe) are shared with ``session``.
+
+    The new session is an instance of the same class as ``session`` if that
+    class can be instantiated without arguments, and a plain
+    `requests.Session` otherwise.  Only the standard `requests.Session`
+    attributes listed above are carried over; any other state that a subclass
+    keeps on its instances is left as the subclass's constructor sets it.
+    """
+    try:
+        new = type(session)()
+    except TypeError:
+        new = requests.Session()
+    new.headers = CaseInsensitiveDict(session.headers)
+    new.params = copy(session.params)
+    new.proxies = dict(session.proxies)
+    new.hooks = {k: list(v) for k, v in session.hooks.items()}
+    new.auth = session.auth
+    new.verify = session.verify
+    new.cert = session.cert
+    new.stream = session.stream
+    new.trust_env = session.trust_env
+    new.max_redirects = session.max_redirects
+    new.cookies = session.cookies
+    new.adapters = OrderedDict(session.adapters)
+    return new
@@ -0,0 +1,199 @@
+from __future__ import annotations
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+import threading
+import time
+from typing import Protocol, runtime_checkable
+
+
+class Outcome(str, Enum):
+    """
+    .. versionadded:: 1.9.0
+
+    Classification of the result of a request, as reported to a
+    `ConcurrencyLimiter`
+    """
+
+    #: The request completed (possibly with a non-retriable error such as a
+    #: 404) and the server appears healthy
+    OK = "ok"
+
+    #: The server asked the client to slow down (e.g., 429 or 503)
+    THROTTLED = "throttled"
+
+    #: The request failed with a connection error, timeout, or server error
+    ERROR = "error"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@runtime_checkable
+class ConcurrencyLimiter(Protocol):
+    """
+    .. versionadded:: 1.9.0
+
+    A `typing.Protocol` for objects that control how many requests a batch
+    operation performs at once.  Before starting each request, the batch
+    operation calls `acquire()`, which must block until another request may be
+    started; once the request finishes, `release()` is called with the
+    request's latency and `Outcome`.
+    """
+
+    #: The largest number of concurrent requests the limiter will ever permit;
+    #: this is used to size thread pools
+    max_limit: int
+
+    def acquire(self) -> None: ...
+
+    def release(self, latency: float, outcome: Outcome) -> None: ...
+
+
+class FixedConcurrency:
+    """
+    .. versionadded:: 1.9.0
+
+    A `ConcurrencyLimiter` that permits a fixed number of concurrent requests
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.max_limit = limit
+        self.sem = threading.BoundedSemaphore(limit)
+
+    def acquire(self) -> None:
+        self.sem.acquire()
+
+    def release(self, latency: float, outcome: Outcome) -> None:  # noqa: U100
+        self.sem.release()
+
+
+@dataclass
+class ConcurrencyDecision:
+    """
+    .. versionadded:: 1.9.0
+
+    A record of a change made to an `AdaptiveConcurrency` limit
+    """
+
+    #: The `time.monotonic()` time at which the decision was made
+    timestamp: float
+
+    #: The limit before the change
+    old_limit: int
+
+    #: The limit after the change
+    new_limit: int
+
+    #: A short description of why the limit changed
+    reason: str
+
+
+class AdaptiveConcurrency:
+    """
+    .. versionadded:: 1.9.0
+
+    A `ConcurrencyLimiter` that adjusts the number of concurrent requests using
+    an additive-increase/multiplicative-decrease (AIMD) scheme, much like TCP
+    congestion control:
+
+    - Each successful request whose latency is within ``latency_tolerance``
+      times the baseline latency increases the limit by ``1 / limit``, so that
+      the limit grows by about one for each round of requests.
+
+    - A request that is throttled (429/503), that fails, or whose latency
+      exceeds the tolerance multiplies the limit by ``backoff``.  The limit is
+      decreased at most once per baseline latency so that a burst of
+      simultaneous failures only counts once.
+
+    The baseline latency is the lowest latency recently observed; it slowly
+    drifts towards the current latency so that the limiter adapts when the
+    server's normal response time changes.
+
+    The current limit, number of requests in flight, and a log of recent
+    decisions are available for monitoring, and an ``on_change`` callback can
+    be supplied that will be called with each `ConcurrencyDecision`.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        history: int = 100,
+        on_change: Callable[[ConcurrencyDecision], None] | None = None,
+    ) -> None:
+        if not (1 <= min_limit <= initial <= max_limit):
+            raise ValueError("Must have 1 <= min_limit <= initial <= max_limit")
+        if not (0 < backoff < 1):
+            raise ValueError("backoff must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.on_change = on_change
+        self.cond = threading.Condition()
+        self._limit = float(initial)
+        self._in_flight = 0
+        self.baseline: float | None = None
+        self.last_decrease = float("-inf")
+        #: Recent changes to the limit, oldest first
+        self.decisions: deque[ConcurrencyDecision] = deque(maxlen=history)
+
+    @property
+    def limit(self) -> int:
+        """The current maximum number of concurrent requests"""
+        with self.cond:
+            return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently in progress"""
+        with self.cond:
+            return self._in_flight
+
+    def acquire(self) -> None:
+        with self.cond:
+            while self._in_flight >= int(self._limit):
+                self.cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, outcome: Outcome) -> None:
+        decision: ConcurrencyDecision | None = None
+        with self.cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+            old = int(self._limit)
+            if outcome is Outcome.OK:
+                if self.baseline is None or latency < self.baseline:
+                    self.baseline = latency
+                else:
+                    self.baseline += (latency - self.baseline) * 0.01
+                if latency <= self.baseline * self.latency_tolerance:
+                    self._limit = min(
+                        float(self.max_limit), self._limit + 1 / int(self._limit)
+                    )
+                    reason = "healthy"
+                else:
+                    reason = self.decrease(now, "latency")
+            else:
+                reason = self.decrease(now, str(outcome))
+            new = int(self._limit)
+            if new != old:
+                decision = ConcurrencyDecision(now, old, new, reason)
+                self.decisions.append(decision)
+            self.cond.notify_all()
+        if decision is not None and self.on_change is not None:
+            self.on_change(decision)
+
+    def decrease(self, now: float, reason: str) -> str:
+        # Must be called with `cond` held
+        if now - self.last_decrease >= (self.baseline or 0):
+            self._limit = max(float(self.min_limit), self._limit * self.backoff)
+            self.last_decrease = now
+        return reason
@@ -0,0 +1,382 @@
+"""
+.. versionadded:: 1.9.0
+
+Crawling every project page in a simple repository, with the project list
+divided deterministically into shards so that a crawl can be spread across
+multiple processes or machines, each of which crawls one shard without any
+coordination with the others.
+
+A project belongs to shard ``zlib.crc32(name) % nshards``, where ``name`` is
+the project's :pep:`503`-normalized name encoded in UTF-8.  Each shard is
+crawled by a `Crawler`, which stores the following files in its output
+directory, where ``{shard}`` stands for ``shard-{i}-of-{n}`` with ``i`` and
+``n`` zero-padded to five digits:
+
+- ``{shard}.names`` — the normalized names of the projects in the shard, one
+  per line, written when the crawl starts
+
+- ``{shard}.pages`` — the results of the crawl, as a sequence of records, each
+  of which consists of a header (a one-byte record kind, the two-byte length
+  of the project name, and the four-byte length of the record data), the
+  normalized project name in UTF-8, and the record data.  For projects whose
+  pages were fetched, the data is a snapshot of the `ProjectPage` (See
+  `pypi_simple.snapshot`); for projects that no longer exist, the data is
+  empty.
+
+- ``{shard}.checkpoint.json`` — the checkpoint file, recording the length of
+  the pages file as of the last time it was flushed to disk
+
+All integers are little-endian.  When a crawl is resumed, the pages file is
+truncated to the checkpointed length (discarding any records that might not
+have been completely written), and the projects with records in the
+remainder of the file are skipped.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import struct
+from typing import IO, Any
+import zlib
+from .batch import DEFAULT_CONCURRENCY
+from .classes import ProjectPage
+from .client import PyPISimple
+from .concurrency import ConcurrencyLimiter
+from .errors import NoSuchProjectError, SnapshotError
+from .snapshot import dumps, loads
+from .util import atomic_write, normalize
+
+#: The current checkpoint file format version
+CHECKPOINT_VERSION = 1
+
+#: The number of completed projects after which the pages file is flushed to
+#: disk and the checkpoint is rewritten during a crawl
+DEFAULT_CHECKPOINT_INTERVAL = 100
+
+RECORD_HEADER = struct.Struct("<BHI")
+
+#: Record kind for a project whose page was fetched
+KIND_PAGE = 1
+
+#: Record kind for a project that the repository reported as nonexistent
+KIND_MISSING = 2
+
+
+def shard_of(project: str, nshards: int) -> int:
+    """
+    Return the index of the shard that the given project belongs to when
+    crawling with ``nshards`` shards
+    """
+    return zlib.crc32(normalize(project).encode("utf-8")) % nshards
+
+
+@dataclass
+class CrawlReport:
+    """
+    .. versionadded:: 1.9.0
+
+    A summary of a call to `Crawler.crawl()` or `Crawler.resume()`.  All
+    project names are normalized.
+    """
+
+    #: The number of project pages fetched & written
+    fetched: int = 0
+
+    #: Projects that the repository reported as nonexistent
+    missing: list[str] = field(default_factory=list)
+
+    #: Projects that could not be fetched, mapped to the errors that occurred.
+    #: These projects will be retried by the next call to `Crawler.resume()`.
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+    #: The number of projects skipped because they had already been crawled
+    skipped: int = 0
+
+
+class Crawler:
+    """
+    .. versionadded:: 1.9.0
+
+    A crawler for shard ``shard`` (counting from zero) of ``nshards`` of the
+    projects in the repository that ``client`` points to, writing its results
+    to files in the directory ``root`` (which is created if it does not
+    exist).  Multiple crawlers for different shards (or even different
+    crawls, as long as their shard counts differ) can share a directory.
+
+    Pages are fetched concurrently with `PyPISimple.get_project_pages()` and
+    appended to the shard's pages file as they arrive.  After every
+    ``checkpoint_interval`` completed projects and whenever a crawl ends, even
+    if by an exception, the pages file is flushed to disk and the checkpoint
+    is updated, so that an interrupted crawl can be continued with
+    `resume()` — possibly in a new process — without refetching more than
+    ``checkpoint_interval`` pages.
+
+    :param PyPISimple client: the client for the repository to crawl
+    :param root: the directory in which to store the crawl's files
+    :param int shard: the index of the shard to crawl
+    :param int nshards: the total number of shards
+    :param concurrency:
+        the maximum number of simultaneous requests, or a limiter
+    :type concurrency: int | ConcurrencyLimiter
+    :param int checkpoint_interval:
+        the number of completed projects after which to write a checkpoint
+    :raises ValueError: if ``shard`` is not less than ``nshards``
+    """
+
+    def __init__(
+        self,
+        client: PyPISimple,
+        root: str | os.PathLike[str],
+        shard: int = 0,
+        nshards: int = 1,
+        concurrency: int | ConcurrencyLimiter = DEFAULT_CONCURRENCY,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ) -> None:
+        if not 0 <= shard < nshards:
+            raise ValueError("shard must be at least 0 and less than nshards")
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be at least 1")
+        #: The client for the repository being crawled
+        self.client = client
+        #: The directory in which the crawl's files are stored
+        self.root = Path(root)
+        self.shard = shard
+        self.nshards = nshards
+        self.concurrency = concurrency
+        self.checkpoint_interval = checkpoint_interval
+
+    @property
+    def stem(self) -> str:
+        return f"shard-{self.shard:05d}-of-{self.nshards:05d}"
+
+    @property
+    def names_path(self) -> Path:
+        """The path to the file listing the shard's projects"""
+        return self.root / f"{self.stem}.names"
+
+    @property
+    def pages_path(self) -> Path:
+        """The path to the shard's pages file"""
+        return self.root / f"{self.stem}.pages"
+
+    @property
+    def checkpoint_path(self) -> Path:
+        """The path to the shard's checkpoint file"""
+        return self.root / f"{self.stem}.checkpoint.json"
+
+    def crawl(self, projects: Iterable[str] | None = None) -> CrawlReport:
+        """
+        Start a new crawl of the shard, discarding the results of any previous
+        crawl, and crawl it to completion.
+
+        :param projects:
+            the names of all projects in the repository (or a subset thereof);
+            only those belonging to this crawler's shard are crawled.  If not
+            given, the names are obtained with
+            `PyPISimple.stream_project_names()`.
+        :type projects: Optional[Iterable[str]]
+        :rtype: CrawlReport
+        """
+        if projects is None:
+            projects = self.client.stream_project_names()
+        names = sorted(
+            {
+                name
+                for p in projects
+                if shard_of(name := normalize(p), self.nshards) == self.shard
+            }
+        )
+        self.root.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.names_path, "".join(f"{n}\n" for n in names).encode("utf-8"))
+        with self.pages_path.open("wb"):
+            pass
+        self.save_checkpoint(0)
+        return self.resume()
+
+    def resume(self) -> CrawlReport:
+        """
+        Continue the crawl of the shard that was started by `crawl()`,
+        skipping the projects that were completed before the last checkpoint.
+        Projects that failed in previous runs are retried.  Errors for
+        individual projects are recorded in the returned `CrawlReport`
+        instead of being raised.
+
+        :rtype: CrawlReport
+        :raises FileNotFoundError: if no crawl of the shard has been started
+        :raises ValueError: if the checkpoint file is invalid
+        """
+        offset = self.load_checkpoint()
+        with self.names_path.open(encoding="utf-8") as fp:
+            names = [line.strip() for line in fp if line.strip()]
+        report = CrawlReport()
+        with self.pages_path.open("r+b") as fp:
+            fp.truncate(offset)
+            done = {name for _, name, _ in iter_records(fp)}
+            fp.seek(offset)
+            todo = [n for n in names if n not in done]
+            report.skipped = len(names) - len(todo)
+            completed = 0
+            try:
+                for r in self.client.get_project_pages(todo, self.concurrency):
+                    if isinstance(r.error, NoSuchProjectError):
+                        write_record(fp, KIND_MISSING, r.item, b"")
+                        report.missing.append(r.item)
+                    elif r.error is not None:
+                        report.failed[r.item] = r.error
+                        continue
+                    else:
+                        assert r.value is not None
+                        write_record(fp, KIND_PAGE, r.item, dumps(r.value))
+                        report.fetched += 1
+                    completed += 1
+                    if completed % self.checkpoint_interval == 0:
+                        self.sync(fp)
+            finally:
+                self.sync(fp)
+        return report
+
+    def is_complete(self) -> bool:
+        """
+        Whether every project in the shard has been crawled as of the last
+        checkpoint
+        """
+        try:
+            offset = self.load_checkpoint()
+            with self.names_path.open(encoding="utf-8") as fp:
+                names = {line.strip() for line in fp if line.strip()}
+        except FileNotFoundError:
+            return False
+        with self.pages_path.open("rb") as fp:
+            done = {name for _, name, _ in iter_records(fp, offset)}
+        return names <= done
+
+    def sync(self, fp: IO[bytes]) -> None:
+        """
+        Flush the pages file to disk and record its length in the checkpoint
+        """
+        fp.flush()
+        os.fsync(fp.fileno())
+        self.save_checkpoint(fp.tell())
+
+    def load_checkpoint(self) -> int:
+        """
+        Return the length of the pages file recorded in the checkpoint
+
+        :raises FileNotFoundError: if there is no checkpoint
+        :raises ValueError: if the checkpoint file is invalid
+        """
+        with self.checkpoint_path.open(encoding="utf-8") as fp:
+            data = json.load(fp)
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != CHECKPOINT_VERSION
+            or data.get("shard") != self.shard
+            or data.get("nshards") != self.nshards
+            or not isinstance(data.get("offset"), int)
+        ):
+            raise ValueError(
+                f"{self.checkpoint_path}: unsupported or invalid checkpoint file"
+            )
+        offset: int = data["offset"]
+        return offset
+
+    def save_checkpoint(self, offset: int) -> None:
+        """Atomically write the checkpoint file"""
+        data: dict[str, Any] = {
+            "version": CHECKPOINT_VERSION,
+            "shard": self.shard,
+            "nshards": self.nshards,
+            "offset": offset,
+        }
+        atomic_write(self.checkpoint_path, json.dumps(data).encode("utf-8"))
+
+
+def crawl_shard(
+    endpoint: str | os.PathLike[str],
+    root: str | os.PathLike[str],
+    shard: int,
+    nshards: int,
+    resume: bool = False,
+    **kwargs: Any,
+) -> CrawlReport:
+    """
+    Crawl one shard of the repository at ``endpoint`` (a URL or a local
+    directory path, as accepted by `PyPISimple`) with a new client, storing
+    the results in ``root``.  If ``resume`` is true and a crawl of the shard
+    has been started, it is resumed; otherwise, a new crawl is started.
+    Additional keyword arguments are passed to `Crawler`.
+
+    This function is intended for running shards in separate processes, e.g.,
+    with `concurrent.futures.ProcessPoolExecutor`:
+
+    .. code:: python
+
+        with ProcessPoolExecutor() as pool:
+            futures = [
+                pool.submit(crawl_shard, endpoint, root, i, n) for i in range(n)
+            ]
+
+    :rtype: CrawlReport
+    """
+    with PyPISimple(endpoint) as client:
+        crawler = Crawler(client, root, shard, nshards, **kwargs)
+        if resume and crawler.checkpoint_path.exists():
+            return crawler.resume()
+        return crawler.crawl()
+
+
+def write_record(fp: IO[bytes], kind: int, name: str, data: bytes) -> None:
+    bname = name.encode("utf-8")
+    fp.write(RECORD_HEADER.pack(kind, len(bname), len(data)) + bname + data)
+
+
+def iter_records(
+    fp: IO[bytes], end: int | None = None
+) -> Iterator[tuple[int, str, bytes]]:
+    """
+    Read ``(kind, name, data)`` records from a pages file, starting at the
+    current position and stopping at offset ``end`` (if given), the end of
+    the file, or the first incomplete record
+    """
+    while end is None or fp.tell() + RECORD_HEADER.size <= end:
+        header = fp.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return
+        kind, namelen, datalen = RECORD_HEADER.unpack(header)
+        if end is not None and fp.tell() + namelen + datalen > end:
+            return
+        name = fp.read(namelen)
+        data = fp.read(datalen)
+        if len(name) < namelen or len(data) < datalen:
+            return
+        yield (kind, name.decode("utf-8"), data)
+
+
+def read_pages(path: str | os.PathLike[str]) -> Iterator[ProjectPage]:
+    """
+    Yield the `ProjectPage` objects stored in a crawl's pages file in the
+    order that they were written
+
+    :raises SnapshotError: if a record is corrupt
+    """
+    with open(path, "rb") as fp:
+        for kind, name, data in iter_records(fp):
+            if kind == KIND_PAGE:
+                page = loads(data)
+                if not isinstance(page, ProjectPage):
+                    raise SnapshotError(f"Record for {name!r} is not a project page")
+                yield page
+
+
+def read_missing(path: str | os.PathLike[str]) -> Iterator[str]:
+    """
+    Yield the names of the projects recorded as nonexistent in a crawl's pages
+    file
+    """
+    with open(path, "rb") as fp:
+        for kind, name, _ in iter_records(fp):
+            if kind == KIND_MISSING:
+                yield name
@@ -0,0 +1,195 @@
+"""
+.. versionadded:: 1.9.0
+
+Computing the differences between two listings of a repository's projects,
+for turning full re-crawls into incremental syncs
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from enum import Enum
+from heapq import merge
+from operator import itemgetter
+from packaging.utils import canonicalize_name as normalize
+from .classes import IndexPage
+from .nameindex import NameIndex
+from .util import parse_serial
+
+#: A project listing: a `NameIndex`, an `IndexPage`, or an iterable of project
+#: names or ``(name, last_serial)`` pairs (such as is returned by
+#: `PyPISimple.stream_project_serials()`)
+ProjectListing = (
+    NameIndex | IndexPage | Iterable[str] | Iterable[tuple[str, int | None]]
+)
+
+
+class Change(str, Enum):
+    """
+    .. versionadded:: 1.9.0
+
+    A kind of difference between two project listings
+    """
+
+    #: The project is only in the new listing
+    ADDED = "added"
+
+    #: The project is only in the old listing
+    REMOVED = "removed"
+
+    #: The project is in both listings, and its serial has increased
+    CHANGED = "changed"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@dataclass
+class IndexDelta:
+    """
+    .. versionadded:: 1.9.0
+
+    The differences between two project listings, as computed by
+    `compute_delta()`.  All project names are normalized and sorted.
+    """
+
+    #: Projects that are only in the new listing
+    added: list[str] = field(default_factory=list)
+
+    #: Projects that are only in the old listing
+    removed: list[str] = field(default_factory=list)
+
+    #: Projects that are in both listings and whose serials have increased
+    changed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def to_fetch(self) -> list[str]:
+        """
+        The projects whose pages need to be (re-)fetched in order to bring a
+        copy of the old listing's pages up to date, in sorted order
+        """
+        return list(merge(self.added, self.changed))
+
+
+def sorted_entries(listing: ProjectListing) -> Iterator[tuple[str, int | None]]:
+    """
+    Return the entries of a project listing as an iterator of ``(name,
+    last_serial)`` pairs sorted by normalized name, with duplicate names
+    collapsed (keeping the largest serial).  `NameIndex` listings are already
+    sorted and are read lazily; other listings are normalized and sorted in
+    memory.
+    """
+    if isinstance(listing, NameIndex):
+        return listing.items()
+    items: Iterable[str] | Iterable[tuple[str, int | None]]
+    if isinstance(listing, IndexPage):
+        items = listing.projects
+    else:
+        items = listing
+    entries = sorted(
+        (
+            (
+                (normalize(item), None)
+                if isinstance(item, str)
+                else (normalize(item[0]), item[1])
+            )
+            for item in items
+        ),
+        key=itemgetter(0),
+    )
+    return collapse(entries)
+
+
+def collapse(
+    entries: Iterable[tuple[str, int | None]],
+) -> Iterator[tuple[str, int | None]]:
+    """
+    Collapse runs of sorted entries with the same name into a single entry with
+    the largest serial
+    """
+    current: tuple[str, int | None] | None = None
+    for name, serial in entries:
+        if current is None:
+            current = (name, serial)
+        elif current[0] != name:
+            yield current
+            current = (name, serial)
+        elif serial is not None and (current[1] is None or serial > current[1]):
+            current = (name, serial)
+    if current is not None:
+        yield current
+
+
+def diff_listings(
+    old: ProjectListing,
+    new: ProjectListing,
+    known_serials: Mapping[str, int | str | None] | None = None,
+) -> Iterator[tuple[str, Change]]:
+    """
+    Compare two project listings by merging their sorted entries and yield a
+    ``(name, change)`` pair for each normalized project name that differs
+    between them, in sorted order.
+
+    A project present in both listings is reported as `Change.CHANGED` if its
+    serial in ``new`` is greater than its serial in ``old``.  If
+    ``known_serials`` is given, it maps normalized project names to the serials
+    of the project pages that were last fetched (e.g., the values of their
+    `ProjectPage.last_serial` fields, which are converted to `int`s), and these
+    serials take precedence over those in ``old``.  Projects whose old or new
+    serials are unknown are never reported as changed.
+    """
+    known = known_serials or {}
+    old_iter = sorted_entries(old)
+    new_iter = sorted_entries(new)
+    o = next(old_iter, None)
+    n = next(new_iter, None)
+    while o is not None or n is not None:
+        if n is None or (o is not None and o[0] < n[0]):
+            assert o is not None
+            yield (o[0], Change.REMOVED)
+            o = next(old_iter, None)
+        elif o is None or n[0] < o[0]:
+            yield (n[0], Change.ADDED)
+            n = next(new_iter, None)
+        else:
+            name, new_serial = n
+            old_serial = parse_serial(known[name]) if name in known else o[1]
+            if (
+                new_serial is not None
+                and old_serial is not None
+                and new_serial > old_serial
+            ):
+                yield (name, Change.CHANGED)
+            o = next(old_iter, None)
+            n = next(new_iter, None)
+
+
+def compute_delta(
+    old: ProjectListing,
+    new: ProjectListing,
+    known_serials: Mapping[str, int | str | None] | None = None,
+) -> IndexDelta:
+    """
+    Compare two project listings and return an `IndexDelta` describing the
+    differences.  See `diff_listings()` for details.
+
+    Either listing may be, e.g., a `NameIndex` snapshot (which is compared
+    without loading it into memory), an `IndexPage`, or the output of a live
+    `PyPISimple.stream_project_serials()` or
+    `PyPISimple.stream_project_names()` call.  Note that, in order to detect
+    changed projects, the new listing must provide per-project serials, which
+    is only the case for JSON index pages from repositories like PyPI that
+    include ``_last-serial`` fields.
+    """
+    delta = IndexDelta()
+    for name, change in diff_listings(old, new, known_serials):
+        if change is Change.ADDED:
+            delta.added.append(name)
+        elif change is Change.REMOVED:
+            delta.removed.append(name)
+        else:
+            delta.changed.append(name)
+    return delta
@@ -178,3 +178,34 @@ class NoProvenanceError(Exception):
             return f"No provenance file declared for {self.filename}"
         else:
             return f"No provenance file found for {self.filename} at {self.url}"
+
+
+class NoMirrorsAvailableError(Exception):
+    """
+    .. versionadded:: 1.9.0
+
+    Raised by `MultiMirrorClient` when every mirror has been taken out of
+    rotation by its circuit breaker
+    """
+
+    def __init__(self, endpoints: list[str]) -> None:
+        #: The base URLs of the mirrors
+        self.endpoints = endpoints
+        super().__init__(endpoints)
+
+    def __str__(self) -> str:
+        return "No mirrors available; all circuit breakers are open: " + ", ".join(
+            self.endpoints
+        )
+
+
+class SnapshotError(ValueError):
+    """
+    .. versionadded:: 1.9.0
+
+    Raised by `pypi_simple.snapshot.load()`, `pypi_simple.snapshot.loads()`,
+    and `pypi_simple.nameindex.NameIndex` when given data that is not a valid
+    snapshot or name index of the current format version
+    """
+
+    pass
@@ -0,0 +1,155 @@
+from __future__ import annotations
+from collections.abc import Callable, Collection, Iterable
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Any
+from packaging.utils import canonicalize_version
+from .errors import UnparsableFilenameError
+from .filenames import parse_filename
+
+if TYPE_CHECKING:
+    from .classes import DistributionPackage
+    from .html import Link
+
+
+@dataclass(frozen=True)
+class PackageFilter:
+    """
+    .. versionadded:: 1.9.0
+
+    A declarative filter on the packages of a project page.  A package is
+    accepted if it satisfies every criterion that is set.
+
+    A filter can be passed to `PyPISimple.get_project_page()`,
+    `PyPISimple.stream_project_packages()`, and the `ProjectPage`
+    constructors, in which case the version, package type, yanked, and
+    filename criteria are checked against the raw links or file entries of the
+    page (whose filenames & yanked statuses are available without further
+    processing), and entries that fail them are discarded without being
+    converted into `DistributionPackage` objects (or, for JSON pages, without
+    being validated).  ``predicate`` is only applied to the packages
+    constructed from the remaining entries.
+
+    A `PackageFilter` can also be called directly on a `DistributionPackage`
+    to test whether it passes all of the criteria.
+    """
+
+    #: If set, only packages with this version are accepted.  Versions are
+    #: compared after normalization, so ``"1.0"`` also matches ``"1.0.0"``.
+    version: str | None = None
+
+    #: If set, only packages whose `~DistributionPackage.package_type` is in
+    #: this collection are accepted
+    package_types: Collection[str] | None = None
+
+    #: Whether to accept yanked packages
+    yanked: bool = True
+
+    #: If set, only packages whose filenames match this shell-style glob
+    #: pattern (as understood by `fnmatch.fnmatchcase()`) are accepted
+    filename: str | None = None
+
+    #: If set, a callable that is passed each `DistributionPackage` that
+    #: passes the other criteria and returns true if it is accepted
+    predicate: Callable[[DistributionPackage], bool] | None = None
+
+    canonical_version: str | None = field(
+        init=False, repr=False, compare=False, default=None
+    )
+
+    def __post_init__(self) -> None:
+        if self.package_types is not None:
+            object.__setattr__(self, "package_types", frozenset(self.package_types))
+        if self.version is not None:
+            object.__setattr__(
+                self, "canonical_version", canonicalize_version(self.version)
+            )
+
+    def __call__(self, pkg: DistributionPackage) -> bool:
+        return (
+            self.match_unparsed(pkg.filename, pkg.is_yanked)
+            and self.match_parsed(pkg.version, pkg.package_type)
+            and self.match_predicate(pkg)
+        )
+
+    @property
+    def needs_parse(self) -> bool:
+        """
+        Whether the filter needs a package's parsed filename in order to be
+        applied
+        """
+        return self.version is not None or self.package_types is not None
+
+    def match_entry(
+        self, filename: str, is_yanked: bool, project_hint: str | None = None
+    ) -> bool:
+        """
+        Apply all criteria other than ``predicate`` to a package with the given
+        filename and yanked status.  Filenames are only parsed if the version
+        or package type is being filtered on.
+        """
+        if not self.match_unparsed(filename, is_yanked):
+            return False
+        if not self.needs_parse:
+            return True
+        version: str | None
+        package_type: str | None
+        try:
+            _, version, package_type = parse_filename(filename, project_hint)
+        except UnparsableFilenameError:
+            version = package_type = None
+        return self.match_parsed(version, package_type)
+
+    def match_link(self, link: Link, project_hint: str | None = None) -> bool:
+        """
+        Apply all criteria other than ``predicate`` to a `Link` from an HTML
+        project page
+        """
+        return self.match_entry(link.text, "data-yanked" in link.attrs, project_hint)
+
+    def match_file_data(self, data: Any, project_hint: str | None = None) -> bool:
+        """
+        Apply all criteria other than ``predicate`` to an unvalidated element
+        of the ``"files"`` field of a :pep:`691` project page.  Elements that
+        are not well-formed enough to be checked are accepted so that they will
+        fail validation later.
+        """
+        if not isinstance(data, dict) or not isinstance(
+            filename := data.get("filename"), str
+        ):
+            return True
+        yanked = data.get("yanked", False)
+        return self.match_entry(filename, yanked is not False, project_hint)
+
+    def match_unparsed(self, filename: str, is_yanked: bool) -> bool:
+        if not self.yanked and is_yanked:
+            return False
+        return self.filename is None or fnmatchcase(filename, self.filename)
+
+    def match_parsed(self, version: str | None, package_type: str | None) -> bool:
+        if self.package_types is not None and package_type not in self.package_types:
+            return False
+        if self.version is not None:
+            if version is None:
+                return False
+            if (
+                version != self.version
+                and canonicalize_version(version) != self.canonical_version
+            ):
+                return False
+        return True
+
+    def match_predicate(self, pkg: DistributionPackage) -> bool:
+        """Apply ``predicate`` (if set) to a package"""
+        return self.predicate is None or self.predicate(pkg)
+
+    def finish(
+        self, packages: Iterable[DistributionPackage]
+    ) -> list[DistributionPackage]:
+        """
+        Apply ``predicate`` to packages constructed from entries that passed
+        the other criteria
+        """
+        if self.predicate is None:
+            return list(packages)
+        return [p for p in packages if self.predicate(p)]
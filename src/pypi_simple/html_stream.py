@@ -7,7 +7,7 @@ from typing import AnyStr, cast
 from urllib.parse import urljoin
 from bs4.dammit import EncodingDetector
 import requests
-from .html import Link
+from .html import Link, RepositoryPage
 from .util import check_repo_version
 
 # List taken from BeautifulSoup4 source
@@ -108,6 +108,87 @@ class LinkParser(HTMLParser):
         super().close()
 
 
+#: Elements that may appear in a document's ``<head>``; the start of any other
+#: element implicitly ends the head
+HEAD_TAGS = {
+    "base",
+    "head",
+    "html",
+    "link",
+    "meta",
+    "noscript",
+    "script",
+    "style",
+    "template",
+    "title",
+}
+
+
+class HeadParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.pypi_meta: dict[str, list[str]] = {}
+        self.done = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self.done:
+            return
+        if tag not in HEAD_TAGS:
+            self.done = True
+        elif tag == "meta":
+            attrdict = {k: v for k, v in attrs}
+            name = attrdict.get("name")
+            content = attrdict.get("content")
+            if name is not None and name.startswith("pypi:") and content is not None:
+                if (
+                    name == "pypi:repository-version"
+                    and "repository-version" not in self.pypi_meta
+                ):
+                    check_repo_version(content)
+                self.pypi_meta.setdefault(name[5:], []).append(content)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "head":
+            self.done = True
+
+
+def parse_head_stream(
+    htmlseq: Iterable[AnyStr], http_charset: str | None = None
+) -> RepositoryPage:
+    """
+    .. versionadded:: 1.9.0
+
+    Parse the ``<head>`` of an HTML page given as an iterable of `bytes` or
+    `str` and return a `RepositoryPage` containing the ``pypi:`` ``<meta/>``
+    tags found therein and no links.  Elements of ``htmlseq`` are only
+    consumed until the end of the head (signalled by either ``</head>`` or
+    the start of an element that cannot occur in a head, like ``<body>``) is
+    reached, so the rest of the document is never read.
+
+    :param Iterable[AnyStr] htmlseq: an iterable of either `bytes` or `str`
+        that, when joined together, form an HTML document to parse
+    :param Optional[str] http_charset: the document's encoding as declared by
+        the transport layer, if any
+    :rtype: RepositoryPage
+    :raises UnsupportedRepoVersionError: if the repository version has a
+        greater major component than the supported repository version
+    """
+    parser = HeadParser()
+    for piece in iterhtmldecode(htmlseq, http_charset=http_charset):
+        parser.feed(piece)
+        if parser.done:
+            break
+    else:
+        parser.close()
+    try:
+        repository_version = parser.pypi_meta["repository-version"][0]
+    except LookupError:
+        repository_version = None
+    return RepositoryPage(
+        repository_version=repository_version, links=[], pypi_meta=parser.pypi_meta
+    )
+
+
 def parse_links_stream_response(
     r: requests.Response, chunk_size: int = 65535
 ) -> Iterator[Link]:
@@ -0,0 +1,213 @@
+"""
+.. versionadded:: 1.9.0
+
+An optional `requests` transport adapter that sends requests over HTTP/2 using
+httpx_, allowing many concurrent requests to the same host to be multiplexed
+over a single TLS connection.  Using this module requires installing
+``pypi-simple`` with the ``http2`` extra.
+
+.. _httpx: https://www.python-httpx.org
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator, Mapping
+import threading
+from typing import Any
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+from .adapters import ConnectionOptions
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    A `requests.adapters.BaseAdapter` that performs requests with an
+    `httpx.Client` with HTTP/2 enabled.  Mount an instance on a
+    `requests.Session` (or pass ``http2=True`` to `PyPISimple`) in order to
+    use it.
+
+    Because httpx configures TLS and proxies per client rather than per
+    request, a separate underlying client is created for each distinct
+    combination of ``verify``, ``cert``, and proxy URL that requests are made
+    with.  The proxy for each request is selected from the ``proxies`` mapping
+    passed by `requests` (which includes proxies from the environment, such
+    as :envvar:`HTTPS_PROXY`, when the session's ``trust_env`` is true) in the
+    same way as by `requests.adapters.HTTPAdapter`.  When a custom
+    ``transport`` is given, proxies are left to the transport.
+
+    :param Optional[ConnectionOptions] connection:
+        Optional connection-pool and socket settings; the pool sizes, connection
+        retries, and socket options are translated to their httpx equivalents
+    :param bool http1:
+        Whether to allow falling back to HTTP/1.1 for servers that do not
+        support HTTP/2.  When this is false, plain ``http://`` URLs are
+        requested using HTTP/2 with "prior knowledge" (h2c).
+    :param transport:
+        An optional custom `httpx.BaseTransport` to use instead of an
+        `httpx.HTTPTransport` (mainly useful for testing)
+    """
+
+    def __init__(
+        self,
+        connection: ConnectionOptions | None = None,
+        http1: bool = True,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        super().__init__()
+        self.connection = connection or ConnectionOptions()
+        self.http1 = http1
+        self.transport = transport
+        self.clients: dict[tuple[Any, Any, str | None], httpx.Client] = {}
+        self.lock = threading.Lock()
+
+    def get_client(
+        self, verify: Any = True, cert: Any = None, proxy: str | None = None
+    ) -> httpx.Client:
+        """
+        Return the underlying `httpx.Client` for the given TLS settings and
+        proxy URL, creating it if necessary
+        """
+        key = (verify, cert, proxy)
+        with self.lock:
+            try:
+                return self.clients[key]
+            except KeyError:
+                pass
+            transport = self.transport
+            if transport is None:
+                opts = self.connection
+                transport = httpx.HTTPTransport(
+                    verify=verify,
+                    cert=cert,
+                    proxy=proxy,
+                    http1=self.http1,
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=(
+                            opts.pool_connections * opts.pool_maxsize
+                            if opts.pool_block
+                            else None
+                        ),
+                        max_keepalive_connections=opts.pool_maxsize,
+                    ),
+                    retries=opts.connect_retries,
+                    socket_options=opts.socket_options(),
+                )
+            client = httpx.Client(transport=transport, follow_redirects=False)
+            self.clients[key] = client
+            return client
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> requests.Response:
+        assert request.url is not None
+        proxy = None
+        if self.transport is None and proxies:
+            proxy = select_proxy(request.url, dict(proxies))
+        client = self.get_client(verify, cert, proxy)
+        assert request.method is not None
+        req = client.build_request(
+            request.method,
+            request.url,
+            headers=list(request.headers.items()),
+            content=request.body,
+            timeout=to_httpx_timeout(timeout),
+        )
+        try:
+            resp = client.send(req, stream=True)
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+        response = requests.Response()
+        response.status_code = resp.status_code
+        response.headers = CaseInsensitiveDict(resp.headers.multi_items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = HTTPXRawResponse(resp)
+        response.reason = resp.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self  # type: ignore[assignment]
+        if not stream:
+            # Read the body now so that the connection is freed up
+            response.content
+        return response
+
+    def close(self) -> None:
+        with self.lock:
+            for client in self.clients.values():
+                client.close()
+            self.clients.clear()
+
+
+class HTTPXRawResponse:
+    """
+    A minimal stand-in for a urllib3 response that `requests.Response` can
+    read a streamed `httpx.Response` body through
+    """
+
+    def __init__(self, resp: httpx.Response) -> None:
+        self.resp = resp
+        self.buffer = b""
+        self.chunks: Iterator[bytes] | None = None
+
+    @property
+    def reason(self) -> str:
+        return self.resp.reason_phrase
+
+    def stream(
+        self,
+        amt: int | None = None,
+        decode_content: bool | None = None,  # noqa: U100
+    ) -> Iterator[bytes]:
+        try:
+            yield from self.resp.iter_bytes(amt)
+        except httpx.TimeoutException as e:
+            raise requests.ConnectionError(e)
+        except httpx.DecodingError as e:
+            raise requests.exceptions.ContentDecodingError(e)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        finally:
+            self.close()
+
+    def read(self, amt: int | None = None) -> bytes:
+        if self.chunks is None:
+            self.chunks = self.stream()
+        while amt is None or len(self.buffer) < amt:
+            try:
+                self.buffer += next(self.chunks)
+            except StopIteration:
+                break
+        if amt is None:
+            amt = len(self.buffer)
+        data, self.buffer = self.buffer[:amt], self.buffer[amt:]
+        return data
+
+    def tell(self) -> int:
+        """Return the number of (possibly compressed) bytes received so far"""
+        return self.resp.num_bytes_downloaded
+
+    def close(self) -> None:
+        self.resp.close()
+
+
+def to_httpx_timeout(timeout: Any) -> httpx.Timeout:
+    """Convert a ``requests`` timeout value to an `httpx.Timeout`"""
+    if isinstance(timeout, httpx.Timeout):
+        return timeout
+    elif isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    else:
+        return httpx.Timeout(timeout)
@@ -0,0 +1,298 @@
+from __future__ import annotations
+from collections.abc import Container, Iterable, Iterator
+import json
+import re
+from typing import TYPE_CHECKING, Any
+from .classes import DistributionPackage, ProjectPageMeta
+from .pep691 import File, Meta, ProjectHead, ProjectItem
+from .util import check_repo_version
+
+if TYPE_CHECKING:
+    from .filters import PackageFilter
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+#: Characters that can follow a complete number or literal in valid JSON
+DELIMITERS = frozenset(" \t\n\r,]}")
+
+#: Once this many characters of the buffer have been consumed, the consumed
+#: portion is discarded
+COMPACT_THRESHOLD = 1 << 16
+
+
+class JSONObjectStream:
+    """
+    An incremental parser for a JSON document consisting of a single top-level
+    object.  Text is supplied in pieces via `feed()`, and each member of the
+    object is returned as a ``(key, value)`` pair as soon as it has been
+    completely received.
+
+    Members whose keys are in ``array_keys`` and whose values are arrays are
+    not returned whole; instead, each element of the array is returned as a
+    ``(key, element)`` pair as soon as the element has been received, so that
+    large arrays never need to be held in memory in their entirety.
+    """
+
+    def __init__(self, array_keys: Container[str] = ()) -> None:
+        self.array_keys = array_keys
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.state = "start"
+        self.key: str | None = None
+
+    def feed(self, text: str, final: bool = False) -> list[tuple[str, Any]]:
+        """
+        Add ``text`` to the document being parsed and return the members (or
+        array elements) that were completed by it.  Set ``final`` to true when
+        passing the last piece of the document.
+
+        :raises ValueError: if the document is not a well-formed JSON object
+        """
+        if self.pos >= COMPACT_THRESHOLD:
+            self.buf = self.buf[self.pos :]
+            self.pos = 0
+        self.buf += text
+        out: list[tuple[str, Any]] = []
+        while self.step(out, final):
+            pass
+        if final and self.state != "done":
+            raise self.error("Unexpected end of JSON document")
+        return out
+
+    def step(self, out: list[tuple[str, Any]], final: bool) -> bool:
+        """
+        Consume the next token or value from the buffer, appending any
+        completed member to ``out``.  Returns `False` if more input is needed.
+        """
+        m = WHITESPACE.match(self.buf, self.pos)
+        assert m is not None
+        self.pos = m.end()
+        if self.pos >= len(self.buf):
+            return False
+        c = self.buf[self.pos]
+        if self.state == "start":
+            self.expect(c, "{")
+            self.state = "key_or_end"
+        elif self.state in ("key_or_end", "key"):
+            if c == "}" and self.state == "key_or_end":
+                self.pos += 1
+                self.state = "done"
+            else:
+                self.expect(c, '"', advance=False)
+                key = self.decode(final)
+                if key is self.INCOMPLETE:
+                    return False
+                self.key = key
+                self.state = "colon"
+        elif self.state == "colon":
+            self.expect(c, ":")
+            self.state = "value"
+        elif self.state == "value":
+            assert self.key is not None
+            if c == "[" and self.key in self.array_keys:
+                self.pos += 1
+                self.state = "item_or_end"
+            else:
+                value = self.decode(final)
+                if value is self.INCOMPLETE:
+                    return False
+                out.append((self.key, value))
+                self.state = "comma_or_end"
+        elif self.state in ("item_or_end", "item"):
+            assert self.key is not None
+            if c == "]" and self.state == "item_or_end":
+                self.pos += 1
+                self.state = "comma_or_end"
+            else:
+                value = self.decode(final)
+                if value is self.INCOMPLETE:
+                    return False
+                out.append((self.key, value))
+                self.state = "item_comma_or_end"
+        elif self.state == "item_comma_or_end":
+            if c == "]":
+                self.state = "comma_or_end"
+            else:
+                self.expect(c, ",", advance=False)
+                self.state = "item"
+            self.pos += 1
+        elif self.state == "comma_or_end":
+            if c == "}":
+                self.state = "done"
+            else:
+                self.expect(c, ",", advance=False)
+                self.state = "key"
+            self.pos += 1
+        else:
+            assert self.state == "done"
+            raise self.error("Extra data after JSON document")
+        return True
+
+    INCOMPLETE = object()
+
+    def decode(self, final: bool) -> Any:
+        start = self.pos
+        try:
+            value, end = self.decoder.raw_decode(self.buf, start)
+        except json.JSONDecodeError as e:
+            if final:
+                raise e
+            return self.INCOMPLETE
+        if (
+            not final
+            and self.buf[start] not in '{["'
+            and (end >= len(self.buf) or self.buf[end] not in DELIMITERS)
+        ):
+            # A number or literal that is not followed by a delimiter may be
+            # truncated
+            return self.INCOMPLETE
+        self.pos = end
+        return value
+
+    def expect(self, c: str, expected: str, advance: bool = True) -> None:
+        if c != expected:
+            raise self.error(f"Expected {expected!r}, got {c!r}")
+        if advance:
+            self.pos += 1
+
+    def error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self.buf, self.pos)
+
+
+def iter_json_object(
+    textseq: Iterable[str], array_keys: Container[str] = ()
+) -> Iterator[tuple[str, Any]]:
+    """
+    Parse a JSON object given as an iterable of `str` pieces, yielding each
+    ``(key, value)`` member as soon as it has been read.  See
+    `JSONObjectStream` for the treatment of ``array_keys``.
+
+    :raises ValueError: if the document is not a well-formed JSON object
+    """
+    parser = JSONObjectStream(array_keys)
+    for piece in textseq:
+        yield from parser.feed(piece)
+    yield from parser.feed("", final=True)
+
+
+def iter_project_names_json(textseq: Iterable[str]) -> Iterator[str]:
+    """
+    Parse a :pep:`691` JSON index page given as an iterable of `str` pieces and
+    yield the name of each project listed as soon as it has been read.  See
+    `iter_project_items_json()` for more information.
+    """
+    for name, _ in iter_project_items_json(textseq):
+        yield name
+
+
+def iter_project_items_json(
+    textseq: Iterable[str],
+) -> Iterator[tuple[str, int | None]]:
+    """
+    Parse a :pep:`691` JSON index page given as an iterable of `str` pieces and
+    yield a ``(name, last_serial)`` pair for each project listed as soon as it
+    has been read.  ``last_serial`` is the value of the project's
+    ``_last-serial`` field (as provided by PyPI), or `None` if not specified.
+
+    The repository version is checked as soon as the ``meta`` field is
+    encountered; if the field comes after the ``projects`` field, some names
+    will have been yielded by the time the check occurs.
+
+    :raises UnsupportedRepoVersionError: if the repository version has a
+        greater major component than the supported repository version
+    :raises ValueError: if the document is not a well-formed index page
+    """
+    meta_seen = False
+    for key, value in iter_json_object(textseq, array_keys={"projects"}):
+        if key == "meta":
+            check_repo_version(Meta.model_validate(value).api_version)
+            meta_seen = True
+        elif key == "projects":
+            item = ProjectItem.model_validate(value)
+            yield (item.name, item.last_serial)
+    if not meta_seen:
+        raise ValueError("JSON index page is missing 'meta' field")
+
+
+def iter_project_packages_json(
+    textseq: Iterable[str],
+    project_hint: str | None = None,
+    base_url: str | None = None,
+    filter: PackageFilter | None = None,  # noqa: A002
+) -> Iterator[DistributionPackage]:
+    """
+    Parse a :pep:`691` JSON project page given as an iterable of `str` pieces
+    and yield a `DistributionPackage` for each file listed as soon as it has
+    been read.  If ``filter`` is given, file entries rejected by it are
+    discarded before being validated.
+
+    The repository version is checked as soon as the ``meta`` field is
+    encountered; if the field comes after the ``files`` field, some packages
+    will have been yielded by the time the check occurs.
+
+    :raises UnsupportedRepoVersionError: if the repository version has a
+        greater major component than the supported repository version
+    :raises ValueError: if the document is not a well-formed project page
+    """
+    meta_seen = False
+    for key, value in iter_json_object(textseq, array_keys={"files"}):
+        if key == "meta":
+            check_repo_version(Meta.model_validate(value).api_version)
+            meta_seen = True
+        elif key == "files":
+            if filter is not None and not filter.match_file_data(value, project_hint):
+                continue
+            pkg = DistributionPackage.from_file(
+                File.model_validate(value), project_hint, base_url
+            )
+            if filter is None or filter.match_predicate(pkg):
+                yield pkg
+    if not meta_seen:
+        raise ValueError("JSON project page is missing 'meta' field")
+
+
+#: The top-level fields of a :pep:`691` project page that make up its
+#: page-level metadata
+PROJECT_HEAD_KEYS = frozenset(["meta", "name", "alternate-locations", "project-status"])
+
+
+def scan_project_meta_json(textseq: Iterable[str], project: str) -> ProjectPageMeta:
+    """
+    Parse the page-level fields of a :pep:`691` JSON project page given as an
+    iterable of `str` pieces, and stop consuming the iterable as soon as all
+    of them have been read.  The page's files & versions are skipped without
+    being validated.
+
+    As :pep:`691` does not specify the order of an object's fields, pages that
+    omit one of the optional fields (or that put it after the ``files`` field)
+    are read to the end.
+
+    ``project`` is used as the project name if the page's ``name`` field has
+    not been read by the time scanning stops.
+
+    :raises UnsupportedRepoVersionError: if the repository version has a
+        greater major component than the supported repository version
+    :raises ValueError: if the document is not a well-formed project page
+    """
+    fields: dict[str, Any] = {}
+    for key, value in iter_json_object(textseq, array_keys={"files", "versions"}):
+        if key not in PROJECT_HEAD_KEYS:
+            continue
+        if key == "meta":
+            check_repo_version(Meta.model_validate(value).api_version)
+        fields[key] = value
+        if len(fields) == len(PROJECT_HEAD_KEYS):
+            break
+    if "meta" not in fields:
+        raise ValueError("JSON project page is missing 'meta' field")
+    head = ProjectHead.model_validate(fields)
+    return ProjectPageMeta(
+        project=head.name if head.name is not None else project,
+        repository_version=head.meta.api_version,
+        last_serial=head.meta.last_serial,
+        tracks=head.meta.tracks,
+        alternate_locations=head.alternate_locations,
+        status=head.project_status.status,
+        status_reason=head.project_status.reason,
+    )
@@ -0,0 +1,217 @@
+"""
+.. versionadded:: 1.9.0
+
+Support for reading simple repositories stored as static file trees on local
+or network filesystems via ``file://`` URLs
+"""
+
+from __future__ import annotations
+from collections.abc import Mapping
+from email.utils import formatdate
+import io
+import mimetypes
+import os
+from pathlib import Path
+from typing import Any, BinaryIO
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+#: The files that are looked for when a directory URL is requested, along with
+#: the :mailheader:`Content-Type` that each is served with, in order of
+#: preference when the :mailheader:`Accept` header does not decide between
+#: them
+INDEX_FILES: list[tuple[str, str]] = [
+    ("index.json", "application/vnd.pypi.simple.v1+json"),
+    ("index.html", "text/html"),
+]
+
+#: Media types that a file served as ``text/html`` also satisfies
+HTML_ALIASES = ("application/vnd.pypi.simple.v1+html",)
+
+
+def file_url_to_path(url: str) -> Path | None:
+    """
+    Convert a ``file://`` URL to a local filesystem path.  Returns `None` if
+    ``url`` is not a ``file://`` URL for the local host.
+    """
+    bits = urlsplit(url)
+    if bits.scheme != "file" or bits.netloc not in ("", "localhost"):
+        return None
+    return Path(url2pathname(bits.path))
+
+
+def parse_accept(accept: str | None) -> list[tuple[str, float]]:
+    """
+    Parse an :mailheader:`Accept` header into a list of ``(media_range,
+    quality)`` pairs.  A missing header is treated as ``*/*``.
+    """
+    if not accept:
+        return [("*/*", 1.0)]
+    ranges = []
+    for item in accept.split(","):
+        media_range, *params = [p.strip() for p in item.split(";")]
+        if not media_range:
+            continue
+        q = 1.0
+        for p in params:
+            name, _, value = p.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges.append((media_range.lower(), q))
+    return ranges
+
+
+def quality(ranges: list[tuple[str, float]], content_type: str) -> float:
+    """
+    Return the quality with which ``content_type`` is accepted by the parsed
+    :mailheader:`Accept` header ``ranges``, using the most specific matching
+    media range
+    """
+    maintype = content_type.partition("/")[0]
+    best: tuple[int, float] = (-1, 0.0)
+    for media_range, q in ranges:
+        if media_range == content_type:
+            specificity = 2
+        elif media_range == f"{maintype}/*":
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+        if specificity > best[0]:
+            best = (specificity, q)
+    return best[1]
+
+
+def choose_index(directory: Path, accept: str | None) -> tuple[Path, str] | None:
+    """
+    Return the path and :mailheader:`Content-Type` of the index file in
+    ``directory`` that best satisfies the :mailheader:`Accept` header
+    ``accept``, or `None` if there is no acceptable index file
+    """
+    ranges = parse_accept(accept)
+    best: tuple[Path, str] | None = None
+    best_q = 0.0
+    for filename, content_type in INDEX_FILES:
+        path = directory / filename
+        if not path.is_file():
+            continue
+        q = quality(ranges, content_type)
+        if content_type == "text/html":
+            for alias in HTML_ALIASES:
+                q = max(q, quality(ranges, alias))
+        if q > best_q:
+            best, best_q = (path, content_type), q
+    return best
+
+
+class FileBody:
+    """
+    A file-like response body that closes the underlying file as soon as it
+    has been read to the end.  (Unlike urllib3 responses, `requests` never
+    closes a plain file object used as a response body by itself.)
+    """
+
+    def __init__(self, fp: BinaryIO) -> None:
+        self.fp = fp
+        self.pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if self.fp.closed:
+            return b""
+        data = self.fp.read(size)
+        self.pos += len(data)
+        if not data or size < 0:
+            self.close()
+        return data
+
+    def tell(self) -> int:
+        return self.pos
+
+    def close(self) -> None:
+        self.fp.close()
+
+
+class FileAdapter(BaseAdapter):
+    """
+    A `requests` transport adapter that serves ``file://`` URLs from the local
+    filesystem, allowing `PyPISimple` to read a static :pep:`503` / :pep:`691`
+    repository tree without an HTTP server.  `PyPISimple` mounts an instance
+    of this adapter on its session automatically when its endpoint is a
+    ``file://`` URL or a path.
+
+    A request for a file returns the file's contents, streamed directly from
+    disk.  A request for a directory returns the directory's ``index.html`` or
+    ``index.json`` file, whichever best matches the request's
+    :mailheader:`Accept` header, with the appropriate
+    :mailheader:`Content-Type`.  Missing files result in 404 responses.
+    """
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,  # noqa: U100
+        timeout: Any = None,  # noqa: U100
+        verify: bool | str = True,  # noqa: U100
+        cert: Any = None,  # noqa: U100
+        proxies: Mapping[str, str] | None = None,  # noqa: U100
+    ) -> requests.Response:
+        assert request.url is not None
+        if request.method not in ("GET", "HEAD"):
+            return self.build_response(request, 405, "Method Not Allowed")
+        path = file_url_to_path(request.url)
+        if path is None:
+            return self.build_response(request, 400, "Bad Request")
+        content_type: str | None
+        if path.is_dir():
+            index = choose_index(path, request.headers.get("Accept"))
+            if index is None:
+                return self.build_response(request, 404, "Not Found")
+            path, content_type = index
+        else:
+            content_type = mimetypes.guess_type(path.name)[0]
+        try:
+            fp = path.open("rb")
+        except (FileNotFoundError, NotADirectoryError):
+            return self.build_response(request, 404, "Not Found")
+        except PermissionError:
+            return self.build_response(request, 403, "Forbidden")
+        st = os.fstat(fp.fileno())
+        headers = {
+            "Content-Type": content_type or "application/octet-stream",
+            "Content-Length": str(st.st_size),
+            "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        }
+        if request.method == "HEAD":
+            fp.close()
+            return self.build_response(request, 200, "OK", headers)
+        return self.build_response(request, 200, "OK", headers, FileBody(fp))
+
+    def build_response(
+        self,
+        request: requests.PreparedRequest,
+        status: int,
+        reason: str,
+        headers: dict[str, str] | None = None,
+        body: FileBody | None = None,
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers or {})
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = body if body is not None else io.BytesIO(b"")
+        response.url = request.url or ""
+        response.request = request
+        response.connection = self  # type: ignore[assignment]
+        return response
+
+    def close(self) -> None:
+        pass
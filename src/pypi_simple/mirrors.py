@@ -0,0 +1,419 @@
+from __future__ import annotations
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from enum import Enum
+import math
+import threading
+import time
+from types import TracebackType
+from typing import Any, TypeVar
+from .batch import classify, mark_worker_thread
+from .classes import IndexPage, ProjectPage
+from .client import PyPISimple
+from .concurrency import Outcome
+from .errors import NoMirrorsAvailableError
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    """
+    .. versionadded:: 1.9.0
+
+    The state of a `CircuitBreaker`
+    """
+
+    #: Requests are permitted
+    CLOSED = "closed"
+
+    #: Requests are refused until the cooldown period has elapsed
+    OPEN = "open"
+
+    #: A single probe request is permitted in order to test whether the mirror
+    #: has recovered
+    HALF_OPEN = "half-open"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class CircuitBreaker:
+    """
+    .. versionadded:: 1.9.0
+
+    A thread-safe circuit breaker for taking a persistently failing mirror out
+    of rotation.
+
+    After ``failure_threshold`` consecutive failures, the breaker opens and
+    refuses all requests for ``cooldown`` seconds.  After that, it becomes
+    half-open and permits a single probe request; if the probe succeeds, the
+    breaker closes again, and if it fails, the breaker reopens for another
+    cooldown period.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self._state = CircuitState.CLOSED
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the breaker"""
+        with self.lock:
+            if (
+                self._state is CircuitState.OPEN
+                and time.monotonic() >= self.opened_at + self.cooldown
+            ):
+                self._state = CircuitState.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Return whether a request may be sent now.  When the breaker is
+        half-open, this returns `True` only once until the probe's outcome is
+        recorded.
+        """
+        state = self.state
+        with self.lock:
+            if state is CircuitState.CLOSED:
+                return True
+            elif state is CircuitState.HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            else:
+                return False
+
+    def cancel_probe(self) -> None:
+        """
+        Withdraw a request permitted by `allow()` that will never be sent
+        (e.g., because it was cancelled before it started), so that a
+        half-open breaker permits another probe
+        """
+        with self.lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self.probing = False
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.probing = False
+            self._state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if (
+                self._state is CircuitState.HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self._state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+class LatencyWindow:
+    """
+    A thread-safe record of the most recent ``size`` latencies observed for a
+    mirror
+    """
+
+    def __init__(self, size: int = 100) -> None:
+        self.samples: deque[float] = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.samples)
+
+    def add(self, latency: float) -> None:
+        with self.lock:
+            self.samples.append(latency)
+
+    def percentile(self, p: float) -> float | None:
+        """
+        Return the ``p``-th percentile (using the nearest-rank method) of the
+        recorded latencies, or `None` if there are none
+        """
+        with self.lock:
+            data = sorted(self.samples)
+        if not data:
+            return None
+        rank = max(1, math.ceil(p / 100 * len(data)))
+        return data[rank - 1]
+
+
+class Mirror:
+    """
+    .. versionadded:: 1.9.0
+
+    A single endpoint of a `MultiMirrorClient` along with its health
+    information
+    """
+
+    def __init__(
+        self, client: PyPISimple, breaker: CircuitBreaker, window: int = 100
+    ) -> None:
+        #: The client for the endpoint
+        self.client = client
+        #: The endpoint's circuit breaker
+        self.breaker = breaker
+        #: The latencies of the endpoint's recent successful requests
+        self.latencies = LatencyWindow(window)
+
+    def __repr__(self) -> str:
+        return f"<Mirror {self.client.endpoint} [{self.breaker.state}]>"
+
+    @property
+    def endpoint(self) -> str:
+        return self.client.endpoint
+
+
+class MultiMirrorClient:
+    """
+    .. versionadded:: 1.9.0
+
+    A client for fetching pages from several mirrors of the same simple
+    repository, using hedged requests to cut down on tail latency.
+
+    Each request is first sent to the healthiest, fastest mirror.  If no
+    response has arrived after a delay equal to the ``hedge_percentile``-th
+    percentile of that mirror's recent latencies, a duplicate "hedge" request
+    is sent to the next mirror, and so on; a mirror that fails outright is
+    replaced by the next one immediately.  The first successful response is
+    returned, and any duplicate requests that have not yet started are
+    cancelled.  (Requests that are already in progress cannot be interrupted
+    and are simply left to finish in the background, with their results
+    discarded.)  Until a mirror has recorded ``min_samples`` latencies,
+    ``initial_hedge_delay`` is used as its hedging delay.
+
+    Responses that indicate a definitive answer, such as a 404 for a
+    nonexistent project, count as successes: the resulting exception is raised
+    immediately without consulting other mirrors.  Connection errors,
+    timeouts, and server errors count as failures, and each mirror has a
+    `CircuitBreaker` that takes it out of rotation after
+    ``failure_threshold`` consecutive failures for ``cooldown`` seconds.
+
+    A `MultiMirrorClient` can be used as a context manager that closes all of
+    its clients on exit.
+
+    :param endpoints:
+        the mirrors to use, as either base URLs or `PyPISimple` instances, in
+        order of preference
+    :param float hedge_percentile:
+        the percentile of a mirror's latency after which a hedge request is
+        sent
+    :param float initial_hedge_delay:
+        the hedging delay to use before enough latencies have been recorded
+    :param int min_samples:
+        the number of latencies that must be recorded for a mirror before its
+        percentile is used as the hedging delay
+    :param float min_hedge_delay: a lower bound on the hedging delay
+    :param int failure_threshold:
+        the number of consecutive failures after which a mirror is taken out
+        of rotation
+    :param float cooldown:
+        the number of seconds for which a failing mirror is taken out of
+        rotation
+    :param Optional[int] max_workers:
+        the maximum number of threads to use for sending requests
+    :param kwargs:
+        additional arguments to pass to `PyPISimple` when constructing clients
+        from base URLs
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[str | PyPISimple],
+        hedge_percentile: float = 95.0,
+        initial_hedge_delay: float = 1.0,
+        min_samples: int = 10,
+        min_hedge_delay: float = 0.01,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        max_workers: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("At least one endpoint must be given")
+        #: The mirrors, in order of preference
+        self.mirrors: list[Mirror] = [
+            Mirror(
+                e if isinstance(e, PyPISimple) else PyPISimple(endpoint=e, **kwargs),
+                CircuitBreaker(failure_threshold, cooldown),
+            )
+            for e in endpoints
+        ]
+        self.hedge_percentile = hedge_percentile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_samples = min_samples
+        self.min_hedge_delay = min_hedge_delay
+        self.pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pypi-simple-mirror",
+            initializer=mark_worker_thread,
+        )
+        self.lock = threading.Lock()
+        #: The number of hedge requests that have been sent
+        self.hedges_sent = 0
+        #: The number of requests won by a hedge request rather than the first
+        #: request sent
+        self.hedges_won = 0
+
+    def __enter__(self) -> MultiMirrorClient:
+        return self
+
+    def __exit__(
+        self,
+        _exc_type: type[BaseException] | None,
+        _exc_val: BaseException | None,
+        _exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the thread pool and all of the mirrors' clients"""
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        for m in self.mirrors:
+            m.client.close()
+
+    def get_index_page(
+        self,
+        timeout: float | tuple[float, float] | None = None,
+        accept: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> IndexPage:
+        """
+        Fetch the index page from the mirrors.  See
+        `PyPISimple.get_index_page()` for more information.
+        """
+        return self.call(
+            lambda c: c.get_index_page(timeout=timeout, accept=accept, headers=headers)
+        )
+
+    def get_project_page(
+        self,
+        project: str,
+        timeout: float | tuple[float, float] | None = None,
+        accept: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> ProjectPage:
+        """
+        Fetch the page for the given project from the mirrors.  See
+        `PyPISimple.get_project_page()` for more information.
+        """
+        return self.call(
+            lambda c: c.get_project_page(
+                project, timeout=timeout, accept=accept, headers=headers
+            )
+        )
+
+    def hedge_delay(self, mirror: Mirror) -> float:
+        """
+        Return the number of seconds to wait for a response from ``mirror``
+        before sending a hedge request to another mirror
+        """
+        if len(mirror.latencies) < self.min_samples:
+            delay = self.initial_hedge_delay
+        else:
+            delay = mirror.latencies.percentile(self.hedge_percentile) or 0.0
+        return max(self.min_hedge_delay, delay)
+
+    def ranked(self) -> list[Mirror]:
+        """
+        Return the mirrors in the order in which they should be tried: mirrors
+        whose breakers are closed come first, ordered by median latency (with
+        unmeasured mirrors first and ties broken by preference order)
+        """
+
+        def key(m: Mirror) -> tuple[bool, float]:
+            median = m.latencies.percentile(50)
+            return (m.breaker.state is not CircuitState.CLOSED, median or 0.0)
+
+        return sorted(self.mirrors, key=key)
+
+    def call(self, func: Callable[[PyPISimple], T]) -> T:
+        """
+        Call ``func`` on the clients of the mirrors with hedging as described
+        above, and return the first successful result.
+
+        :raises NoMirrorsAvailableError:
+            if every mirror's circuit breaker is open
+        """
+        candidates = iter(self.ranked())
+        pending: dict[Future[T], Mirror] = {}
+        first: Future[T] | None = None
+        last_error: Exception | None = None
+
+        def launch() -> Mirror | None:
+            nonlocal first
+            for m in candidates:
+                if m.breaker.allow():
+                    try:
+                        fut = self.pool.submit(self.attempt, m, func)
+                    except BaseException:
+                        m.breaker.cancel_probe()
+                        raise
+                    pending[fut] = m
+                    if first is None:
+                        first = fut
+                    else:
+                        with self.lock:
+                            self.hedges_sent += 1
+                    return m
+            return None
+
+        if (current := launch()) is None:
+            raise NoMirrorsAvailableError([m.endpoint for m in self.mirrors])
+        try:
+            while pending:
+                timeout = None if current is None else self.hedge_delay(current)
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # Hedge: send a duplicate request to the next mirror
+                    current = launch()
+                    continue
+                failed = False
+                for fut in done:
+                    del pending[fut]
+                    try:
+                        result = fut.result()
+                    except Exception as e:
+                        if classify(e) is Outcome.OK:
+                            raise
+                        last_error = e
+                        failed = True
+                    else:
+                        if fut is not first:
+                            with self.lock:
+                                self.hedges_won += 1
+                        return result
+                if failed:
+                    # A mirror failed; replace it right away
+                    current = launch()
+        finally:
+            for fut, m in pending.items():
+                if fut.cancel():
+                    m.breaker.cancel_probe()
+        assert last_error is not None
+        raise last_error
+
+    def attempt(self, mirror: Mirror, func: Callable[[PyPISimple], T]) -> T:
+        start = time.monotonic()
+        try:
+            result = func(mirror.client)
+        except Exception as e:
+            if classify(e) is Outcome.OK:
+                mirror.breaker.record_success()
+            else:
+                mirror.breaker.record_failure()
+            raise
+        mirror.latencies.add(time.monotonic() - start)
+        mirror.breaker.record_success()
+        return result
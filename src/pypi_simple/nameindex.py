@@ -0,0 +1,325 @@
+"""
+.. versionadded:: 1.9.0
+
+A compact on-disk index of project names that can be memory-mapped and
+queried without loading the whole index into Python objects, allowing many
+processes to share a single copy of a large repository's project list via the
+OS page cache.
+
+The index stores the :pep:`503`-normalized project names in sorted order,
+divided into blocks of a fixed number of names.  Within each block, names are
+front-coded: the first name is stored in full, and each subsequent name is
+stored as the length of the prefix it shares with the preceding name plus the
+remaining suffix.  A table of block offsets allows exact and prefix lookups
+to binary-search the blocks' first names and then scan a single block.  Each
+name may optionally be accompanied by a serial number (e.g., the project's
+last serial).
+
+The layout of an index file is:
+
+- a header (magic bytes, format version, flags, number of names, block size,
+  and number of blocks);
+- an array of 64-bit file offsets of each block;
+- the blocks themselves, in which all lengths and serials are encoded as
+  unsigned LEB128 varints.
+
+All fixed-width integers are little-endian.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Iterator, Mapping
+import mmap
+import os
+import struct
+from types import TracebackType
+from typing import IO
+from packaging.utils import canonicalize_name as normalize
+from .errors import SnapshotError
+
+#: The magic bytes at the start of every name index
+MAGIC = b"PYNI"
+
+#: The current name index format version
+NAME_INDEX_VERSION = 1
+
+#: The default number of names per front-coded block
+DEFAULT_BLOCK_SIZE = 16
+
+HEADER = struct.Struct("<4sHHIII")
+OFFSET = struct.Struct("<Q")
+FLAG_SERIALS = 1
+
+
+def write_name_index(
+    fp: IO[bytes],
+    names: Iterable[str] | Mapping[str, int],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> int:
+    """
+    Write a name index for the given project names to the binary file ``fp``.
+    The names are normalized, deduplicated, and sorted before writing.
+
+    If ``names`` is a mapping, its values are serial numbers (nonnegative
+    integers) to store alongside the names; if multiple names normalize to the
+    same name, the largest serial is kept.
+
+    :returns: the number of distinct names written
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1")
+    entries: dict[bytes, int] = {}
+    has_serials = isinstance(names, Mapping)
+    if isinstance(names, Mapping):
+        for name, serial in names.items():
+            if serial < 0:
+                raise ValueError(f"Serial for {name!r} is negative")
+            key = normalize(name).encode("utf-8")
+            entries[key] = max(entries.get(key, serial), serial)
+    else:
+        for name in names:
+            entries[normalize(name).encode("utf-8")] = 0
+    keys = sorted(entries)
+    blocks: list[bytes] = []
+    for start in range(0, len(keys), block_size):
+        buf = bytearray()
+        prev = b""
+        for i, key in enumerate(keys[start : start + block_size]):
+            if i == 0:
+                shared = 0
+            else:
+                shared = common_prefix_length(prev, key)
+                buf += encode_varint(shared)
+            buf += encode_varint(len(key) - shared)
+            buf += key[shared:]
+            if has_serials:
+                buf += encode_varint(entries[key])
+            prev = key
+        blocks.append(bytes(buf))
+    pos = HEADER.size + OFFSET.size * len(blocks)
+    offsets = bytearray()
+    for b in blocks:
+        offsets += OFFSET.pack(pos)
+        pos += len(b)
+    fp.write(
+        HEADER.pack(
+            MAGIC,
+            NAME_INDEX_VERSION,
+            FLAG_SERIALS if has_serials else 0,
+            len(keys),
+            block_size,
+            len(blocks),
+        )
+    )
+    fp.write(offsets)
+    for b in blocks:
+        fp.write(b)
+    return len(keys)
+
+
+class NameIndex:
+    """
+    A read-only view of a name index created by `write_name_index()`, backed
+    by either a `bytes` object or a memory-mapped file (See `open()`).
+
+    Membership tests (``name in index``) and `serial()` normalize the name
+    they are given and take time logarithmic in the number of names.  `len()`
+    returns the number of names, and iterating over an index yields the
+    normalized names in sorted order.
+
+    An index opened from a file should be closed when no longer needed, either
+    by calling `close()` or by using the index as a context manager.
+
+    :raises SnapshotError: if the data is not a valid name index
+    """
+
+    def __init__(self, data: bytes | bytearray | mmap.mmap) -> None:
+        self.data = data
+        self.mmap: mmap.mmap | None = None
+        self.count: int
+        self.block_size: int
+        self.nblocks: int
+        try:
+            (
+                magic,
+                version,
+                flags,
+                self.count,
+                self.block_size,
+                self.nblocks,
+            ) = HEADER.unpack_from(data, 0)
+        except struct.error:
+            raise SnapshotError("Invalid name index: truncated header")
+        if magic != MAGIC:
+            raise SnapshotError("Not a pypi-simple name index")
+        if version != NAME_INDEX_VERSION:
+            raise SnapshotError(
+                f"Unsupported name index version {version} (expected"
+                f" {NAME_INDEX_VERSION})"
+            )
+        if len(data) < HEADER.size + OFFSET.size * self.nblocks:
+            raise SnapshotError("Invalid name index: truncated offset table")
+        #: Whether the index stores serial numbers
+        self.has_serials = bool(flags & FLAG_SERIALS)
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> NameIndex:
+        """Memory-map the name index file at ``path``"""
+        with open(path, "rb") as fp:
+            mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            index = cls(mm)
+        except Exception:
+            mm.close()
+            raise
+        index.mmap = mm
+        return index
+
+    def close(self) -> None:
+        """Unmap the index's file, if any"""
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+
+    def __enter__(self) -> NameIndex:
+        return self
+
+    def __exit__(
+        self,
+        _exc_type: type[BaseException] | None,
+        _exc_val: BaseException | None,
+        _exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        return self.lookup(normalize(name).encode("utf-8")) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for key, _ in self.iter_entries(0):
+            yield key.decode("utf-8")
+
+    def items(self) -> Iterator[tuple[str, int | None]]:
+        """
+        Iterate over the ``(name, serial)`` pairs in the index in sorted order.
+        If the index does not store serials, the serials are `None`.
+        """
+        for key, serial in self.iter_entries(0):
+            yield (key.decode("utf-8"), serial)
+
+    def serial(self, name: str) -> int | None:
+        """
+        Return the serial number stored for the given project name, or `None`
+        if the project is not in the index or the index does not store serials
+        """
+        serial = self.lookup(normalize(name).encode("utf-8"))
+        return serial if self.has_serials else None
+
+    def prefix(self, prefix: str) -> Iterator[str]:
+        """
+        Iterate over the names in the index that start with the normalized
+        form of ``prefix``, in sorted order
+        """
+        key = normalize(prefix).encode("utf-8")
+        for name, _ in self.iter_entries(max(self.find_block(key), 0)):
+            if name.startswith(key):
+                yield name.decode("utf-8")
+            elif name > key:
+                break
+
+    def lookup(self, key: bytes) -> int | None:
+        """
+        Return the serial stored for the normalized name ``key`` (or 0 if the
+        index has no serials), or `None` if ``key`` is not in the index
+        """
+        b = self.find_block(key)
+        if b < 0:
+            return None
+        for name, serial in self.iter_block(b):
+            if name == key:
+                return serial if serial is not None else 0
+            elif name > key:
+                break
+        return None
+
+    def find_block(self, key: bytes) -> int:
+        """
+        Return the index of the last block whose first name is less than or
+        equal to ``key``, or -1 if there is no such block
+        """
+        lo, hi = 0, self.nblocks
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.block_first(mid) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    def block_offset(self, b: int) -> int:
+        (offset,) = OFFSET.unpack_from(self.data, HEADER.size + OFFSET.size * b)
+        return int(offset)
+
+    def block_first(self, b: int) -> bytes:
+        pos = self.block_offset(b)
+        length, pos = decode_varint(self.data, pos)
+        return bytes(self.data[pos : pos + length])
+
+    def iter_block(self, b: int) -> Iterator[tuple[bytes, int | None]]:
+        data = self.data
+        pos = self.block_offset(b)
+        n = min(self.block_size, self.count - b * self.block_size)
+        prev = b""
+        for i in range(n):
+            if i == 0:
+                shared = 0
+            else:
+                shared, pos = decode_varint(data, pos)
+            length, pos = decode_varint(data, pos)
+            name = prev[:shared] + data[pos : pos + length]
+            pos += length
+            serial: int | None = None
+            if self.has_serials:
+                serial, pos = decode_varint(data, pos)
+            yield (name, serial)
+            prev = name
+
+    def iter_entries(self, start_block: int) -> Iterator[tuple[bytes, int | None]]:
+        for b in range(start_block, self.nblocks):
+            yield from self.iter_block(b)
+
+
+def common_prefix_length(a: bytes, b: bytes) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def encode_varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def decode_varint(data: bytes | bytearray | mmap.mmap, pos: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return (result, pos)
+        shift += 7
@@ -83,8 +83,16 @@ class Project(BaseModel, alias_generator=shishkebab, populate_by_name=True):
     versions: list[str] | None = None
 
 
-class ProjectItem(BaseModel):
+class ProjectHead(BaseModel, alias_generator=shishkebab, populate_by_name=True):
+    meta: ProjectMeta
+    name: str | None = None
+    alternate_locations: list[str] = Field(default_factory=list)
+    project_status: StatusData = Field(default_factory=StatusData)
+
+
+class ProjectItem(BaseModel, populate_by_name=True):
     name: str
+    last_serial: int | None = Field(None, alias="_last-serial")
 
 
 class ProjectList(BaseModel):
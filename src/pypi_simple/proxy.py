@@ -0,0 +1,454 @@
+"""
+.. versionadded:: 1.9.0
+
+A small pull-through caching proxy for the simple repository API, built on
+`PyPISimple` and the standard library's `http.server`.
+
+The proxy serves the index page at ``/simple/`` and project pages at
+``/simple/{project}/`` in either :pep:`691` JSON or :pep:`503` HTML according
+to the request's :mailheader:`Accept` header.  Pages are fetched from the
+upstream repository on first request and then served from memory until they
+are older than the cache's TTL.  Package files with SHA256 digests are served
+from ``/files/{sha256}/{filename}`` and are stored on disk by digest, so each
+file is downloaded from upstream (and verified) at most once, no matter how
+many projects, URLs, or clients refer to it.  Concurrent requests that miss the
+cache for the same page or file share a single upstream fetch.
+
+Responses carry :mailheader:`ETag` headers, and requests with a matching
+:mailheader:`If-None-Match` header receive 304 responses.
+
+Failures to fetch data from upstream are answered with 502 responses, and
+other errors with 500 responses; both are logged via the
+``pypi_simple.proxy`` logger.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+import hashlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import logging
+import os
+from pathlib import Path
+import re
+import shutil
+import threading
+import time
+from typing import Any
+from urllib.parse import quote, unquote, urlsplit
+from packaging.utils import canonicalize_name as normalize
+import requests
+from .batch import mark_worker_thread
+from .classes import DistributionPackage, ProjectPage
+from .client import PyPISimple
+from .errors import NoSuchProjectError, UnsupportedRepoVersionError
+from .local import parse_accept, quality
+from .singleflight import SingleFlight
+from .writers import (
+    write_index_html,
+    write_index_json,
+    write_project_html,
+    write_project_json,
+)
+
+#: The :mailheader:`Content-Type` of JSON pages
+JSON_TYPE = "application/vnd.pypi.simple.v1+json"
+
+#: The :mailheader:`Content-Type` of versioned HTML pages
+HTML_TYPE = "application/vnd.pypi.simple.v1+html"
+
+#: The content types in which pages can be served, in order of preference
+#: when the :mailheader:`Accept` header does not decide between them
+PAGE_TYPES = (JSON_TYPE, HTML_TYPE, "text/html")
+
+#: The default number of seconds for which fetched pages are served from the
+#: cache
+DEFAULT_TTL = 600.0
+
+SHA256_RGX = re.compile(r"[0-9a-f]{64}")
+
+#: Exceptions that indicate a failure to fetch or validate data from the
+#: upstream repository (including digest mismatches & unparsable pages) and
+#: are reported to clients as 502 Bad Gateway; any other exception results in
+#: a 500 Internal Server Error and a logged traceback
+UPSTREAM_ERRORS: tuple[type[Exception], ...] = (
+    requests.RequestException,
+    UnsupportedRepoVersionError,
+    ValueError,
+)
+
+log = logging.getLogger(__name__)
+
+
+def negotiate(accept: str | None) -> str | None:
+    """
+    Return the page content type that best satisfies the
+    :mailheader:`Accept` header ``accept``, or `None` if none are acceptable
+    """
+    ranges = parse_accept(accept)
+    best: str | None = None
+    best_q = 0.0
+    for content_type in PAGE_TYPES:
+        q = quality(ranges, content_type)
+        if q > best_q:
+            best, best_q = content_type, q
+    return best
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+@dataclass
+class CachedPage:
+    """A page fetched from upstream along with its rendered bodies"""
+
+    #: The time at which the page was fetched, per the cache's clock
+    fetched: float
+
+    #: A function for rendering the page in a given content type
+    render: Callable[[str], bytes]
+
+    #: The page's last serial, if known
+    last_serial: str | None = None
+
+    #: Rendered bodies & ETags, keyed by content type
+    bodies: dict[str, tuple[bytes, str]] = field(default_factory=dict)
+
+    def body(self, content_type: str) -> tuple[bytes, str]:
+        try:
+            return self.bodies[content_type]
+        except KeyError:
+            body = self.render(content_type)
+            self.bodies[content_type] = (body, make_etag(body))
+            return self.bodies[content_type]
+
+
+class PullThroughCache:
+    """
+    .. versionadded:: 1.9.0
+
+    The caching layer of the proxy server: fetches pages and files from the
+    repository that ``client`` points to, caches pages in memory for ``ttl``
+    seconds, and stores package & metadata files under ``cache_dir`` by
+    digest.
+
+    If refreshing an expired page fails for any reason other than the project
+    no longer existing, the expired page continues to be served.
+    """
+
+    def __init__(
+        self,
+        client: PyPISimple,
+        cache_dir: str | os.PathLike[str],
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        #: The client for the upstream repository
+        self.client = client
+        #: The directory in which package & metadata files are stored
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.flights = SingleFlight()
+        self.pages: dict[str, CachedPage] = {}
+        #: Packages that have been listed on a served project page, keyed by
+        #: SHA256 digest
+        self.packages: dict[str, DistributionPackage] = {}
+        #: The number of page & file requests made to the upstream repository
+        self.upstream_requests = 0
+
+    def blob_path(self, digest: str, suffix: str = "") -> Path:
+        """Return the path at which the file with the given digest is stored"""
+        return self.cache_dir / "blobs" / digest[:2] / f"{digest}{suffix}"
+
+    def get_index(self, content_type: str) -> tuple[bytes, str]:
+        """
+        Return the body and ETag of the index page in the given content type
+        """
+        return self.get_page("", self.fetch_index).body(content_type)
+
+    def get_project(self, project: str) -> CachedPage:
+        """
+        Return the cached project page for ``project``, fetching it from
+        upstream if necessary
+
+        :raises NoSuchProjectError: if the project does not exist upstream
+        """
+        name = normalize(project)
+        return self.get_page(name, lambda: self.fetch_project(name))
+
+    def get_page(self, key: str, fetch: Callable[[], CachedPage]) -> CachedPage:
+        with self.lock:
+            page = self.pages.get(key)
+        if page is not None and self.clock() - page.fetched < self.ttl:
+            return page
+
+        def refresh() -> CachedPage:
+            try:
+                new = fetch()
+            except NoSuchProjectError:
+                with self.lock:
+                    self.pages.pop(key, None)
+                raise
+            except Exception:
+                if page is None:
+                    raise
+                return page
+            with self.lock:
+                self.pages[key] = new
+            return new
+
+        return self.flights.do(("page", key), refresh)
+
+    def fetch_index(self) -> CachedPage:
+        with self.lock:
+            self.upstream_requests += 1
+        projects = list(self.client.stream_project_serials())
+
+        def render(content_type: str) -> bytes:
+            fp = io.StringIO()
+            if content_type == JSON_TYPE:
+                write_index_json(projects, fp)
+            else:
+                write_index_html(projects, fp)
+            return fp.getvalue().encode("utf-8")
+
+        return CachedPage(fetched=self.clock(), render=render)
+
+    def fetch_project(self, name: str) -> CachedPage:
+        with self.lock:
+            self.upstream_requests += 1
+        page = self.client.get_project_page(name)
+        packages = []
+        known = {}
+        for pkg in page.packages:
+            digest = pkg.digests.get("sha256", "").lower()
+            if SHA256_RGX.fullmatch(digest):
+                known[digest] = pkg
+                pkg = replace(
+                    pkg,
+                    url=f"/files/{digest}/{quote(pkg.filename)}",
+                    provenance_url=None,
+                )
+            packages.append(pkg)
+        with self.lock:
+            self.packages.update(known)
+        local = replace(page, packages=packages)
+
+        def render(content_type: str) -> bytes:
+            return render_project(local, content_type)
+
+        return CachedPage(
+            fetched=self.clock(), render=render, last_serial=page.last_serial
+        )
+
+    def get_file(self, digest: str, metadata: bool = False) -> Path | None:
+        """
+        Return the path to the cached package file (or its metadata file, if
+        ``metadata`` is true) with the given SHA256 digest, downloading it
+        from upstream if necessary.  Returns `None` if no package with that
+        digest has been listed on a served project page.
+
+        :raises DigestMismatchError:
+            if the digest of the downloaded file does not match the expected
+            value
+        """
+        suffix = ".metadata" if metadata else ""
+        path = self.blob_path(digest, suffix)
+        if path.exists():
+            return path
+        with self.lock:
+            pkg = self.packages.get(digest)
+        if pkg is None or (metadata and not pkg.has_metadata):
+            return None
+
+        def download() -> Path:
+            if path.exists():
+                return path
+            with self.lock:
+                self.upstream_requests += 1
+            tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+            if metadata:
+                data = self.client.get_package_metadata_bytes(pkg)
+                tmp.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_bytes(data)
+            else:
+                self.client.download_package(pkg, tmp)
+            os.replace(tmp, path)
+            return path
+
+        return self.flights.do(("file", digest, suffix), download)
+
+
+def render_project(page: ProjectPage, content_type: str) -> bytes:
+    fp = io.StringIO()
+    if content_type == JSON_TYPE:
+        write_project_json(page, fp)
+    else:
+        write_project_html(page, fp)
+    return fp.getvalue().encode("utf-8")
+
+
+class ProxyRequestHandler(BaseHTTPRequestHandler):
+    """
+    .. versionadded:: 1.9.0
+
+    The request handler for `ProxyServer`
+    """
+
+    server: ProxyServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.handle_request(head=False)
+
+    def do_HEAD(self) -> None:
+        self.handle_request(head=True)
+
+    def handle_request(self, head: bool) -> None:
+        cache = self.server.cache
+        path = unquote(urlsplit(self.path).path)
+        parts = path.strip("/").split("/")
+        try:
+            if parts[0] == "simple" and len(parts) <= 2:
+                if not path.endswith("/"):
+                    self.send_empty(
+                        HTTPStatus.MOVED_PERMANENTLY, {"Location": path + "/"}
+                    )
+                    return
+                content_type = negotiate(self.headers.get("Accept"))
+                if content_type is None:
+                    self.send_empty(HTTPStatus.NOT_ACCEPTABLE)
+                    return
+                if len(parts) == 1:
+                    body, etag = cache.get_index(content_type)
+                    self.send_page(body, etag, content_type, None, head)
+                else:
+                    try:
+                        page = cache.get_project(parts[1])
+                    except NoSuchProjectError:
+                        self.send_empty(HTTPStatus.NOT_FOUND)
+                        return
+                    body, etag = page.body(content_type)
+                    self.send_page(body, etag, content_type, page.last_serial, head)
+            elif (
+                parts[0] == "files"
+                and len(parts) == 3
+                and SHA256_RGX.fullmatch(parts[1])
+            ):
+                metadata = parts[2].endswith(".metadata")
+                blob = cache.get_file(parts[1], metadata=metadata)
+                if blob is None:
+                    self.send_empty(HTTPStatus.NOT_FOUND)
+                else:
+                    self.send_file(blob, parts[1], metadata, head)
+            else:
+                self.send_empty(HTTPStatus.NOT_FOUND)
+        except UPSTREAM_ERRORS as e:
+            log.warning("Error fetching %s from upstream: %s", self.path, e)
+            self.send_empty(HTTPStatus.BAD_GATEWAY)
+        except Exception:
+            log.exception("Error handling request for %s", self.path)
+            self.send_empty(HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def not_modified(self, etag: str) -> bool:
+        inm = self.headers.get("If-None-Match")
+        if inm is None:
+            return False
+        tags = [t.strip() for t in inm.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    def send_page(
+        self,
+        body: bytes,
+        etag: str,
+        content_type: str,
+        last_serial: str | None,
+        head: bool,
+    ) -> None:
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept",
+            "Cache-Control": f"max-age={int(self.server.cache.ttl)}",
+        }
+        if last_serial is not None:
+            headers["X-PyPI-Last-Serial"] = last_serial
+        if self.not_modified(etag):
+            self.send_empty(HTTPStatus.NOT_MODIFIED, headers)
+            return
+        self.send_response(HTTPStatus.OK)
+        if content_type != JSON_TYPE:
+            content_type += "; charset=utf-8"
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def send_file(self, path: Path, digest: str, metadata: bool, head: bool) -> None:
+        etag = f'"{digest}.metadata"' if metadata else f'"{digest}"'
+        headers = {"ETag": etag, "Cache-Control": "max-age=31536000, immutable"}
+        if self.not_modified(etag):
+            self.send_empty(HTTPStatus.NOT_MODIFIED, headers)
+            return
+        with path.open("rb") as fp:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(os.fstat(fp.fileno()).st_size))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            if not head:
+                shutil.copyfileobj(fp, self.wfile)
+
+    def send_empty(
+        self, status: HTTPStatus, headers: dict[str, str] | None = None
+    ) -> None:
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        if status is not HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        if self.server.log_requests:
+            super().log_message(format, *args)
+
+
+class ProxyServer(ThreadingHTTPServer):
+    """
+    .. versionadded:: 1.9.0
+
+    A threaded HTTP server that serves the simple repository API from a
+    `PullThroughCache`.  Call ``serve_forever()`` to run the server, and use
+    ``server_address`` to find the port it is listening on if it was started
+    on port 0.
+
+    :param server_address: the ``(host, port)`` pair to listen on
+    :param PullThroughCache cache: the cache to serve from
+    :param bool log_requests: whether to log each request to stderr
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        cache: PullThroughCache,
+        log_requests: bool = False,
+    ) -> None:
+        #: The cache that requests are served from
+        self.cache = cache
+        self.log_requests = log_requests
+        super().__init__(server_address, ProxyRequestHandler)
+
+    def process_request_thread(self, request: Any, client_address: Any) -> None:
+        mark_worker_thread()
+        super().process_request_thread(request, client_address)
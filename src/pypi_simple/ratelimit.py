@@ -0,0 +1,142 @@
+from __future__ import annotations
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    .. versionadded:: 1.9.0
+
+    A thread-safe token bucket that refills at ``rate`` tokens per second up to
+    a maximum of ``capacity`` tokens.
+
+    Tokens are taken with `reserve()`, which always succeeds immediately but
+    may leave the bucket in debt; the caller must then wait for the returned
+    number of seconds before proceeding.  Reserving tokens ahead of time in
+    this way means that waiting callers are served in the order they arrived
+    and that amounts larger than the capacity (e.g., a large download) can
+    still be charged.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        #: The number of tokens added per second
+        self.rate = rate
+        #: The maximum number of tokens the bucket can hold
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount: float = 1) -> float:
+        """
+        Take ``amount`` tokens from the bucket and return the number of seconds
+        the caller must wait before the tokens are actually available
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """
+    .. versionadded:: 1.9.0
+
+    A thread-safe client-side rate limiter with separate budgets for the number
+    of requests per second and the number of bytes received per second.  Pass
+    an instance as the ``rate_limiter`` argument to `PyPISimple` in order to
+    throttle all requests made by the client, including page, metadata,
+    provenance, and package file requests.  The same instance can be shared by
+    multiple clients and threads in order to enforce a combined limit.
+
+    Each limit is a token bucket; the ``burst`` parameters set the size of the
+    buckets, i.e., how many requests or bytes can be used at once after a
+    period of idleness.  By default, the buckets hold one second's worth of
+    tokens.
+
+    :param Optional[float] requests_per_second:
+        the maximum sustained number of requests per second, or `None` for no
+        limit
+    :param Optional[float] bytes_per_second:
+        the maximum sustained number of response bytes (as received over the
+        network) per second, or `None` for no limit
+    :param Optional[float] request_burst: the request bucket size
+    :param Optional[float] byte_burst: the byte bucket size
+    :param bool per_host:
+        If true (the default), each host gets its own separate budgets;
+        otherwise, the budgets are shared by all hosts
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float | None = None,
+        bytes_per_second: float | None = None,
+        request_burst: float | None = None,
+        byte_burst: float | None = None,
+        per_host: bool = True,
+    ) -> None:
+        self.requests_per_second = requests_per_second
+        self.bytes_per_second = bytes_per_second
+        self.request_burst = request_burst
+        self.byte_burst = byte_burst
+        self.per_host = per_host
+        self.request_buckets: dict[str, TokenBucket] = {}
+        self.byte_buckets: dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+        #: The total number of seconds that callers have been made to wait
+        self.waited: float = 0.0
+
+    def host_key(self, url: str) -> str:
+        return urlsplit(url).netloc if self.per_host else ""
+
+    def get_bucket(
+        self,
+        buckets: dict[str, TokenBucket],
+        url: str,
+        rate: float,
+        burst: float | None,
+    ) -> TokenBucket:
+        key = self.host_key(url)
+        with self.lock:
+            try:
+                return buckets[key]
+            except KeyError:
+                b = buckets[key] = TokenBucket(rate, burst)
+                return b
+
+    def acquire_request(self, url: str) -> None:
+        """Block until a request to ``url`` may be made"""
+        if self.requests_per_second is not None:
+            bucket = self.get_bucket(
+                self.request_buckets,
+                url,
+                self.requests_per_second,
+                self.request_burst,
+            )
+            self.wait(bucket.reserve())
+
+    def consume_bytes(self, url: str, amount: int) -> None:
+        """
+        Charge ``amount`` bytes received from ``url`` against the byte budget,
+        blocking if the budget is overdrawn
+        """
+        if self.bytes_per_second is not None and amount > 0:
+            bucket = self.get_bucket(
+                self.byte_buckets, url, self.bytes_per_second, self.byte_burst
+            )
+            self.wait(bucket.reserve(amount))
+
+    def wait(self, delay: float) -> None:
+        if delay > 0:
+            with self.lock:
+                self.waited += delay
+            time.sleep(delay)
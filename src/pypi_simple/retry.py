@@ -0,0 +1,205 @@
+from __future__ import annotations
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import time
+import requests
+
+#: HTTP status codes that are retried by default
+RETRY_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class RetryEvent:
+    """
+    .. versionadded:: 1.9.0
+
+    Information about a failed request attempt that is about to be retried,
+    passed to `RetryPolicy.on_retry`
+    """
+
+    #: The URL being requested
+    url: str
+
+    #: The number of the attempt that failed, starting from 1
+    attempt: int
+
+    #: The number of seconds that will be waited before the next attempt
+    delay: float
+
+    #: The HTTP status code of the failed attempt, or `None` if it failed with
+    #: an exception
+    status_code: int | None = None
+
+    #: The exception raised by the failed attempt, or `None` if it received a
+    #: retriable HTTP status code
+    error: Exception | None = None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    .. versionadded:: 1.9.0
+
+    Configuration for automatically retrying failed requests made by
+    `PyPISimple`.  Pass an instance as the ``retry`` argument to the
+    `PyPISimple` constructor in order to enable retrying.
+
+    Requests are retried when they fail with a connection error or timeout or
+    when the server responds with one of the status codes in `statuses`.  The
+    delay before each retry is chosen using exponential backoff with "full
+    jitter" (i.e., a random delay between zero and the current backoff limit)
+    so that many clients failing at once do not retry in lockstep.  If the
+    server sends a :mailheader:`Retry-After` header, the delay is instead based
+    on that header's value; if that value exceeds `retry_after_max`, the
+    request is not retried, and the response is returned as-is.
+
+    Streaming operations (`PyPISimple.stream_project_names()` and
+    `PyPISimple.download_package()`) are restarted from the beginning if the
+    connection fails partway through reading the response, as long as nothing
+    has been yielded to the caller yet.
+    """
+
+    #: The maximum number of attempts to make for a single request, including
+    #: the first
+    max_attempts: int = 5
+
+    #: The backoff limit for the first retry, in seconds; this doubles after
+    #: each subsequent attempt
+    backoff_base: float = 0.5
+
+    #: The maximum backoff limit, in seconds
+    backoff_max: float = 30.0
+
+    #: The maximum number of seconds to spend on a single request, including
+    #: all retries & waits, or `None` for no limit.  A retry is not attempted
+    #: if waiting for it would exceed the deadline.
+    deadline: float | None = None
+
+    #: HTTP status codes that cause a request to be retried
+    statuses: frozenset[int] = RETRY_STATUSES
+
+    #: Whether to honor :mailheader:`Retry-After` headers in responses
+    respect_retry_after: bool = True
+
+    #: The longest :mailheader:`Retry-After` delay to wait, in seconds.  If a
+    #: server asks for a longer wait, the request is not retried.
+    retry_after_max: float = 300.0
+
+    #: An optional callback that is called with a `RetryEvent` before each
+    #: retry
+    on_retry: Callable[[RetryEvent], None] | None = field(default=None, compare=False)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return a randomized delay to wait before retrying after the given
+        failed attempt (counting from 1)
+        """
+        limit = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, limit)
+
+    def retry_after(self, r: requests.Response) -> float | None:
+        """
+        Return the number of seconds to wait as indicated by the response's
+        :mailheader:`Retry-After` header, or `None` if there is no usable
+        header
+        """
+        if not self.respect_retry_after:
+            return None
+        value = r.headers.get("Retry-After")
+        if value is None:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+    def start(
+        self, url: str, on_retry: Callable[[RetryEvent], None] | None = None
+    ) -> RetryState:
+        """
+        Begin tracking the attempts made for a single request to ``url``.
+        ``on_retry`` is called with each `RetryEvent` in addition to
+        `on_retry`.
+        """
+        return RetryState(self, url, on_retry)
+
+
+#: A policy that never retries
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+#: Exceptions raised while sending a request or reading a response that cause
+#: the request to be retried
+RETRIABLE_ERRORS: tuple[type[Exception], ...] = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class RetryState:
+    """The attempts made so far for a single request under a `RetryPolicy`"""
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        url: str,
+        on_retry: Callable[[RetryEvent], None] | None = None,
+    ) -> None:
+        self.policy = policy
+        self.url = url
+        self.on_retry = on_retry
+        self.attempt = 1
+        self.deadline = (
+            None if policy.deadline is None else time.monotonic() + policy.deadline
+        )
+
+    def should_retry_response(self, r: requests.Response) -> bool:
+        """
+        Decide whether to retry a request that received the response ``r``.  If
+        the request is to be retried, the appropriate delay is waited before
+        returning `True`.
+        """
+        if r.status_code not in self.policy.statuses:
+            return False
+        delay = self.policy.retry_after(r)
+        if delay is not None:
+            if delay > self.policy.retry_after_max:
+                return False
+            # Spread out clients that were all told to come back at once
+            delay += random.uniform(0, min(delay, self.policy.backoff_base) / 2)
+        else:
+            delay = self.policy.backoff(self.attempt)
+        return self.wait(RetryEvent(self.url, self.attempt, delay, r.status_code))
+
+    def should_retry_error(self, e: Exception) -> bool:
+        """
+        Decide whether to retry a request that failed with the exception ``e``.
+        If the request is to be retried, the appropriate delay is waited before
+        returning `True`.
+        """
+        if not isinstance(e, RETRIABLE_ERRORS):
+            return False
+        delay = self.policy.backoff(self.attempt)
+        return self.wait(RetryEvent(self.url, self.attempt, delay, error=e))
+
+    def wait(self, event: RetryEvent) -> bool:
+        if self.attempt >= self.policy.max_attempts:
+            return False
+        if self.deadline is not None and time.monotonic() + event.delay > self.deadline:
+            return False
+        if self.on_retry is not None:
+            self.on_retry(event)
+        if self.policy.on_retry is not None:
+            self.policy.on_retry(event)
+        time.sleep(event.delay)
+        self.attempt += 1
+        return True
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from collections.abc import Callable, Hashable
+import threading
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Call(Generic[T]):
+    """An in-progress call whose outcome is shared with duplicate callers"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: T | None = None
+        self.error: BaseException | None = None
+
+    def result(self) -> T:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value  # type: ignore[return-value]
+
+
+class SingleFlight:
+    """
+    .. versionadded:: 1.9.0
+
+    A thread-safe mechanism for coalescing duplicate calls: while a call for a
+    given key is in progress, any further calls for the same key wait for it
+    to finish and then receive the same return value (or exception) instead of
+    doing the work again.  Once a call finishes, its key is forgotten, so
+    nothing is cached beyond the lifetime of the call.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls: dict[Hashable, Call[Any]] = {}
+        #: The number of calls that were satisfied by another caller's call
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        Return the result of ``func()``, or of the call to the function already
+        in progress for ``key`` if there is one
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = self.calls[key] = Call[T]()
+                leader = True
+        if not leader:
+            return call.result()  # type: ignore[no-any-return]
+        try:
+            call.value = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.value
@@ -0,0 +1,475 @@
+"""
+.. versionadded:: 1.9.0
+
+A compact, versioned binary serialization format for `IndexPage` and
+`ProjectPage` objects.  Loading a snapshot is much faster than re-parsing the
+page's HTML or JSON and produces much smaller output than pickling, making
+snapshots suitable for caching pages on disk or shipping them to worker
+processes.
+
+A snapshot consists of:
+
+- a fixed header giving the format version and the kind of page;
+
+- a string table in which every distinct string in the page is stored once,
+  as a single block of UTF-8 text preceded by an array of character offsets;
+
+- fixed-size records for the page and (for project pages) each of its
+  packages, in which strings are stored as indices into the string table and
+  numbers are packed as fixed-width integers;
+
+- a side table of ``(algorithm, digest)`` string index pairs referenced by the
+  package records.
+
+All integers are little-endian.  The format version is incremented whenever
+the layout changes; `load()` rejects snapshots with any other version.
+"""
+
+from __future__ import annotations
+from array import array
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+import json
+import struct
+import sys
+from typing import IO
+from mailbits import ContentType
+from .classes import DistributionPackage, IndexPage, ProjectPage
+from .enums import ProjectStatus
+from .errors import SnapshotError, UnsupportedContentTypeError
+
+#: The magic bytes at the start of every snapshot
+MAGIC = b"PYSS"
+
+#: The current snapshot format version
+SNAPSHOT_VERSION = 1
+
+KIND_INDEX = 1
+KIND_PROJECT = 2
+
+#: String index used to represent `None`
+NONE = 0xFFFFFFFF
+
+#: Offset value used to represent a naive `datetime`
+NAIVE = -0x80000000
+
+HEADER = struct.Struct("<4sHBx")
+STRTAB_HEADER = struct.Struct("<II")
+INDEX_RECORD = struct.Struct("<III")
+PROJECT_RECORD = struct.Struct("<IIIIIIIII")
+PACKAGE_RECORD = struct.Struct("<IIIIIIIIqqiHIHIH")
+
+# Flag bits in package records:
+HAS_SIG_KNOWN = 1 << 0
+HAS_SIG = 1 << 1
+IS_YANKED = 1 << 2
+HAS_METADATA_KNOWN = 1 << 3
+HAS_METADATA = 1 << 4
+HAS_SIZE = 1 << 5
+HAS_UPLOAD_TIME = 1 << 6
+HAS_METADATA_DIGESTS = 1 << 7
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+class StringTable:
+    """Builder for a snapshot's table of interned strings"""
+
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def add(self, s: str | None) -> int:
+        if s is None:
+            return NONE
+        try:
+            return self.index[s]
+        except KeyError:
+            i = self.index[s] = len(self.strings)
+            self.strings.append(s)
+            return i
+
+    def add_all(self, strings: list[str] | None) -> array[int]:
+        return uint32_array(map(self.add, strings or []))
+
+    def to_bytes(self) -> bytes:
+        offsets = uint32_array([0])
+        pos = 0
+        for s in self.strings:
+            pos += len(s)
+            offsets.append(pos)
+        data = "".join(self.strings).encode("utf-8", "surrogatepass")
+        return (
+            STRTAB_HEADER.pack(len(self.strings), len(data))
+            + to_le_bytes(offsets)
+            + data
+        )
+
+
+def dumps(page: IndexPage | ProjectPage) -> bytes:
+    """Serialize an `IndexPage` or `ProjectPage` as a snapshot"""
+    strings = StringTable()
+    body: list[bytes]
+    if isinstance(page, IndexPage):
+        kind = KIND_INDEX
+        projects = strings.add_all(page.projects)
+        body = [
+            INDEX_RECORD.pack(
+                strings.add(page.repository_version),
+                strings.add(page.last_serial),
+                len(projects),
+            ),
+            to_le_bytes(projects),
+        ]
+    elif isinstance(page, ProjectPage):
+        kind = KIND_PROJECT
+        digest_pairs = uint32_array()
+        records = [pack_package(pkg, strings, digest_pairs) for pkg in page.packages]
+        versions = strings.add_all(page.versions)
+        tracks = strings.add_all(page.tracks)
+        alternates = strings.add_all(page.alternate_locations)
+        body = [
+            PROJECT_RECORD.pack(
+                strings.add(page.project),
+                strings.add(page.repository_version),
+                strings.add(page.last_serial),
+                strings.add(page.status.value if page.status is not None else None),
+                strings.add(page.status_reason),
+                len(versions) if page.versions is not None else NONE,
+                len(tracks),
+                len(alternates),
+                len(records),
+            ),
+            to_le_bytes(versions),
+            to_le_bytes(tracks),
+            to_le_bytes(alternates),
+            *records,
+            struct.pack("<I", len(digest_pairs) // 2),
+            to_le_bytes(digest_pairs),
+        ]
+    else:
+        raise TypeError(f"Cannot snapshot object of type {type(page).__name__}")
+    return b"".join(
+        [HEADER.pack(MAGIC, SNAPSHOT_VERSION, kind), strings.to_bytes(), *body]
+    )
+
+
+def dump(page: IndexPage | ProjectPage, fp: IO[bytes]) -> None:
+    """Serialize an `IndexPage` or `ProjectPage` as a snapshot to a binary file"""
+    fp.write(dumps(page))
+
+
+def loads(data: bytes | bytearray | memoryview) -> IndexPage | ProjectPage:
+    """
+    Deserialize a snapshot created by `dumps()` or `dump()`
+
+    :raises SnapshotError: if the data is not a valid snapshot of the current
+        format version
+    """
+    try:
+        return SnapshotReader(memoryview(data)).read()
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise SnapshotError(f"Invalid or truncated snapshot: {e}") from e
+
+
+def load(fp: IO[bytes]) -> IndexPage | ProjectPage:
+    """
+    Deserialize a snapshot from a binary file
+
+    :raises SnapshotError: if the data is not a valid snapshot of the current
+        format version
+    """
+    return loads(fp.read())
+
+
+def parse_project_page(
+    project: str,
+    body: bytes,
+    content_type: str,
+    url: str,
+    last_serial: str | None = None,
+) -> bytes:
+    """
+    Parse the body of a response for a project page with the given
+    :mailheader:`Content-Type` and URL in the same manner as
+    `ProjectPage.from_response()` and return a snapshot of the resulting
+    `ProjectPage`.  If the page does not report its last serial,
+    ``last_serial`` (usually the value of the response's
+    :mailheader:`X-PyPI-Last-Serial` header) is used instead.
+
+    Both the arguments and the return value are cheap to pickle, so this
+    function can be submitted to a `concurrent.futures.ProcessPoolExecutor` in
+    order to parse pages in parallel in worker processes; see the
+    ``parse_executor`` argument of `PyPISimple.get_project_pages()`.
+
+    :raises UnsupportedRepoVersionError:
+        if the repository version has a greater major component than the
+        supported repository version
+    :raises UnsupportedContentTypeError:
+        if the content type is not supported
+    """
+    ct = ContentType.parse(content_type)
+    page: ProjectPage
+    if ct.content_type == "application/vnd.pypi.simple.v1+json":
+        page = ProjectPage.from_json_data(json.loads(body), url)
+    elif (
+        ct.content_type == "application/vnd.pypi.simple.v1+html"
+        or ct.content_type == "text/html"
+    ):
+        page = ProjectPage.from_html(
+            project=project,
+            html=body,
+            base_url=url,
+            from_encoding=ct.params.get("charset"),
+        )
+    else:
+        raise UnsupportedContentTypeError(url, str(ct))
+    if page.last_serial is None:
+        page.last_serial = last_serial
+    return dumps(page)
+
+
+def pack_package(
+    pkg: DistributionPackage, strings: StringTable, digest_pairs: array[int]
+) -> bytes:
+    flags = 0
+    if pkg.has_sig is not None:
+        flags |= HAS_SIG_KNOWN | (HAS_SIG if pkg.has_sig else 0)
+    if pkg.is_yanked:
+        flags |= IS_YANKED
+    if pkg.has_metadata is not None:
+        flags |= HAS_METADATA_KNOWN | (HAS_METADATA if pkg.has_metadata else 0)
+    size = 0
+    if pkg.size is not None:
+        flags |= HAS_SIZE
+        size = pkg.size
+    micros = 0
+    offset = 0
+    if pkg.upload_time is not None:
+        flags |= HAS_UPLOAD_TIME
+        micros, offset = pack_datetime(pkg.upload_time)
+    digest_start = len(digest_pairs) // 2
+    add_digests(pkg.digests, strings, digest_pairs)
+    mdigest_start = len(digest_pairs) // 2
+    if pkg.metadata_digests is not None:
+        flags |= HAS_METADATA_DIGESTS
+        add_digests(pkg.metadata_digests, strings, digest_pairs)
+    return PACKAGE_RECORD.pack(
+        strings.add(pkg.filename),
+        strings.add(pkg.url),
+        strings.add(pkg.project),
+        strings.add(pkg.version),
+        strings.add(pkg.package_type),
+        strings.add(pkg.requires_python),
+        strings.add(pkg.yanked_reason),
+        strings.add(pkg.provenance_url),
+        size,
+        micros,
+        offset,
+        flags,
+        digest_start,
+        len(pkg.digests),
+        mdigest_start,
+        len(pkg.metadata_digests or {}),
+    )
+
+
+def add_digests(
+    digests: dict[str, str], strings: StringTable, digest_pairs: array[int]
+) -> None:
+    for alg, value in digests.items():
+        digest_pairs.append(strings.add(alg))
+        digest_pairs.append(strings.add(value))
+
+
+def pack_datetime(dt: datetime) -> tuple[int, int]:
+    """
+    Convert a `datetime` to a pair of microseconds since the epoch and a UTC
+    offset in seconds (or `NAIVE`)
+    """
+    utcoffset = dt.utcoffset()
+    if utcoffset is None:
+        return (to_micros(dt - NAIVE_EPOCH), NAIVE)
+    return (to_micros(dt - EPOCH), int(utcoffset.total_seconds()))
+
+
+def unpack_datetime(micros: int, offset: int) -> datetime:
+    if offset == NAIVE:
+        return NAIVE_EPOCH + timedelta(microseconds=micros)
+    tz = timezone.utc if offset == 0 else timezone(timedelta(seconds=offset))
+    return (EPOCH + timedelta(microseconds=micros)).astimezone(tz)
+
+
+def to_micros(td: timedelta) -> int:
+    return (td.days * 86400 + td.seconds) * 1_000_000 + td.microseconds
+
+
+def uint32_array(values: Iterable[int] = ()) -> array[int]:
+    return array("I", values)
+
+
+def to_le_bytes(arr: array[int]) -> bytes:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+class SnapshotReader:
+    """A cursor over the bytes of a snapshot"""
+
+    def __init__(self, data: memoryview) -> None:
+        self.data = data
+        self.pos = 0
+        self.strings: list[str | None] = []
+
+    def unpack(self, st: struct.Struct) -> tuple:
+        values = st.unpack_from(self.data, self.pos)
+        self.pos += st.size
+        return values
+
+    def uint32s(self, n: int) -> array[int]:
+        end = self.pos + 4 * n
+        if end > len(self.data):
+            raise SnapshotError("Invalid or truncated snapshot: array out of range")
+        arr = uint32_array()
+        arr.frombytes(self.data[self.pos : end])
+        if sys.byteorder == "big":
+            arr.byteswap()
+        self.pos = end
+        return arr
+
+    def string(self, i: int) -> str | None:
+        return None if i == NONE else self.strings[i]
+
+    def string_list(self, n: int) -> list[str]:
+        strings = self.strings
+        return [strings[i] for i in self.uint32s(n)]  # type: ignore[misc]
+
+    def read(self) -> IndexPage | ProjectPage:
+        magic, version, kind = self.unpack(HEADER)
+        if magic != MAGIC:
+            raise SnapshotError("Not a pypi-simple snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"Unsupported snapshot version {version} (expected"
+                f" {SNAPSHOT_VERSION})"
+            )
+        self.read_strings()
+        if kind == KIND_INDEX:
+            return self.read_index()
+        elif kind == KIND_PROJECT:
+            return self.read_project()
+        else:
+            raise SnapshotError(f"Unknown snapshot kind {kind}")
+
+    def read_strings(self) -> None:
+        count, nbytes = self.unpack(STRTAB_HEADER)
+        offsets = self.uint32s(count + 1)
+        end = self.pos + nbytes
+        text = str(self.data[self.pos : end], "utf-8", "surrogatepass")
+        self.pos = end
+        if len(text) != offsets[-1]:
+            raise SnapshotError("Invalid snapshot: string table is corrupt")
+        self.strings = [text[a:b] for a, b in zip(offsets, offsets[1:])]
+
+    def read_index(self) -> IndexPage:
+        repo_version, last_serial, nprojects = self.unpack(INDEX_RECORD)
+        return IndexPage(
+            projects=self.string_list(nprojects),
+            repository_version=self.string(repo_version),
+            last_serial=self.string(last_serial),
+        )
+
+    def read_project(self) -> ProjectPage:
+        (
+            project,
+            repo_version,
+            last_serial,
+            status,
+            status_reason,
+            nversions,
+            ntracks,
+            nalternates,
+            npackages,
+        ) = self.unpack(PROJECT_RECORD)
+        versions = None if nversions == NONE else self.string_list(nversions)
+        tracks = self.string_list(ntracks)
+        alternates = self.string_list(nalternates)
+        start = self.pos
+        self.pos += PACKAGE_RECORD.size * npackages
+        (ndigests,) = self.unpack(struct.Struct("<I"))
+        pairs = self.uint32s(2 * ndigests)
+        string = self.string
+        strings = self.strings
+
+        def digests(start: int, count: int) -> dict[str, str]:
+            return {
+                strings[pairs[2 * i]]: strings[pairs[2 * i + 1]]  # type: ignore[misc]
+                for i in range(start, start + count)
+            }
+
+        packages = []
+        for (
+            filename,
+            url,
+            pkg_project,
+            version,
+            package_type,
+            requires_python,
+            yanked_reason,
+            provenance_url,
+            size,
+            micros,
+            offset,
+            flags,
+            digest_start,
+            digest_count,
+            mdigest_start,
+            mdigest_count,
+        ) in PACKAGE_RECORD.iter_unpack(
+            self.data[start : start + PACKAGE_RECORD.size * npackages]
+        ):
+            packages.append(
+                DistributionPackage(
+                    filename=strings[filename],  # type: ignore[arg-type]
+                    url=strings[url],  # type: ignore[arg-type]
+                    project=string(pkg_project),
+                    version=string(version),
+                    package_type=string(package_type),
+                    digests=digests(digest_start, digest_count),
+                    requires_python=string(requires_python),
+                    has_sig=(bool(flags & HAS_SIG) if flags & HAS_SIG_KNOWN else None),
+                    is_yanked=bool(flags & IS_YANKED),
+                    yanked_reason=string(yanked_reason),
+                    has_metadata=(
+                        bool(flags & HAS_METADATA)
+                        if flags & HAS_METADATA_KNOWN
+                        else None
+                    ),
+                    metadata_digests=(
+                        digests(mdigest_start, mdigest_count)
+                        if flags & HAS_METADATA_DIGESTS
+                        else None
+                    ),
+                    size=size if flags & HAS_SIZE else None,
+                    upload_time=(
+                        unpack_datetime(micros, offset)
+                        if flags & HAS_UPLOAD_TIME
+                        else None
+                    ),
+                    provenance_url=string(provenance_url),
+                )
+            )
+        return ProjectPage(
+            project=strings[project],  # type: ignore[arg-type]
+            packages=packages,
+            repository_version=string(repo_version),
+            last_serial=string(last_serial),
+            versions=versions,
+            tracks=tracks,
+            alternate_locations=alternates,
+            status=ProjectStatus(strings[status]) if status != NONE else None,
+            status_reason=string(status_reason),
+        )
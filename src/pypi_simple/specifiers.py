@@ -0,0 +1,126 @@
+from __future__ import annotations
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import Version
+
+if TYPE_CHECKING:
+    from .classes import DistributionPackage, ProjectPage
+
+
+#: The default maximum size of each of a `SpecifierCache`'s mappings
+DEFAULT_MAXSIZE = 4096
+
+
+class SpecifierCache:
+    """
+    .. versionadded:: 1.9.0
+
+    A cache of parsed :mailheader:`Requires-Python` specifiers and of the
+    results of evaluating them against Python versions.  Each distinct
+    specifier string is parsed into a `packaging.specifiers.SpecifierSet` at
+    most once, and each distinct (specifier, Python version) pair is evaluated
+    at most once, so filtering many pages against many Python versions only
+    does work proportional to the number of distinct specifiers.
+
+    Specifiers that cannot be parsed are treated as allowing every Python
+    version, as pip does.  A cache may be shared between threads.
+
+    So that a long-lived cache does not grow without bound, each of its two
+    mappings is emptied whenever adding an entry would make it hold more than
+    ``maxsize`` entries.  Pass ``maxsize=None`` for an unbounded cache.
+
+    :param Optional[int] maxsize:
+        the maximum number of parsed specifiers & the maximum number of
+        evaluation results to hold at once
+    """
+
+    def __init__(self, maxsize: int | None = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        #: Parsed specifiers, keyed by specifier string; `None` values
+        #: indicate invalid specifiers
+        self.specifiers: dict[str, SpecifierSet | None] = {}
+        self.results: dict[tuple[str, Version], bool] = {}
+
+    def parse(self, spec: str) -> SpecifierSet | None:
+        """
+        Return the parsed form of the specifier string ``spec``, or `None` if
+        it is invalid
+        """
+        try:
+            return self.specifiers[spec]
+        except KeyError:
+            try:
+                parsed: SpecifierSet | None = SpecifierSet(spec)
+            except InvalidSpecifier:
+                parsed = None
+            if self.maxsize is not None and len(self.specifiers) >= self.maxsize:
+                self.specifiers.clear()
+            self.specifiers[spec] = parsed
+            return parsed
+
+    def allows(self, spec: str | None, python: str | Version) -> bool:
+        """
+        Return whether the :mailheader:`Requires-Python` specifier ``spec``
+        (which may be `None`, meaning no requirement) allows the given Python
+        version
+        """
+        if spec is None or not spec.strip():
+            return True
+        pyv = python if isinstance(python, Version) else Version(python)
+        key = (spec, pyv)
+        try:
+            return self.results[key]
+        except KeyError:
+            parsed = self.parse(spec)
+            result = parsed is None or parsed.contains(pyv, prereleases=True)
+            if self.maxsize is not None and len(self.results) >= self.maxsize:
+                self.results.clear()
+            self.results[key] = result
+            return result
+
+    def filter(
+        self, packages: Iterable[DistributionPackage], python: str | Version
+    ) -> list[DistributionPackage]:
+        """
+        Return the packages whose :mailheader:`Requires-Python` specifiers
+        allow the given Python version, in their original order
+        """
+        pyv = python if isinstance(python, Version) else Version(python)
+        memo: dict[str | None, bool] = {}
+        result = []
+        for p in packages:
+            try:
+                ok = memo[p.requires_python]
+            except KeyError:
+                ok = memo[p.requires_python] = self.allows(p.requires_python, pyv)
+            if ok:
+                result.append(p)
+        return result
+
+
+#: The `SpecifierCache` used when no cache is passed to
+#: `ProjectPage.filter_requires_python()` or `filter_requires_python()`
+DEFAULT_SPECIFIER_CACHE = SpecifierCache()
+
+
+def filter_requires_python(
+    pages: Iterable[ProjectPage],
+    pythons: Iterable[str | Version],
+    cache: SpecifierCache | None = None,
+) -> Iterator[tuple[ProjectPage, dict[Version, list[DistributionPackage]]]]:
+    """
+    .. versionadded:: 1.9.0
+
+    For each page in ``pages``, yield the page along with a `dict` mapping
+    each of the given Python versions to the packages on the page whose
+    :mailheader:`Requires-Python` specifiers allow that version.  All pages
+    share the same `SpecifierCache` (by default, `DEFAULT_SPECIFIER_CACHE`),
+    so each distinct specifier is parsed once and evaluated once per Python
+    version across all of the pages.
+    """
+    if cache is None:
+        cache = DEFAULT_SPECIFIER_CACHE
+    versions = [p if isinstance(p, Version) else Version(p) for p in pythons]
+    for page in pages:
+        yield (page, {v: cache.filter(page.packages, v) for v in versions})
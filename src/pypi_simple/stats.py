@@ -0,0 +1,74 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import threading
+import requests
+
+
+@dataclass
+class TransferStats:
+    """
+    .. versionadded:: 1.9.0
+
+    Running totals of the data transferred by a `PyPISimple` instance,
+    available via its `~PyPISimple.stats` attribute.  Updates are thread-safe.
+
+    Responses served with a :mailheader:`Content-Encoding` (e.g., gzip) are
+    decompressed as they are read, and so `wire_bytes` will typically be
+    smaller than `body_bytes` for compressible content like project pages.
+    """
+
+    #: The number of responses whose bodies have been read
+    responses: int = 0
+
+    #: The number of body bytes received over the network, before
+    #: decompression
+    wire_bytes: int = 0
+
+    #: The number of body bytes after decompression
+    body_bytes: int = 0
+
+    #: The number of times a failed request has been retried (See
+    #: `RetryPolicy`)
+    retries: int = 0
+
+    lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """
+        The ratio of decompressed bytes to bytes received over the network, or
+        `None` if nothing has been received yet
+        """
+        with self.lock:
+            if self.wire_bytes == 0:
+                return None
+            return self.body_bytes / self.wire_bytes
+
+    def record(self, r: requests.Response, body_bytes: int) -> None:
+        """
+        Record the transfer of a response whose body has been read and which
+        decompressed to ``body_bytes`` bytes
+        """
+        wire_bytes = wire_bytes_read(r, body_bytes)
+        with self.lock:
+            self.responses += 1
+            self.wire_bytes += wire_bytes
+            self.body_bytes += body_bytes
+
+    def record_retry(self) -> None:
+        """Record that a request is being retried"""
+        with self.lock:
+            self.retries += 1
+
+
+def wire_bytes_read(r: requests.Response, default: int) -> int:
+    """
+    Return the number of body bytes read so far from the network for the
+    response ``r``, or ``default`` if this cannot be determined
+    """
+    try:
+        return int(r.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return default
@@ -0,0 +1,473 @@
+"""
+.. versionadded:: 1.9.0
+
+Incrementally mirroring selected projects from a simple repository into a
+static :pep:`503` / :pep:`691` file tree that can be served by any web server
+or read directly by `PyPISimple` via a ``file://`` URL.
+
+A mirror directory has the following layout:
+
+- ``simple/index.html`` and ``simple/index.json`` — the index page, listing
+  every mirrored project
+- ``simple/{project}/index.html`` and ``simple/{project}/index.json`` — the
+  project pages, with all URLs pointing into the mirror
+- ``packages/{project}/{filename}`` — the project's package files, along with
+  ``{filename}.metadata`` files for packages with :pep:`658` metadata
+- ``.pypi-simple-sync.json`` — the checkpoint file recording each mirrored
+  project's last serial & files and the projects still to be synced
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field, replace
+import json
+import os
+from pathlib import Path
+import re
+import shutil
+from urllib.parse import quote
+from packaging.utils import canonicalize_name as normalize
+from .batch import DEFAULT_CONCURRENCY, run_batch
+from .classes import DistributionPackage, ProjectPage
+from .client import PyPISimple
+from .concurrency import ConcurrencyLimiter
+from .errors import NoSuchProjectError
+from .util import atomic_open, atomic_write, parse_serial, temp_path
+from .writers import (
+    write_index_html,
+    write_index_json,
+    write_project_html,
+    write_project_json,
+)
+
+#: The name of the checkpoint file in the root of a mirror
+CHECKPOINT_FILE = ".pypi-simple-sync.json"
+
+#: The current checkpoint file format version
+CHECKPOINT_VERSION = 1
+
+#: The number of completed projects after which the checkpoint is rewritten
+#: during a sync
+DEFAULT_CHECKPOINT_INTERVAL = 10
+
+#: A regex matching normalized :pep:`503` project names
+NORMALIZED_NAME_RGX = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+@dataclass
+class MirroredProject:
+    """
+    .. versionadded:: 1.9.0
+
+    The checkpointed state of a single project in a `LocalMirror`
+    """
+
+    #: The project's last serial as of the most recent sync, if the upstream
+    #: repository reported one
+    serial: int | None
+
+    #: The filenames of the project's mirrored package files
+    files: list[str] = field(default_factory=list)
+
+
+@dataclass
+class SyncReport:
+    """
+    .. versionadded:: 1.9.0
+
+    A summary of a call to `LocalMirror.sync()`.  All project names are
+    normalized.
+    """
+
+    #: Projects whose pages were (re)written
+    updated: list[str] = field(default_factory=list)
+
+    #: Projects that were skipped because their serials had not changed
+    unchanged: list[str] = field(default_factory=list)
+
+    #: Projects that were removed because the upstream repository no longer
+    #: has them
+    removed: list[str] = field(default_factory=list)
+
+    #: Projects that could not be synced, mapped to the errors that occurred.
+    #: These projects remain pending and will be retried by
+    #: `LocalMirror.resume()`, except for names that are not valid normalized
+    #: project names, which are dropped.
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+    #: The number of package & metadata files downloaded
+    files_downloaded: int = 0
+
+
+@dataclass
+class ProjectSync:
+    name: str
+    state: MirroredProject | None
+    changed: bool
+    downloaded: int = 0
+
+
+class LocalMirror:
+    """
+    .. versionadded:: 1.9.0
+
+    An incremental mirror of selected projects from the repository that
+    ``client`` points to, stored under the directory ``root`` (which is
+    created if it does not exist).
+
+    Each sync compares each project's last serial against the serial recorded
+    at the previous sync and skips projects that have not changed.  For the
+    rest, only package files that are not already in the mirror are
+    downloaded — concurrently and, if ``verify`` is true, with their digests
+    verified — after which the project's pages are rewritten.  Every file is
+    written to a temporary file and then atomically moved into place, so a
+    mirror that is being synced can be served at the same time, and an
+    interrupted sync never leaves behind partial files.
+
+    Progress is recorded in a checkpoint file in ``root`` after every
+    ``checkpoint_interval`` completed projects and whenever a sync ends, even
+    if by an exception.  An interrupted sync can then be continued with
+    `resume()`, which skips the projects that were already completed.
+
+    :param PyPISimple client: the client for the upstream repository
+    :param root: the directory in which to store the mirror
+    :param bool verify:
+        whether to verify the digests of downloaded packages & metadata
+    :param bool metadata:
+        whether to also mirror packages' :pep:`658` metadata files
+    :param concurrency:
+        the maximum number of projects to sync at once, or a limiter
+    :type concurrency: int | ConcurrencyLimiter
+    :param download_concurrency:
+        the maximum number of files to download at once for each project, or
+        a limiter
+    :type download_concurrency: int | ConcurrencyLimiter
+    :param int checkpoint_interval:
+        the number of completed projects after which to rewrite the checkpoint
+    :raises ValueError: if the checkpoint file is invalid
+    """
+
+    def __init__(
+        self,
+        client: PyPISimple,
+        root: str | os.PathLike[str],
+        verify: bool = True,
+        metadata: bool = True,
+        concurrency: int | ConcurrencyLimiter = DEFAULT_CONCURRENCY,
+        download_concurrency: int | ConcurrencyLimiter = DEFAULT_CONCURRENCY,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ) -> None:
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be at least 1")
+        #: The client for the upstream repository
+        self.client = client
+        #: The root directory of the mirror
+        self.root = Path(root)
+        self.verify = verify
+        self.metadata = metadata
+        self.concurrency = concurrency
+        self.download_concurrency = download_concurrency
+        self.checkpoint_interval = checkpoint_interval
+        #: The mirrored projects, keyed by normalized name
+        self.projects: dict[str, MirroredProject] = {}
+        #: The projects requested by the most recent sync that have not yet
+        #: been completed, along with their serials (if known)
+        self.pending: dict[str, int | None] = {}
+        self.load_checkpoint()
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return self.root / CHECKPOINT_FILE
+
+    def project_dir(self, project: str) -> Path:
+        """Return the directory containing a project's pages"""
+        return self.root / "simple" / project
+
+    def package_dir(self, project: str) -> Path:
+        """Return the directory containing a project's package files"""
+        return self.root / "packages" / project
+
+    def load_checkpoint(self) -> None:
+        """
+        Load the mirror's state from its checkpoint file, if it exists
+
+        :raises ValueError: if the checkpoint file is invalid
+        """
+        try:
+            with self.checkpoint_path.open(encoding="utf-8") as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"{self.checkpoint_path}: unsupported or invalid checkpoint file"
+            )
+        self.projects = {
+            name: MirroredProject(serial=p["serial"], files=p["files"])
+            for name, p in data["projects"].items()
+        }
+        self.pending = dict(data["pending"])
+
+    def save_checkpoint(self) -> None:
+        """Atomically write the mirror's state to its checkpoint file"""
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "projects": {
+                name: {"serial": p.serial, "files": p.files}
+                for name, p in sorted(self.projects.items())
+            },
+            "pending": sorted(self.pending.items()),
+        }
+        atomic_write(self.checkpoint_path, json.dumps(data).encode("utf-8"))
+
+    def sync(self, projects: Iterable[str | tuple[str, int | None]]) -> SyncReport:
+        """
+        Bring the given projects up to date with the upstream repository and
+        rewrite the mirror's index pages.
+
+        ``projects`` may contain project names or ``(name, last_serial)``
+        pairs, such as are yielded by `PyPISimple.stream_project_serials()`.
+        When a serial is given and is not greater than the serial recorded for
+        the project at the previous sync, the project is skipped without
+        making any requests; otherwise, the project page is fetched, and the
+        project is only updated if the page's `~ProjectPage.last_serial` has
+        changed (or either serial is unknown).
+
+        Projects that the upstream repository reports as nonexistent are
+        removed from the mirror.  Errors for individual projects are recorded
+        in the returned `SyncReport` instead of being raised; this includes
+        names that do not normalize to valid :pep:`503` project names (e.g.,
+        names containing slashes), which are never used as paths.
+
+        :rtype: SyncReport
+        """
+        self.pending = {}
+        for item in projects:
+            if isinstance(item, str):
+                self.pending[normalize(item)] = None
+            else:
+                self.pending[normalize(item[0])] = item[1]
+        return self.resume()
+
+    def resume(self) -> SyncReport:
+        """
+        Sync the projects left pending by a previous sync that was interrupted
+        or that encountered errors.  See `sync()` for more information.
+
+        :rtype: SyncReport
+        """
+        report = SyncReport()
+        for name in list(self.pending):
+            try:
+                check_project_name(name)
+            except ValueError as e:
+                report.failed[name] = e
+                del self.pending[name]
+        work = [
+            (name, serial, self.projects.get(name))
+            for name, serial in self.pending.items()
+        ]
+        completed = 0
+        try:
+            for r in run_batch(self.sync_one, work, self.concurrency):
+                name = r.item[0]
+                if r.error is not None:
+                    report.failed[name] = r.error
+                    continue
+                assert r.value is not None
+                result = r.value
+                if result.state is None:
+                    self.projects.pop(name, None)
+                    report.removed.append(name)
+                else:
+                    self.projects[name] = result.state
+                    if result.changed:
+                        report.updated.append(name)
+                    else:
+                        report.unchanged.append(name)
+                report.files_downloaded += result.downloaded
+                del self.pending[name]
+                completed += 1
+                if completed % self.checkpoint_interval == 0:
+                    self.save_checkpoint()
+            if report.updated or report.removed or not self.index_exists():
+                self.write_index()
+        finally:
+            self.save_checkpoint()
+        return report
+
+    def remove(self, project: str) -> None:
+        """
+        Remove a project's pages & files from the mirror
+
+        :raises ValueError: if ``project`` is not a valid project name
+        """
+        name = normalize(project)
+        check_project_name(name)
+        state = self.projects.pop(name, None)
+        self.pending.pop(name, None)
+        self.remove_files(name)
+        if state is not None:
+            self.write_index()
+            self.save_checkpoint()
+
+    def sync_one(
+        self, work: tuple[str, int | None, MirroredProject | None]
+    ) -> ProjectSync:
+        name, serial, prev = work
+        if (
+            prev is not None
+            and prev.serial is not None
+            and serial is not None
+            and serial <= prev.serial
+            and self.pages_exist(name)
+        ):
+            return ProjectSync(name, prev, changed=False)
+        try:
+            page = self.client.get_project_page(name)
+        except NoSuchProjectError:
+            self.remove_files(name)
+            return ProjectSync(name, None, changed=True)
+        page_serial = parse_serial(page.last_serial)
+        pkgdir = self.package_dir(name)
+        if (
+            prev is not None
+            and page_serial is not None
+            and page_serial == prev.serial
+            and self.pages_exist(name)
+            and all((pkgdir / fname).exists() for fname in prev.files)
+        ):
+            return ProjectSync(name, prev, changed=False)
+        for pkg in page.packages:
+            check_filename(pkg.filename)
+        downloaded = 0
+        for r in run_batch(
+            self.download, self.missing_files(name, page), self.download_concurrency
+        ):
+            r.unwrap()
+            downloaded += 1
+        self.write_project(page, name)
+        files = [pkg.filename for pkg in page.packages]
+        current = set(files)
+        for fname in prev.files if prev is not None else []:
+            if fname not in current:
+                for stale in (pkgdir / fname, pkgdir / f"{fname}.metadata"):
+                    self.check_contained(stale)
+                    stale.unlink(missing_ok=True)
+        return ProjectSync(
+            name,
+            MirroredProject(serial=page_serial, files=files),
+            changed=True,
+            downloaded=downloaded,
+        )
+
+    def missing_files(
+        self, name: str, page: ProjectPage
+    ) -> Iterator[tuple[str, DistributionPackage, bool]]:
+        """
+        Yield a ``(name, pkg, is_metadata)`` triple for each package file &
+        metadata file of ``page`` that is not yet in the mirror
+        """
+        pkgdir = self.package_dir(name)
+        for pkg in page.packages:
+            if not (pkgdir / pkg.filename).exists():
+                yield (name, pkg, False)
+            if (
+                self.metadata
+                and pkg.has_metadata
+                and not (pkgdir / f"{pkg.filename}.metadata").exists()
+            ):
+                yield (name, pkg, True)
+
+    def download(self, item: tuple[str, DistributionPackage, bool]) -> None:
+        name, pkg, is_metadata = item
+        pkgdir = self.package_dir(name)
+        if is_metadata:
+            data = self.client.get_package_metadata_bytes(pkg, verify=self.verify)
+            atomic_write(pkgdir / f"{pkg.filename}.metadata", data)
+        else:
+            target = pkgdir / pkg.filename
+            tmp = temp_path(target)
+            self.client.download_package(pkg, tmp, verify=self.verify)
+            os.replace(tmp, target)
+
+    def write_project(self, page: ProjectPage, name: str) -> None:
+        """Write a project's HTML & JSON pages to the mirror"""
+        pkgdir = self.package_dir(name)
+        packages = []
+        for pkg in page.packages:
+            try:
+                size: int | None = (pkgdir / pkg.filename).stat().st_size
+            except FileNotFoundError:
+                size = pkg.size
+            packages.append(
+                replace(
+                    pkg,
+                    url=f"../../packages/{quote(name)}/{quote(pkg.filename)}",
+                    size=size,
+                    provenance_url=None,
+                )
+            )
+        local = replace(page, packages=packages)
+        d = self.project_dir(name)
+        with atomic_open(d / "index.json") as fp:
+            write_project_json(local, fp)
+        with atomic_open(d / "index.html") as fp:
+            write_project_html(local, fp)
+
+    def write_index(self) -> None:
+        """Write the mirror's HTML & JSON index pages"""
+        names = sorted(self.projects)
+        simple = self.root / "simple"
+        with atomic_open(simple / "index.json") as fp:
+            write_index_json([(n, self.projects[n].serial) for n in names], fp)
+        with atomic_open(simple / "index.html") as fp:
+            write_index_html(names, fp)
+
+    def pages_exist(self, name: str) -> bool:
+        d = self.project_dir(name)
+        return (d / "index.json").exists() and (d / "index.html").exists()
+
+    def index_exists(self) -> bool:
+        return (self.root / "simple" / "index.json").exists()
+
+    def remove_files(self, name: str) -> None:
+        for d in (self.project_dir(name), self.package_dir(name)):
+            self.check_contained(d)
+            if d.is_dir():
+                shutil.rmtree(d)
+
+    def check_contained(self, path: Path) -> None:
+        """
+        Raise a `ValueError` if ``path`` does not resolve to a location strictly
+        inside the mirror's root directory
+        """
+        root = self.root.resolve()
+        resolved = path.resolve()
+        if resolved == root or not resolved.is_relative_to(root):
+            raise ValueError(f"Refusing to modify {path}: not inside {self.root}")
+
+
+def check_project_name(name: str) -> None:
+    """
+    Raise a `ValueError` if ``name`` is not a normalized :pep:`503` project
+    name and thus cannot be safely used as the name of a directory in the
+    mirror
+    """
+    if not NORMALIZED_NAME_RGX.fullmatch(name):
+        raise ValueError(f"Refusing to mirror unsafe project name {name!r}")
+
+
+def check_filename(filename: str) -> None:
+    """
+    Raise a `ValueError` if ``filename`` cannot be safely used as the name of
+    a file in a package directory
+    """
+    if (
+        not filename
+        or filename.startswith(".")
+        or "/" in filename
+        or "\\" in filename
+        or "\0" in filename
+    ):
+        raise ValueError(f"Refusing to mirror unsafe filename {filename!r}")
@@ -1,9 +1,15 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
 import hashlib
-from typing import Any
+import os
+from pathlib import Path
+from typing import Any, TextIO
 from urllib.parse import urljoin, urlparse, urlunparse
 import warnings
+from packaging.utils import canonicalize_name
 from packaging.version import Version
 from . import SUPPORTED_REPOSITORY_VERSION
 from .errors import (
@@ -14,6 +20,28 @@ from .errors import (
 )
 
 
+@lru_cache(maxsize=65536)
+def normalize(name: str) -> str:
+    """
+    Normalize a project name in accordance with :pep:`503`, caching the
+    results so that names that are looked up repeatedly (such as the names in
+    requirement lists being validated) are only normalized once
+    """
+    return canonicalize_name(name)
+
+
+def parse_serial(serial: int | str | None) -> int | None:
+    """
+    Convert a project serial (e.g., a `ProjectPage.last_serial` value, which is
+    a `str`) to an `int`, returning `None` if it is `None` or not numeric
+    """
+    if isinstance(serial, int):
+        return serial
+    if serial is not None and serial.isdigit():
+        return int(serial)
+    return None
+
+
 def check_repo_version(
     declared_version: str,
     supported_version: str = SUPPORTED_REPOSITORY_VERSION,
@@ -99,3 +127,40 @@ def url_add_suffix(url: str, suffix: str) -> str:
     """
     u = urlparse(url)
     return urlunparse((u[0], u[1], u[2] + suffix, "", "", ""))
+
+
+def temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+@contextmanager
+def atomic_open(path: Path) -> Iterator[TextIO]:
+    """
+    Open a temporary text file in the same directory as ``path`` for writing,
+    and rename it over ``path`` once the context manager exits successfully
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = temp_path(path)
+    try:
+        with tmp.open("w", encoding="utf-8") as fp:
+            yield fp
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Write ``data`` to ``path`` by writing to a temporary file in the same
+    directory and then renaming it over ``path``
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = temp_path(path)
+    try:
+        with tmp.open("wb") as fp:
+            fp.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,147 @@
+from __future__ import annotations
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+from packaging.version import InvalidVersion, Version
+
+if TYPE_CHECKING:
+    from .classes import DistributionPackage
+
+
+class VersionIndex:
+    """
+    .. versionadded:: 1.9.0
+
+    An index of the versions on a project page and the packages belonging to
+    each, built once from the page's packages (and its :pep:`700` versions,
+    if any) so that version queries do not need to re-parse & re-sort
+    versions every time.  Usually obtained via `ProjectPage.version_index`.
+
+    Versions are compared & looked up as `packaging.version.Version` objects,
+    so equivalent spellings of a version (e.g., ``"1.0"`` and ``"1.0.0"``)
+    refer to the same entry.  Version strings that are not valid :pep:`440`
+    versions are kept out of the sorted version list but can still be looked
+    up by their exact spelling.  Packages without a version are listed in
+    `unversioned`.
+
+    ``len()`` returns the number of distinct valid versions, iterating over an
+    index yields them in ascending order, and ``version in index`` tests
+    whether a version (given as a `str` or `~packaging.version.Version`)
+    appears on the page.
+    """
+
+    def __init__(
+        self,
+        packages: Iterable[DistributionPackage],
+        versions: Iterable[str] | None = None,
+    ) -> None:
+        parsed: dict[str, Version | None] = {}
+
+        def parse(v: str) -> Version | None:
+            try:
+                return parsed[v]
+            except KeyError:
+                try:
+                    parsed[v] = Version(v)
+                except InvalidVersion:
+                    parsed[v] = None
+                return parsed[v]
+
+        #: A mapping from versions to the packages with those versions, in the
+        #: order that they appear on the page
+        self.packages: dict[Version, list[DistributionPackage]] = {}
+        #: A mapping from invalid version strings to the packages with those
+        #: versions
+        self.invalid: dict[str, list[DistributionPackage]] = {}
+        #: Packages whose versions could not be determined
+        self.unversioned: list[DistributionPackage] = []
+        for pkg in packages:
+            if pkg.version is None:
+                self.unversioned.append(pkg)
+            elif (v := parse(pkg.version)) is None:
+                self.invalid.setdefault(pkg.version, []).append(pkg)
+            else:
+                self.packages.setdefault(v, []).append(pkg)
+        allversions = set(self.packages)
+        for s in versions or ():
+            if (v := parse(s)) is not None:
+                allversions.add(v)
+            else:
+                self.invalid.setdefault(s, [])
+        #: All valid versions, in ascending order, including versions listed in
+        #: the page's :pep:`700` versions that have no packages
+        self.versions: list[Version] = sorted(allversions)
+        #: The versions in `versions`, as a set for constant-time membership
+        #: tests
+        self.version_set: frozenset[Version] = frozenset(allversions)
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def __iter__(self) -> Iterator[Version]:
+        return iter(self.versions)
+
+    def __contains__(self, version: object) -> bool:
+        if isinstance(version, Version):
+            return version in self.version_set
+        elif isinstance(version, str):
+            try:
+                return Version(version) in self
+            except InvalidVersion:
+                return version in self.invalid
+        else:
+            return False
+
+    def get(self, version: str | Version) -> list[DistributionPackage]:
+        """
+        Return the packages for the given version, in the order that they
+        appear on the page.  Returns an empty list if the version has no
+        packages.
+        """
+        if isinstance(version, str):
+            try:
+                v = Version(version)
+            except InvalidVersion:
+                return list(self.invalid.get(version, []))
+        else:
+            v = version
+        return list(self.packages.get(v, []))
+
+    def is_yanked(self, version: str | Version) -> bool:
+        """
+        Return whether the given version is yanked, i.e., whether it has at
+        least one package and all of its packages are yanked (See :pep:`592`)
+        """
+        pkgs = self.get(version)
+        return bool(pkgs) and all(p.is_yanked for p in pkgs)
+
+    def latest(self, prereleases: bool = False, yanked: bool = False) -> Version | None:
+        """
+        Return the highest version that has at least one package, or `None`
+        if there is no such version.
+
+        :param bool prereleases:
+            whether to consider pre-release and development versions
+        :param bool yanked: whether to consider yanked versions
+        """
+        for v in reversed(self.versions):
+            if v not in self.packages:
+                continue
+            if not prereleases and v.is_prerelease:
+                continue
+            if not yanked and self.is_yanked(v):
+                continue
+            return v
+        return None
+
+    def latest_packages(
+        self, prereleases: bool = False, yanked: bool = False
+    ) -> list[DistributionPackage]:
+        """
+        Return the packages for the version returned by `latest()` with the
+        same arguments, or an empty list if there is no such version.  Unless
+        ``yanked`` is true, yanked packages are omitted.
+        """
+        v = self.latest(prereleases=prereleases, yanked=yanked)
+        if v is None:
+            return []
+        return [p for p in self.packages[v] if yanked or not p.is_yanked]
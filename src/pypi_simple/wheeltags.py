@@ -0,0 +1,135 @@
+from __future__ import annotations
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+from packaging.tags import Tag
+from packaging.utils import BuildTag, InvalidWheelFilename, parse_wheel_filename
+from packaging.version import Version
+
+if TYPE_CHECKING:
+    from .classes import DistributionPackage
+
+
+class WheelTagIndex:
+    """
+    .. versionadded:: 1.9.0
+
+    An index of the wheels on a project page by compatibility tag, built once
+    by parsing each wheel's filename so that selecting wheels for many target
+    environments does not require re-parsing every filename for every
+    environment.  Usually obtained via `ProjectPage.wheel_tag_index`.
+
+    Queries take the tags supported by a target environment as an iterable of
+    `packaging.tags.Tag` objects in order of preference (most preferred
+    first), such as is returned by `packaging.tags.sys_tags()`, and look up
+    each tag in turn rather than testing every wheel against every tag.
+
+    Wheels whose filenames cannot be parsed are listed in `invalid`.
+    """
+
+    def __init__(self, packages: Iterable[DistributionPackage]) -> None:
+        #: A mapping from tags to the wheels that support them, in the order
+        #: that they appear on the page
+        self.wheels: dict[Tag, list[DistributionPackage]] = {}
+        #: A mapping from wheel filenames to their parsed versions, build tags,
+        #: and tags
+        self.parsed: dict[str, tuple[Version, BuildTag, frozenset[Tag]]] = {}
+        #: Wheels whose filenames could not be parsed
+        self.invalid: list[DistributionPackage] = []
+        for pkg in packages:
+            if pkg.package_type != "wheel":
+                continue
+            try:
+                _, version, build, tags = parse_wheel_filename(pkg.filename)
+            except InvalidWheelFilename:
+                self.invalid.append(pkg)
+                continue
+            self.parsed[pkg.filename] = (version, build, tags)
+            for t in tags:
+                self.wheels.setdefault(t, []).append(pkg)
+
+    def __len__(self) -> int:
+        return len(self.parsed)
+
+    def tags(self, pkg: DistributionPackage) -> frozenset[Tag]:
+        """
+        Return the tags of the given wheel, or an empty set if it is not an
+        indexed wheel
+        """
+        try:
+            return self.parsed[pkg.filename][2]
+        except KeyError:
+            return frozenset()
+
+    def get(self, tag: Tag) -> list[DistributionPackage]:
+        """Return the wheels that support the given tag"""
+        return list(self.wheels.get(tag, []))
+
+    def compatible(
+        self,
+        supported: Iterable[Tag],
+        version: str | Version | None = None,
+        yanked: bool = False,
+    ) -> list[DistributionPackage]:
+        """
+        Return all wheels that support at least one of the ``supported`` tags,
+        ordered from best to worst by their most preferred supported tag, then
+        by descending version and build tag.
+
+        :param supported: the supported tags, most preferred first
+        :param version: if given, only return wheels with this version
+        :param bool yanked: whether to include yanked wheels
+        """
+        v = parse_version(version)
+        rank: dict[str, int] = {}
+        found: list[DistributionPackage] = []
+        for i, t in enumerate(supported):
+            for pkg in self.wheels.get(t, ()):
+                if pkg.filename in rank or not self.accept(pkg, v, yanked):
+                    continue
+                rank[pkg.filename] = i
+                found.append(pkg)
+        found.sort(key=self.version_key, reverse=True)
+        found.sort(key=lambda p: rank[p.filename])
+        return found
+
+    def best(
+        self,
+        supported: Iterable[Tag],
+        version: str | Version | None = None,
+        yanked: bool = False,
+    ) -> DistributionPackage | None:
+        """
+        Return the wheel with the most preferred of the ``supported`` tags,
+        breaking ties by preferring higher versions and then higher build
+        tags, or `None` if no wheel is compatible.  Tags are looked up in
+        order, and the search stops at the first tag that any wheel supports.
+
+        :param supported: the supported tags, most preferred first
+        :param version: if given, only consider wheels with this version
+        :param bool yanked: whether to consider yanked wheels
+        """
+        v = parse_version(version)
+        for t in supported:
+            candidates = [
+                pkg for pkg in self.wheels.get(t, ()) if self.accept(pkg, v, yanked)
+            ]
+            if candidates:
+                return max(candidates, key=self.version_key)
+        return None
+
+    def accept(
+        self, pkg: DistributionPackage, version: Version | None, yanked: bool
+    ) -> bool:
+        if not yanked and pkg.is_yanked:
+            return False
+        return version is None or self.parsed[pkg.filename][0] == version
+
+    def version_key(self, pkg: DistributionPackage) -> tuple[Version, BuildTag]:
+        v, build, _ = self.parsed[pkg.filename]
+        return (v, build)
+
+
+def parse_version(version: str | Version | None) -> Version | None:
+    if isinstance(version, str):
+        return Version(version)
+    return version
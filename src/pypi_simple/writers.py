@@ -0,0 +1,252 @@
+"""
+.. versionadded:: 1.9.0
+
+Serializing `ProjectPage` objects and project listings as :pep:`503` HTML and
+:pep:`691` JSON simple repository pages.
+
+The writers emit each page piece by piece to a text file object rather than
+building the whole document in memory first, so even an index listing
+hundreds of thousands of projects can be written quickly and with constant
+memory usage.  Project pages preserve packages' digests, Requires-Python
+specifiers, yanked statuses & reasons, GPG signature flags, core metadata
+availability & digests, sizes, upload times, and provenance URLs, along with
+the page's :pep:`700` versions, :pep:`708` tracks & alternate locations, and
+:pep:`792` project status.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Iterator
+from datetime import timezone
+from html import escape
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, TextIO
+from urllib.parse import quote
+from packaging.utils import canonicalize_name as normalize
+from . import SUPPORTED_REPOSITORY_VERSION
+from .classes import DistributionPackage, IndexPage, ProjectPage
+from .nameindex import NameIndex
+
+#: A project listing that can be written as an index page: an `IndexPage`, a
+#: `NameIndex`, or an iterable of project names or ``(name, last_serial)``
+#: pairs (such as is returned by `PyPISimple.stream_project_serials()`)
+IndexListing = IndexPage | NameIndex | Iterable[str] | Iterable[tuple[str, int | None]]
+
+
+def write_project_html(
+    page: ProjectPage,
+    fp: TextIO,
+    repository_version: str = SUPPORTED_REPOSITORY_VERSION,
+) -> None:
+    """
+    Write ``page`` to ``fp`` as a :pep:`503` HTML project page declaring the
+    given repository version.  Packages' URLs are written as-is, with a hash
+    fragment for the package's SHA256 digest (or, if it has none, its first
+    digest).
+
+    Note that HTML project pages cannot express a page's `~ProjectPage.versions`
+    or `~ProjectPage.last_serial` or packages' `~DistributionPackage.size` or
+    `~DistributionPackage.upload_time`.
+    """
+    title = escape(page.project)
+    fp.write("<!DOCTYPE html>\n<html>\n  <head>\n")
+    write_meta(fp, "repository-version", repository_version)
+    for url in page.tracks:
+        write_meta(fp, "tracks", url)
+    for url in page.alternate_locations:
+        write_meta(fp, "alternate-locations", url)
+    if page.status is not None:
+        write_meta(fp, "project-status", page.status.value)
+        if page.status_reason is not None:
+            write_meta(fp, "project-status-reason", page.status_reason)
+    fp.write(
+        f"    <title>Links for {title}</title>\n  </head>\n  <body>\n"
+        f"    <h1>Links for {title}</h1>\n"
+    )
+    for pkg in page.packages:
+        fp.write(package_link(pkg))
+    fp.write("  </body>\n</html>\n")
+
+
+def write_project_json(
+    page: ProjectPage,
+    fp: TextIO,
+    repository_version: str = SUPPORTED_REPOSITORY_VERSION,
+) -> None:
+    """
+    Write ``page`` to ``fp`` as a :pep:`691` JSON project page declaring the
+    given repository version.  If the page's `~ProjectPage.versions` is
+    `None`, the versions of its packages are written instead, as required by
+    :pep:`700`.
+
+    Note that :pep:`700` requires every file to have a ``size`` for
+    repository versions 1.1 and up, but packages whose
+    `~DistributionPackage.size` is `None` (e.g., those parsed from HTML
+    pages) are written without one, so pages containing such packages do not
+    fully conform to the declared version.  Pass ``repository_version="1.0"``
+    to avoid declaring support for :pep:`700` in that case.
+    """
+    meta: dict[str, Any] = {"api-version": repository_version}
+    if page.last_serial is not None:
+        meta["_last-serial"] = (
+            int(page.last_serial) if page.last_serial.isdigit() else page.last_serial
+        )
+    if page.tracks:
+        meta["tracks"] = page.tracks
+    fp.write(f'{{"meta": {json.dumps(meta)}, "name": {json.dumps(page.project)}')
+    fp.write(', "files": [')
+    for i, pkg in enumerate(page.packages):
+        if i:
+            fp.write(", ")
+        fp.write(json.dumps(file_entry(pkg)))
+    versions = page.versions
+    if versions is None:
+        versions = sorted({pkg.version for pkg in page.packages if pkg.version})
+    fp.write(f'], "versions": {json.dumps(versions)}')
+    if page.alternate_locations:
+        fp.write(f', "alternate-locations": {json.dumps(page.alternate_locations)}')
+    if page.status is not None:
+        status = {"status": page.status.value}
+        if page.status_reason is not None:
+            status["reason"] = page.status_reason
+        fp.write(f', "project-status": {json.dumps(status)}')
+    fp.write("}\n")
+
+
+def write_index_html(
+    projects: IndexListing,
+    fp: TextIO,
+    repository_version: str = SUPPORTED_REPOSITORY_VERSION,
+) -> int:
+    """
+    Write a :pep:`503` HTML index page listing ``projects`` to ``fp``,
+    linking each project to the relative URL of its normalized name.
+    ``projects`` is consumed lazily, and the projects are written in the order
+    given.
+
+    :returns: the number of projects written
+    """
+    fp.write("<!DOCTYPE html>\n<html>\n  <head>\n")
+    write_meta(fp, "repository-version", repository_version)
+    fp.write("    <title>Simple index</title>\n  </head>\n  <body>\n")
+    n = 0
+    for name, _ in iter_listing(projects):
+        href = escape(quote(normalize(name), safe=""))
+        fp.write(f'    <a href="{href}/">{escape(name)}</a><br/>\n')
+        n += 1
+    fp.write("  </body>\n</html>\n")
+    return n
+
+
+def write_index_json(
+    projects: IndexListing,
+    fp: TextIO,
+    repository_version: str = SUPPORTED_REPOSITORY_VERSION,
+    last_serial: int | None = None,
+) -> int:
+    """
+    Write a :pep:`691` JSON index page listing ``projects`` to ``fp``,
+    including each project's ``_last-serial`` if known.  ``projects`` is
+    consumed lazily, and the projects are written in the order given.  If
+    ``last_serial`` is given, it is written as the index's ``_last-serial``.
+
+    :returns: the number of projects written
+    """
+    meta: dict[str, Any] = {"api-version": repository_version}
+    if last_serial is not None:
+        meta["_last-serial"] = last_serial
+    fp.write(f'{{"meta": {json.dumps(meta)}, "projects": [')
+    n = 0
+    for name, serial in iter_listing(projects):
+        if n:
+            fp.write(", ")
+        if serial is None:
+            fp.write(f'{{"name": {encode_basestring_ascii(name)}}}')
+        else:
+            fp.write(
+                f'{{"name": {encode_basestring_ascii(name)}, "_last-serial": {serial}}}'
+            )
+        n += 1
+    fp.write("]}\n")
+    return n
+
+
+def iter_listing(projects: IndexListing) -> Iterator[tuple[str, int | None]]:
+    if isinstance(projects, NameIndex):
+        yield from projects.items()
+        return
+    items: Iterable[str] | Iterable[tuple[str, int | None]]
+    if isinstance(projects, IndexPage):
+        items = projects.projects
+    else:
+        items = projects
+    for item in items:
+        if isinstance(item, str):
+            yield (item, None)
+        else:
+            yield item
+
+
+def write_meta(fp: TextIO, name: str, content: str) -> None:
+    fp.write(f'    <meta name="pypi:{name}" content="{escape(content)}">\n')
+
+
+def package_link(pkg: DistributionPackage) -> str:
+    """Return the HTML anchor for ``pkg`` on a project page"""
+    href = pkg.url
+    if pkg.digests:
+        alg = "sha256" if "sha256" in pkg.digests else next(iter(pkg.digests))
+        href += f"#{alg}={pkg.digests[alg]}"
+    attrs = [f'href="{escape(href)}"']
+    if pkg.requires_python is not None:
+        attrs.append(f'data-requires-python="{escape(pkg.requires_python)}"')
+    if pkg.has_sig is not None:
+        attrs.append(f'data-gpg-sig="{"true" if pkg.has_sig else "false"}"')
+    if pkg.is_yanked:
+        attrs.append(f'data-yanked="{escape(pkg.yanked_reason or "")}"')
+    if pkg.has_metadata:
+        if pkg.metadata_digests:
+            alg = (
+                "sha256"
+                if "sha256" in pkg.metadata_digests
+                else next(iter(pkg.metadata_digests))
+            )
+            value = escape(f"{alg}={pkg.metadata_digests[alg]}")
+        else:
+            value = "true"
+        attrs.append(f'data-dist-info-metadata="{value}"')
+        attrs.append(f'data-core-metadata="{value}"')
+    if pkg.provenance_url is not None:
+        attrs.append(f'data-provenance="{escape(pkg.provenance_url)}"')
+    return f"    <a {' '.join(attrs)}>{escape(pkg.filename)}</a><br/>\n"
+
+
+def file_entry(pkg: DistributionPackage) -> dict[str, Any]:
+    """Return the :pep:`691` ``files`` entry for ``pkg``"""
+    entry: dict[str, Any] = {
+        "filename": pkg.filename,
+        "url": pkg.url,
+        "hashes": pkg.digests,
+    }
+    if pkg.requires_python is not None:
+        entry["requires-python"] = pkg.requires_python
+    if pkg.has_metadata is not None:
+        core: bool | dict[str, str] = pkg.has_metadata
+        if pkg.has_metadata and pkg.metadata_digests:
+            core = pkg.metadata_digests
+        entry["core-metadata"] = core
+        entry["dist-info-metadata"] = core
+    if pkg.has_sig is not None:
+        entry["gpg-sig"] = pkg.has_sig
+    if pkg.is_yanked:
+        entry["yanked"] = pkg.yanked_reason if pkg.yanked_reason is not None else True
+    if pkg.size is not None:
+        entry["size"] = pkg.size
+    if pkg.upload_time is not None:
+        t = pkg.upload_time
+        if t.tzinfo is not None:
+            t = t.astimezone(timezone.utc)
+        entry["upload-time"] = t.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    if pkg.provenance_url is not None:
+        entry["provenance"] = pkg.provenance_url
+    return entry
@@ -0,0 +1,54 @@
+from __future__ import annotations
+import pickle
+import socket
+from pypi_simple import ConnectionOptions, PyPISimple
+from pypi_simple.adapters import TunedHTTPAdapter
+
+
+def test_default_socket_options() -> None:
+    opts = ConnectionOptions()
+    assert opts.socket_options() == [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+
+def test_custom_socket_options() -> None:
+    opts = ConnectionOptions(
+        tcp_keepalive=True,
+        receive_buffer_size=1 << 20,
+        send_buffer_size=1 << 16,
+    )
+    assert opts.socket_options() == [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20),
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 16),
+    ]
+
+
+def test_client_mounts_adapter() -> None:
+    opts = ConnectionOptions(
+        pool_connections=4,
+        pool_maxsize=32,
+        pool_block=True,
+        connect_retries=3,
+        tcp_keepalive=True,
+    )
+    with PyPISimple("https://test.nil/simple/", connection=opts) as simple:
+        for prefix in ["https://", "http://"]:
+            adapter = simple.s.get_adapter(prefix + "test.nil/simple/")
+            assert isinstance(adapter, TunedHTTPAdapter)
+            assert adapter.max_retries.connect == 3
+            assert adapter.max_retries.read is False
+            pm = adapter.poolmanager
+            assert pm.connection_pool_kw["maxsize"] == 32
+            assert pm.connection_pool_kw["block"] is True
+            assert pm.connection_pool_kw["socket_options"] == opts.socket_options()
+
+
+def test_adapter_pickle() -> None:
+    opts = ConnectionOptions(pool_maxsize=20, tcp_keepalive=True)
+    adapter = pickle.loads(pickle.dumps(opts.make_adapter()))
+    assert isinstance(adapter, TunedHTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 20
+    assert adapter.poolmanager.connection_pool_kw["socket_options"] == (
+        opts.socket_options()
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import filecmp
+import gzip
 import json
 from pathlib import Path
 from types import TracebackType
@@ -1051,3 +1052,31 @@ def test_get_provenance_404() -> None:
             str(excinfo.value)
             == "No provenance file found for sampleproject-1.2.3-py3-none-any.whl at https://test.nil/simple/packages/sampleproject-1.2.3-py3-none-any.whl.provenance"
         )
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@responses.activate
+def test_transfer_stats_gzip(stream: bool) -> None:
+    projects = [{"name": f"project-{i}"} for i in range(1000)]
+    body = json.dumps(
+        {"meta": {"api-version": "1.0"}, "projects": projects}
+    ).encode("utf-8")
+    compressed = gzip.compress(body)
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/",
+        body=compressed,
+        content_type="application/vnd.pypi.simple.v1+json",
+        headers={"Content-Encoding": "gzip"},
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        assert simple.stats.compression_ratio is None
+        if stream:
+            names = list(simple.stream_project_names(chunk_size=512))
+        else:
+            names = simple.get_index_page().projects
+        assert names == [p["name"] for p in projects]
+        assert simple.stats.responses == 1
+        assert simple.stats.wire_bytes == len(compressed)
+        assert simple.stats.body_bytes == len(body)
+        assert simple.stats.compression_ratio == len(body) / len(compressed)
@@ -0,0 +1,314 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import gc
+import json
+from pathlib import Path
+import threading
+import time
+import pytest
+import requests
+import responses
+from pypi_simple import (
+    AdaptiveConcurrency,
+    BatchResult,
+    ConcurrencyDecision,
+    DistributionPackage,
+    FixedConcurrency,
+    NoSuchProjectError,
+    Outcome,
+    ProjectPage,
+    PyPISimple,
+)
+from pypi_simple.batch import classify, run_batch
+from pypi_simple.client import copy_session
+
+DATA_DIR = Path(__file__).with_name("data")
+
+
+def test_adaptive_increase() -> None:
+    limiter = AdaptiveConcurrency(initial=2, max_limit=4)
+    for _ in range(2):
+        limiter.acquire()
+    assert limiter.in_flight == 2
+    limiter.release(0.1, Outcome.OK)
+    limiter.release(0.1, Outcome.OK)
+    assert limiter.limit == 3
+    assert limiter.in_flight == 0
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(0.1, Outcome.OK)
+    assert limiter.limit == 4
+    assert [(d.old_limit, d.new_limit, d.reason) for d in limiter.decisions] == [
+        (2, 3, "healthy"),
+        (3, 4, "healthy"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "latency,outcome,reason",
+    [
+        (0.1, Outcome.THROTTLED, "throttled"),
+        (0.1, Outcome.ERROR, "error"),
+        (1.0, Outcome.OK, "latency"),
+    ],
+)
+def test_adaptive_decrease(latency: float, outcome: Outcome, reason: str) -> None:
+    changes: list[ConcurrencyDecision] = []
+    limiter = AdaptiveConcurrency(initial=8, on_change=changes.append)
+    limiter.acquire()
+    limiter.release(0.1, Outcome.OK)
+    assert limiter.limit == 8
+    limiter.acquire()
+    limiter.release(latency, outcome)
+    assert limiter.limit == 4
+    assert len(changes) == 1
+    assert (changes[0].old_limit, changes[0].new_limit) == (8, 4)
+    assert changes[0].reason == reason
+
+
+def test_adaptive_decrease_once_per_window() -> None:
+    limiter = AdaptiveConcurrency(initial=16)
+    limiter.acquire()
+    limiter.release(10.0, Outcome.OK)
+    for _ in range(4):
+        limiter.acquire()
+    for _ in range(4):
+        limiter.release(10.0, Outcome.THROTTLED)
+    assert limiter.limit == 8
+
+
+def test_adaptive_min_limit() -> None:
+    limiter = AdaptiveConcurrency(initial=2, min_limit=2)
+    limiter.acquire()
+    limiter.release(0.1, Outcome.ERROR)
+    assert limiter.limit == 2
+    assert list(limiter.decisions) == []
+
+
+def test_adaptive_bad_args() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(initial=10, max_limit=5)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(backoff=1.5)
+
+
+def test_classify() -> None:
+    def http_error(status: int) -> requests.HTTPError:
+        r = requests.Response()
+        r.status_code = status
+        return requests.HTTPError(response=r)
+
+    assert classify(None) is Outcome.OK
+    assert classify(http_error(429)) is Outcome.THROTTLED
+    assert classify(http_error(503)) is Outcome.THROTTLED
+    assert classify(http_error(500)) is Outcome.ERROR
+    assert classify(http_error(404)) is Outcome.OK
+    assert classify(requests.ConnectionError()) is Outcome.ERROR
+    assert classify(ValueError()) is Outcome.OK
+
+
+def test_run_batch_limits_concurrency() -> None:
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def work(x: int) -> int:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        if x == 3:
+            raise ValueError(x)
+        return x * 2
+
+    results = list(run_batch(work, range(20), FixedConcurrency(3)))
+    assert peak <= 3
+    assert sorted(r.item for r in results) == list(range(20))
+    (bad,) = [r for r in results if not r.ok]
+    assert bad.item == 3
+    assert isinstance(bad.error, ValueError)
+    with pytest.raises(ValueError):
+        bad.unwrap()
+    assert {r.item: r.unwrap() for r in results if r.ok} == {
+        x: x * 2 for x in range(20) if x != 3
+    }
+
+
+@responses.activate
+def test_get_project_pages() -> None:
+    for name in ["foo", "bar", "baz"]:
+        responses.add(
+            responses.GET,
+            f"https://test.nil/simple/{name}/",
+            body=f'<a href="../../files/{name}-1.0.tar.gz">{name}-1.0.tar.gz</a>',
+            content_type="text/html",
+        )
+    responses.add(responses.GET, "https://test.nil/simple/quux/", status=404)
+    limiter = AdaptiveConcurrency(initial=2, max_limit=4)
+    with PyPISimple("https://test.nil/simple/") as client:
+        results = {
+            r.item: r
+            for r in client.get_project_pages(
+                ["foo", "bar", "quux", "baz"], concurrency=limiter
+            )
+        }
+    assert sorted(results) == ["bar", "baz", "foo", "quux"]
+    for name in ["foo", "bar", "baz"]:
+        page = results[name].unwrap()
+        assert page.project == name
+        assert [p.filename for p in page.packages] == [f"{name}-1.0.tar.gz"]
+    assert isinstance(results["quux"].error, NoSuchProjectError)
+    assert limiter.in_flight == 0
+
+
+@responses.activate
+def test_download_packages(tmp_path: Path) -> None:
+    pkgs = []
+    for name in ["foo", "bar"]:
+        url = f"https://test.nil/files/{name}-1.0.tar.gz"
+        responses.add(responses.GET, url, body=f"{name} contents")
+        pkgs.append(
+            DistributionPackage(
+                filename=f"{name}-1.0.tar.gz",
+                url=url,
+                project=name,
+                version="1.0",
+                package_type="sdist",
+                digests={},
+                requires_python=None,
+                has_sig=None,
+            )
+        )
+    with PyPISimple("https://test.nil/simple/") as client:
+        results = list(
+            client.download_packages(
+                pkgs, tmp_path / "dist", verify=False, concurrency=2
+            )
+        )
+    assert all(isinstance(r, BatchResult) and r.ok for r in results)
+    for name in ["foo", "bar"]:
+        path = tmp_path / "dist" / f"{name}-1.0.tar.gz"
+        assert path.read_text() == f"{name} contents"
+    assert sorted(r.unwrap() for r in results) == sorted(
+        tmp_path / "dist" / f"{name}-1.0.tar.gz" for name in ["foo", "bar"]
+    )
+
+
+@responses.activate
+def test_thread_sessions() -> None:
+    for name in ["foo", "bar", "baz", "quux"]:
+        responses.add(
+            responses.GET,
+            f"https://test.nil/simple/{name}/",
+            body=f'<a href="../../files/{name}-1.0.tar.gz">{name}-1.0.tar.gz</a>',
+            content_type="text/html",
+        )
+    barrier = threading.Barrier(4)
+    with PyPISimple("https://test.nil/simple/", thread_sessions=True) as client:
+        assert client.session is client.s
+
+        def fetch(name: str) -> tuple[requests.Session, ProjectPage]:
+            barrier.wait()
+            return (client.session, client.get_project_page(name))
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(fetch, ["foo", "bar", "baz", "quux"]))
+        sessions = {id(s) for s, _ in results}
+        assert len(sessions) == 4
+        assert sessions == {id(s) for s in client.sessions}
+        assert id(client.s) not in sessions
+        for s, page in results:
+            assert s.adapters["https://"] is client.s.adapters["https://"]
+            assert s.headers["User-Agent"] == client.s.headers["User-Agent"]
+            assert [p.filename for p in page.packages] == [f"{page.project}-1.0.tar.gz"]
+        # Copies are dropped once their threads have exited:
+        del results, s
+        gc.collect()
+        assert len(client.sessions) == 0
+        for _ in range(5):
+            for r in client.get_project_pages(["foo", "bar", "baz", "quux"], 4):
+                r.unwrap()
+            gc.collect()
+            assert len(client.sessions) == 0
+
+
+@pytest.mark.parametrize(
+    "thread_sessions,library_copies,caller_copies",
+    [(None, True, False), (True, True, True), (False, False, False)],
+)
+@responses.activate
+def test_thread_sessions_modes(
+    thread_sessions: bool | None, library_copies: bool, caller_copies: bool
+) -> None:
+    responses.add(responses.HEAD, "https://test.nil/simple/foo/")
+    with PyPISimple(
+        "https://test.nil/simple/", thread_sessions=thread_sessions
+    ) as client:
+        seen: list[requests.Session] = []
+
+        def check(name: str) -> bool:
+            seen.append(client.session)
+            return client.project_exists(name)
+
+        for r in run_batch(check, ["foo"], 1):
+            assert r.unwrap()
+        assert (seen[-1] is not client.s) is library_copies
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert (
+                pool.submit(lambda: client.session).result() is not client.s
+            ) is caller_copies
+
+
+def test_copy_session() -> None:
+    s = requests.Session()
+    s.headers["X-Foo"] = "bar"
+    s.auth = ("user", "pass")
+    s.cookies.set("cookie", "value")
+    new = copy_session(s)
+    assert new.headers["X-Foo"] == "bar"
+    new.headers["X-Foo"] = "baz"
+    assert s.headers["X-Foo"] == "bar"
+    assert new.auth == ("user", "pass")
+    assert new.cookies is s.cookies
+    assert new.adapters == s.adapters
+    assert new.adapters is not s.adapters
+
+
+class CustomSession(requests.Session):
+    pass
+
+
+class ArgSession(requests.Session):
+    def __init__(self, token: str) -> None:
+        super().__init__()
+        self.headers["Authorization"] = f"Bearer {token}"
+
+
+def test_copy_session_subclass() -> None:
+    s = CustomSession()
+    s.headers["X-Foo"] = "bar"
+    new = copy_session(s)
+    assert type(new) is CustomSession
+    assert new.headers["X-Foo"] == "bar"
+    new2 = copy_session(ArgSession("secret"))
+    assert type(new2) is requests.Session
+    assert new2.headers["Authorization"] == "Bearer secret"
+
+
+def test_parse_in_threads() -> None:
+    html = (DATA_DIR / "qypi.html").read_text()
+    data = json.loads((DATA_DIR / "argset-708.json").read_text())
+
+    def parse(i: int) -> ProjectPage:
+        if i % 2:
+            return ProjectPage.from_html("qypi", html, base_url="https://test.nil/")
+        else:
+            return ProjectPage.from_json_data(data, base_url="https://test.nil/")
+
+    expected = [parse(0), parse(1)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pages = list(pool.map(parse, range(64)))
+    assert all(p == expected[i % 2] for i, p in enumerate(pages))
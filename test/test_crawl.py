@@ -0,0 +1,121 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Any
+import pytest
+from pypi_simple import ProjectPage, PyPISimple
+from pypi_simple.crawl import (
+    Crawler,
+    crawl_shard,
+    read_missing,
+    read_pages,
+    shard_of,
+)
+
+NAMES = [f"Project_{i}" for i in range(20)]
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo" / "simple"
+    root.mkdir(parents=True)
+    (root / "index.json").write_text(
+        json.dumps(
+            {
+                "meta": {"api-version": "1.1"},
+                "projects": [{"name": n} for n in NAMES + ["gone"]],
+            }
+        )
+    )
+    for i, name in enumerate(NAMES):
+        normed = name.lower().replace("_", "-")
+        (root / normed).mkdir()
+        (root / normed / "index.json").write_text(
+            json.dumps(
+                {
+                    "meta": {"api-version": "1.1", "_last-serial": i},
+                    "name": normed,
+                    "files": [
+                        {
+                            "filename": f"{name}-{v}.tar.gz",
+                            "url": f"../../files/{name}-{v}.tar.gz",
+                            "hashes": {"sha256": f"{i:064x}"},
+                        }
+                        for v in range(i % 3)
+                    ],
+                }
+            )
+        )
+    return root
+
+
+def test_shard_of() -> None:
+    assert shard_of("Foo_Bar", 7) == shard_of("foo-bar", 7)
+    shards = {shard_of(n, 4) for n in NAMES}
+    assert shards <= {0, 1, 2, 3}
+    assert len(shards) > 1
+    assert all(shard_of(n, 1) == 0 for n in NAMES)
+
+
+def test_crawl_shards(repo: Path, tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    reports = [crawl_shard(repo, out, i, 3) for i in range(3)]
+    assert sum(r.fetched for r in reports) == len(NAMES)
+    assert sum((r.missing for r in reports), []) == ["gone"]
+    assert all(not r.failed for r in reports)
+    pages: dict[str, ProjectPage] = {}
+    missing: list[str] = []
+    for i in range(3):
+        path = out / f"shard-{i:05d}-of-00003.pages"
+        for page in read_pages(path):
+            assert shard_of(page.project, 3) == i
+            pages[page.project] = page
+        missing.extend(read_missing(path))
+    assert missing == ["gone"]
+    with PyPISimple(repo) as client:
+        assert len(pages) == len(NAMES)
+        for name, page in pages.items():
+            assert page == client.get_project_page(name)
+
+
+class CrashingClient(PyPISimple):
+    def __init__(self, *args: Any, crash_after: int, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.remaining = crash_after
+
+    def get_project_page(  # type: ignore[override]
+        self, project: str, **kwargs: Any
+    ) -> ProjectPage:
+        self.remaining -= 1
+        if self.remaining < 0:
+            raise KeyboardInterrupt
+        return super().get_project_page(project, **kwargs)
+
+
+def test_crawl_resume(repo: Path, tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    with CrashingClient(repo, crash_after=7) as client:
+        crawler = Crawler(client, out, concurrency=1, checkpoint_interval=3)
+        with pytest.raises(KeyboardInterrupt):
+            crawler.crawl()
+        assert not crawler.is_complete()
+    # Simulate a partially-written record after the checkpoint:
+    with crawler.pages_path.open("ab") as fp:
+        fp.write(b"\x01\x05\x00garbage")
+    with PyPISimple(repo) as client:
+        crawler = Crawler(client, out, concurrency=4, checkpoint_interval=3)
+        report = crawler.resume()
+        assert report.skipped == 7
+        assert report.fetched + len(report.missing) == len(NAMES) + 1 - 7
+        assert crawler.is_complete()
+        assert crawler.resume().skipped == len(NAMES) + 1
+    projects = [p.project for p in read_pages(crawler.pages_path)]
+    assert sorted(projects) == sorted(n.lower().replace("_", "-") for n in NAMES)
+
+
+def test_crawl_bad_shard(tmp_path: Path) -> None:
+    with PyPISimple(tmp_path) as client:
+        with pytest.raises(ValueError):
+            Crawler(client, tmp_path, shard=3, nshards=3)
+        with pytest.raises(FileNotFoundError):
+            Crawler(client, tmp_path).resume()
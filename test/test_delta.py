@@ -0,0 +1,120 @@
+from __future__ import annotations
+import io
+import json
+import pytest
+import responses
+from pypi_simple import ACCEPT_JSON_ONLY, IndexPage, ProjectPage, PyPISimple
+from pypi_simple.delta import Change, IndexDelta, compute_delta, diff_listings
+from pypi_simple.nameindex import NameIndex, write_name_index
+
+
+def name_index(names: list[str] | dict[str, int]) -> NameIndex:
+    fp = io.BytesIO()
+    write_name_index(fp, names)
+    return NameIndex(fp.getvalue())
+
+
+def test_added_removed() -> None:
+    old = IndexPage(
+        projects=["Foo", "bar", "Baz_Quux", "gnusto"],
+        repository_version=None,
+        last_serial=None,
+    )
+    new = ["foo", "BAZ.quux", "cleesh", "aardvark", "foo"]
+    assert list(diff_listings(old, new)) == [
+        ("aardvark", Change.ADDED),
+        ("bar", Change.REMOVED),
+        ("cleesh", Change.ADDED),
+        ("gnusto", Change.REMOVED),
+    ]
+    delta = compute_delta(old, new)
+    assert delta == IndexDelta(
+        added=["aardvark", "cleesh"], removed=["bar", "gnusto"], changed=[]
+    )
+    assert delta.to_fetch == ["aardvark", "cleesh"]
+    assert delta
+
+
+def test_no_changes() -> None:
+    delta = compute_delta(["foo", "bar"], ["BAR", "Foo"])
+    assert delta == IndexDelta()
+    assert not delta
+
+
+@pytest.mark.parametrize("empty", [[], name_index([])])
+def test_empty(empty: list[str] | NameIndex) -> None:
+    assert compute_delta(empty, ["b", "a"]).added == ["a", "b"]
+    assert compute_delta(["b", "a"], empty).removed == ["a", "b"]
+
+
+def test_changed_serials() -> None:
+    old = name_index({"foo": 10, "bar": 20, "baz": 30, "quux": 40})
+    new = [
+        ("Foo", 10),
+        ("bar", 25),
+        ("baz", None),
+        ("quux", 50),
+        ("quux", 35),
+        ("new", 60),
+    ]
+    delta = compute_delta(old, new)
+    assert delta.added == ["new"]
+    assert delta.removed == []
+    assert delta.changed == ["bar", "quux"]
+    assert delta.to_fetch == ["bar", "new", "quux"]
+
+
+def test_known_serials() -> None:
+    old = ["foo", "bar", "baz"]
+    new = [("foo", 10), ("bar", 20), ("baz", 30)]
+    assert compute_delta(old, new).changed == []
+    known = {"foo": 10, "bar": 15}
+    assert compute_delta(old, new, known).changed == ["bar"]
+    # Known serials take precedence over those in the old listing:
+    old_index = name_index({"foo": 5, "bar": 20, "baz": 30})
+    assert compute_delta(old_index, new, {"foo": 10, "bar": 1}).changed == ["bar"]
+
+
+def test_known_serials_from_pages() -> None:
+    pages = [
+        ProjectPage.from_json_data(
+            {
+                "meta": {"api-version": "1.1", "_last-serial": serial},
+                "name": name,
+                "files": [],
+            }
+        )
+        for name, serial in [("foo", 10), ("bar", 15)]
+    ]
+    known = {p.project: p.last_serial for p in pages}
+    assert known == {"foo": "10", "bar": "15"}
+    new = [("foo", 10), ("bar", 20), ("baz", 30)]
+    assert compute_delta(["foo", "bar", "baz"], new, known).changed == ["bar"]
+
+
+@responses.activate
+def test_delta_against_live_stream() -> None:
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/",
+        body=json.dumps(
+            {
+                "meta": {"api-version": "1.1", "_last-serial": 100},
+                "projects": [
+                    {"name": "Foo", "_last-serial": 90},
+                    {"name": "bar", "_last-serial": 50},
+                    {"name": "new"},
+                ],
+            }
+        ),
+        content_type="application/vnd.pypi.simple.v1+json",
+    )
+    old = name_index({"foo": 80, "bar": 50, "gone": 10})
+    with PyPISimple("https://test.nil/simple/", accept=ACCEPT_JSON_ONLY) as client:
+        assert list(client.stream_project_serials()) == [
+            ("Foo", 90),
+            ("bar", 50),
+            ("new", None),
+        ]
+        delta = compute_delta(old, client.stream_project_serials())
+    assert delta == IndexDelta(added=["new"], removed=["gone"], changed=["foo"])
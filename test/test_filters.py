@@ -0,0 +1,238 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+import pytest
+import responses
+from pypi_simple import (
+    DistributionPackage,
+    NoSuchProjectError,
+    PackageFilter,
+    ProjectPage,
+    PyPISimple,
+)
+
+DATA_DIR = Path(__file__).with_name("data")
+
+
+def qypi_page(pkg_filter: PackageFilter | None = None) -> ProjectPage:
+    return ProjectPage.from_html(
+        "qypi",
+        (DATA_DIR / "qypi.html").read_text(),
+        base_url="https://test.nil/simple/qypi/",
+        filter=pkg_filter,
+    )
+
+
+def filenames(packages: list[DistributionPackage]) -> list[str]:
+    return [p.filename for p in packages]
+
+
+@pytest.mark.parametrize(
+    "pkg_filter,expected",
+    [
+        (PackageFilter(), 12),
+        (
+            PackageFilter(version="0.4.1"),
+            ["qypi-0.4.1-py3-none-any.whl", "qypi-0.4.1.tar.gz"],
+        ),
+        (
+            PackageFilter(version="0.2"),
+            ["qypi-0.2.0-py3-none-any.whl", "qypi-0.2.0.tar.gz"],
+        ),
+        (PackageFilter(version="9.9"), []),
+        (
+            PackageFilter(package_types=["sdist"], filename="*-0.1.*"),
+            ["qypi-0.1.0.tar.gz", "qypi-0.1.0.post1.tar.gz"],
+        ),
+        (
+            PackageFilter(
+                package_types={"wheel"},
+                predicate=lambda p: p.version is not None and p.version >= "0.3",
+            ),
+            [
+                "qypi-0.3.0-py3-none-any.whl",
+                "qypi-0.4.0-py3-none-any.whl",
+                "qypi-0.4.1-py3-none-any.whl",
+            ],
+        ),
+    ],
+)
+def test_filter_html(pkg_filter: PackageFilter, expected: int | list[str]) -> None:
+    page = qypi_page(pkg_filter)
+    if isinstance(expected, int):
+        assert len(page.packages) == expected
+    else:
+        assert filenames(page.packages) == expected
+    # Filtering while parsing is equivalent to filtering afterwards:
+    assert page.packages == [p for p in qypi_page().packages if pkg_filter(p)]
+
+
+def test_filter_json_yanked() -> None:
+    data = json.loads((DATA_DIR / "yanked.json").read_text())
+    data["files"].append(
+        {
+            "filename": "yanked-0.1.0.tar.gz",
+            "url": "https://test.nil/yanked-0.1.0.tar.gz",
+            "hashes": {},
+        }
+    )
+    page = ProjectPage.from_json_data(data, filter=PackageFilter(yanked=False))
+    assert filenames(page.packages) == ["yanked-0.1.0.tar.gz"]
+    page = ProjectPage.from_json_data(
+        data, filter=PackageFilter(package_types=["sdist"])
+    )
+    assert filenames(page.packages) == ["yanked-0.0.0.tar.gz", "yanked-0.1.0.tar.gz"]
+    assert page.packages[0].yanked_reason == "not good"
+
+
+def test_filter_skips_validation() -> None:
+    data = {
+        "meta": {"api-version": "1.0"},
+        "name": "foo",
+        "files": [
+            {"filename": "foo-1.0.tar.gz", "url": "foo-1.0.tar.gz", "hashes": {}},
+            {"filename": "foo-2.0.tar.gz", "url": 42},
+        ],
+    }
+    page = ProjectPage.from_json_data(data, filter=PackageFilter(version="1.0"))
+    assert filenames(page.packages) == ["foo-1.0.tar.gz"]
+    with pytest.raises(ValueError):
+        ProjectPage.from_json_data(data)
+
+
+def test_filter_unparsable_filename() -> None:
+    f = PackageFilter(version="1.0")
+    assert not f.match_entry("README.txt", False)
+    assert PackageFilter(filename="README*").match_entry("README.txt", False)
+
+
+def test_filter_hashable() -> None:
+    assert PackageFilter(package_types=["wheel"]) == PackageFilter(
+        package_types={"wheel"}
+    )
+    assert hash(PackageFilter(package_types=["wheel"])) == hash(
+        PackageFilter(package_types={"wheel"})
+    )
+
+
+@responses.activate
+def test_get_project_page_filter() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/qypi/",
+        body=(DATA_DIR / "qypi.html").read_text(),
+        content_type="text/html",
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        page = simple.get_project_page(
+            "qypi", filter=PackageFilter(version="0.4.0", package_types=["wheel"])
+        )
+    assert filenames(page.packages) == ["qypi-0.4.0-py3-none-any.whl"]
+
+
+@responses.activate
+def test_stream_project_packages_html() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/qypi/",
+        body=(DATA_DIR / "qypi.html").read_text(),
+        content_type="text/html",
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        assert list(simple.stream_project_packages("QyPI")) == qypi_page().packages
+        pkgs = list(
+            simple.stream_project_packages(
+                "qypi", filter=PackageFilter(filename="*.tar.gz", version="0.4.0")
+            )
+        )
+    assert filenames(pkgs) == ["qypi-0.4.0.tar.gz"]
+
+
+@responses.activate
+def test_stream_project_packages_json() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/yanked/",
+        body=(DATA_DIR / "yanked.json").read_text(),
+        content_type="application/vnd.pypi.simple.v1+json",
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        pkgs = list(simple.stream_project_packages("yanked"))
+        assert filenames(pkgs) == [
+            "yanked-0.0.0-py3-none-any.whl",
+            "yanked-0.0.0.tar.gz",
+        ]
+        assert all(p.is_yanked for p in pkgs)
+        assert pkgs[0].project == "yanked"
+        assert pkgs[0].version == "0.0.0"
+        assert (
+            list(
+                simple.stream_project_packages(
+                    "yanked", filter=PackageFilter(yanked=False)
+                )
+            )
+            == []
+        )
+
+
+@responses.activate
+def test_stream_project_packages_404() -> None:
+    responses.add(
+        method=responses.GET, url="https://test.nil/simple/nexists/", status=404
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(NoSuchProjectError):
+            list(simple.stream_project_packages("nexists"))
+
+
+@responses.activate
+def test_find_package_stops_early() -> None:
+    body = (DATA_DIR / "qypi.html").read_bytes()
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/qypi/",
+        body=body,
+        content_type="text/html",
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        pkg = simple.find_package(
+            "qypi", filename="qypi-0.1.0.post1.tar.gz", chunk_size=512
+        )
+        assert pkg is not None
+        assert pkg.url == (
+            "https://files.pythonhosted.org/packages/0e/49/3056ee68b44c8eab4d46"
+            "98b52ae4d18c0db92c80abc312894c02c4722621/qypi-0.1.0.post1.tar.gz"
+        )
+        assert 0 < simple.stats.body_bytes < len(body) // 2
+        pkg = simple.find_package("qypi", version="0.4.1", chunk_size=512)
+        assert pkg is not None
+        assert pkg.filename == "qypi-0.4.1-py3-none-any.whl"
+        pkg = simple.find_package(
+            "qypi", version="0.4.1", filter=PackageFilter(package_types=["sdist"])
+        )
+        assert pkg is not None
+        assert pkg.filename == "qypi-0.4.1.tar.gz"
+        assert simple.find_package("qypi", filename="qypi-0.1.0.tar.g?") is None
+        assert simple.find_package("qypi", version="1.0") is None
+        with pytest.raises(ValueError):
+            simple.find_package("qypi")
+
+
+@responses.activate
+def test_find_package_json() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/yanked/",
+        body=(DATA_DIR / "yanked.json").read_text(),
+        content_type="application/vnd.pypi.simple.v1+json",
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        pkg = simple.find_package("yanked", filename="yanked-0.0.0.tar.gz")
+        assert pkg is not None
+        assert pkg.yanked_reason == "not good"
+        assert (
+            simple.find_package(
+                "yanked", version="0", filter=PackageFilter(yanked=False)
+            )
+            is None
+        )
@@ -0,0 +1,155 @@
+from __future__ import annotations
+from collections.abc import Callable, Iterator
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import threading
+import httpx
+import pytest
+import requests
+from pypi_simple import IndexPage, ProjectPage, PyPISimple
+from pypi_simple.http2 import HTTP2Adapter
+
+DATA_DIR = Path(__file__).with_name("data")
+
+
+def make_client(handler: Callable[[httpx.Request], httpx.Response]) -> PyPISimple:
+    simple = PyPISimple("https://test.nil/simple/")
+    simple.s.mount(
+        "https://",
+        HTTP2Adapter(transport=httpx.MockTransport(handler)),
+    )
+    return simple
+
+
+def test_http2_param_mounts_adapter() -> None:
+    with PyPISimple("https://test.nil/simple/", http2=True) as simple:
+        assert isinstance(simple.s.get_adapter("https://test.nil/"), HTTP2Adapter)
+        assert not isinstance(simple.s.get_adapter("http://test.nil/"), HTTP2Adapter)
+
+
+def test_get_project_page() -> None:
+    body = (DATA_DIR / "session01" / "in-place.html").read_bytes()
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(
+            200,
+            content=gzip.compress(body),
+            headers={
+                "Content-Type": "text/html; charset=utf-8",
+                "Content-Encoding": "gzip",
+                "X-PyPI-Last-Serial": "54321",
+            },
+        )
+
+    with make_client(handler) as simple:
+        page = simple.get_project_page("IN.PLACE", headers={"X-Custom": "yes"})
+    expected = ProjectPage.from_html(
+        "IN.PLACE", body, base_url="https://test.nil/simple/in-place/"
+    )
+    expected.last_serial = "54321"
+    assert page == expected
+    (req,) = seen
+    assert str(req.url) == "https://test.nil/simple/in-place/"
+    assert req.headers["X-Custom"] == "yes"
+    assert "application/vnd.pypi.simple.v1+json" in req.headers["Accept"]
+
+
+def test_stream_project_names() -> None:
+    body = (DATA_DIR / "simple01.html").read_bytes()
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"Content-Type": "text/html"})
+
+    with make_client(handler) as simple:
+        names = list(simple.stream_project_names(chunk_size=64))
+    assert names == IndexPage.from_html(body).projects
+
+
+def test_redirect() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/simple/project/":
+            return httpx.Response(
+                301, headers={"Location": "https://test.nil/simple/other/"}
+            )
+        return httpx.Response(
+            200,
+            content=b'<a href="project-0.1.0.tar.gz">project-0.1.0.tar.gz</a>',
+            headers={"Content-Type": "text/html"},
+        )
+
+    with make_client(handler) as simple:
+        page = simple.get_project_page("project")
+    assert [p.url for p in page.packages] == [
+        "https://test.nil/simple/other/project-0.1.0.tar.gz"
+    ]
+
+
+def test_http_error() -> None:
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, content=b"Unavailable")
+
+    with make_client(handler) as simple:
+        with pytest.raises(requests.HTTPError) as excinfo:
+            simple.get_index_page()
+    assert excinfo.value.response is not None
+    assert excinfo.value.response.status_code == 503
+
+
+def test_connect_error() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    with make_client(handler) as simple:
+        with pytest.raises(requests.ConnectionError):
+            simple.get_index_page()
+
+
+@pytest.fixture
+def proxy_server() -> Iterator[tuple[str, list[str]]]:
+    """
+    Run a local HTTP server that acts as a forward proxy for plain-HTTP
+    requests, answering each with a fixed page and recording the requested
+    absolute URLs
+    """
+    seen: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802
+            seen.append(self.path)
+            body = b'<a href="foo/">foo</a>'
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield (f"http://{host!s}:{port}", seen)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_proxies(proxy_server: tuple[str, list[str]]) -> None:
+    proxy_url, seen = proxy_server
+    adapter = HTTP2Adapter()
+    with PyPISimple("http://test.nil/simple/") as simple:
+        simple.s.mount("http://", adapter)
+        simple.s.trust_env = False
+        simple.s.proxies = {"http": proxy_url}
+        assert simple.get_index_page().projects == ["foo"]
+        assert seen == ["http://test.nil/simple/"]
+        assert [k[2] for k in adapter.clients] == [proxy_url]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Any
+import pytest
+from pypi_simple import UnsupportedRepoVersionError
+from pypi_simple.json_stream import iter_json_object, iter_project_names_json
+
+DATA_DIR = Path(__file__).with_name("data")
+
+
+def chunked(s: str, size: int) -> list[str]:
+    return [s[i : i + size] for i in range(0, len(s), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+def test_iter_json_object_chunks(size: int) -> None:
+    doc = (DATA_DIR / "argset.json").read_text()
+    data = json.loads(doc)
+    assert list(iter_json_object(chunked(doc, size))) == list(data.items())
+    assert list(iter_json_object(chunked(doc, size), array_keys={"files"})) == [
+        ("files", data["files"][0]),
+        ("files", data["files"][1]),
+        ("meta", data["meta"]),
+        ("name", "argset"),
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 2, 5])
+@pytest.mark.parametrize(
+    "doc,array_keys,members",
+    [
+        ("{}", (), []),
+        (" { } ", (), []),
+        (
+            '{"a": 123, "b": true, "c": null}',
+            (),
+            [("a", 123), ("b", True), ("c", None)],
+        ),
+        ('{"a": [], "b": -1.5e3}', {"a"}, [("b", -1500.0)]),
+        (
+            '{"a": [1, 22, [3]], "b": []}',
+            {"a"},
+            [("a", 1), ("a", 22), ("a", [3]), ("b", [])],
+        ),
+        ('{"a": null}', {"a"}, [("a", None)]),
+        ('{"a": "x\\"]}"}', {"a"}, [("a", 'x"]}')]),
+    ],
+)
+def test_iter_json_object(
+    doc: str, array_keys: set[str], members: list[tuple[str, Any]], size: int
+) -> None:
+    assert list(iter_json_object(chunked(doc, size), array_keys)) == members
+
+
+@pytest.mark.parametrize(
+    "doc",
+    [
+        "",
+        "[]",
+        '{"a": 1',
+        '{"a": 1,}',
+        '{"a" 1}',
+        '{"a": [1, 2}',
+        '{"a": 1} {}',
+        '{"a": tru}',
+    ],
+)
+def test_iter_json_object_invalid(doc: str) -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_object(chunked(doc, 2), array_keys={"a"}))
+
+
+def test_iter_project_names_json() -> None:
+    doc = json.dumps(
+        {
+            "meta": {"api-version": "1.0", "_last-serial": 42},
+            "projects": [{"name": "foo"}, {"name": "Bar_Baz"}],
+        }
+    )
+    assert list(iter_project_names_json(chunked(doc, 3))) == ["foo", "Bar_Baz"]
+
+
+def test_iter_project_names_json_bad_version() -> None:
+    doc = json.dumps({"meta": {"api-version": "2.0"}, "projects": [{"name": "foo"}]})
+    with pytest.raises(UnsupportedRepoVersionError):
+        list(iter_project_names_json([doc]))
+
+
+def test_iter_project_names_json_no_meta() -> None:
+    doc = json.dumps({"projects": [{"name": "foo"}]})
+    with pytest.raises(ValueError, match="missing 'meta'"):
+        list(iter_project_names_json([doc]))
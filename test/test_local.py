@@ -0,0 +1,182 @@
+from __future__ import annotations
+import hashlib
+import json
+from pathlib import Path
+import pytest
+import requests
+import responses
+from pypi_simple import (
+    ACCEPT_ANY,
+    ACCEPT_HTML_ONLY,
+    ACCEPT_HTML_PREFERRED,
+    ACCEPT_JSON_ONLY,
+    DigestMismatchError,
+    DistributionPackage,
+    NoSuchProjectError,
+    PyPISimple,
+)
+from pypi_simple.local import choose_index, file_url_to_path
+
+CONTENTS = b"This is a package.\n"
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    simple = tmp_path / "simple"
+    (simple / "foo").mkdir(parents=True)
+    (simple / "bar").mkdir()
+    (tmp_path / "packages").mkdir()
+    (tmp_path / "packages" / "foo-1.0.tar.gz").write_bytes(CONTENTS)
+    sha256 = hashlib.sha256(CONTENTS).hexdigest()
+    (simple / "index.html").write_text(
+        '<a href="foo/">foo</a>\n<a href="bar/">bar</a>\n'
+    )
+    (simple / "index.json").write_text(
+        json.dumps(
+            {
+                "meta": {"api-version": "1.0"},
+                "projects": [{"name": "foo"}, {"name": "bar"}, {"name": "json"}],
+            }
+        )
+    )
+    (simple / "foo" / "index.html").write_text(
+        f'<a href="../../packages/foo-1.0.tar.gz#sha256={sha256}">foo-1.0.tar.gz</a>\n'
+    )
+    (simple / "foo" / "index.json").write_text(
+        json.dumps(
+            {
+                "meta": {"api-version": "1.0"},
+                "name": "foo",
+                "files": [
+                    {
+                        "filename": "foo-1.0.tar.gz",
+                        "url": "../../packages/foo-1.0.tar.gz",
+                        "hashes": {"sha256": sha256},
+                    }
+                ],
+            }
+        )
+    )
+    # "bar" only has an HTML page
+    (simple / "bar" / "index.html").write_text("")
+    return simple
+
+
+@pytest.mark.parametrize(
+    "accept,expected",
+    [
+        (ACCEPT_ANY, ["foo", "bar", "json"]),
+        (ACCEPT_JSON_ONLY, ["foo", "bar", "json"]),
+        (ACCEPT_HTML_ONLY, ["foo", "bar"]),
+        (ACCEPT_HTML_PREFERRED, ["foo", "bar"]),
+    ],
+)
+def test_index_page(repo: Path, accept: str, expected: list[str]) -> None:
+    with PyPISimple(repo, accept=accept) as client:
+        assert client.endpoint == repo.as_uri() + "/"
+        assert client.get_index_page().projects == expected
+        assert list(client.stream_project_names()) == expected
+
+
+@pytest.mark.parametrize("accept", [ACCEPT_JSON_ONLY, ACCEPT_HTML_ONLY])
+def test_project_page_and_download(repo: Path, tmp_path: Path, accept: str) -> None:
+    with PyPISimple(repo.as_uri(), accept=accept) as client:
+        page = client.get_project_page("FOO")
+        (pkg,) = page.packages
+        assert pkg.url == (repo.parent / "packages" / "foo-1.0.tar.gz").as_uri()
+        target = tmp_path / "dl" / "foo-1.0.tar.gz"
+        client.download_package(pkg, target)
+        assert target.read_bytes() == CONTENTS
+        pkg.digests["sha256"] = "0" * 64
+        with pytest.raises(DigestMismatchError):
+            client.download_package(pkg, target)
+        assert not target.exists()
+
+
+def test_str_path_endpoint(repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(repo.parent)
+    for endpoint in [str(repo), "simple", "simple/"]:
+        with PyPISimple(endpoint) as client:
+            assert client.endpoint == repo.as_uri() + "/"
+            assert client.is_local
+            assert client.get_index_page().projects == ["foo", "bar", "json"]
+
+
+def test_json_only_missing(repo: Path) -> None:
+    with PyPISimple(repo, accept=ACCEPT_JSON_ONLY) as client:
+        with pytest.raises(NoSuchProjectError):
+            client.get_project_page("bar")
+        with pytest.raises(NoSuchProjectError):
+            client.get_project_page("quux")
+
+
+def test_head_and_file_response(repo: Path) -> None:
+    with PyPISimple(repo) as client:
+        url = (repo.parent / "packages" / "foo-1.0.tar.gz").as_uri()
+        r = client.s.head(url)
+        assert r.status_code == 200
+        assert r.headers["Content-Length"] == str(len(CONTENTS))
+        assert r.content == b""
+        r = client.s.get(url)
+        assert r.content == CONTENTS
+        r = client.s.post(url)
+        assert r.status_code == 405
+
+
+def test_choose_index(repo: Path) -> None:
+    assert choose_index(repo, None) == (
+        repo / "index.json",
+        "application/vnd.pypi.simple.v1+json",
+    )
+    assert choose_index(repo, "text/*") == (repo / "index.html", "text/html")
+    assert choose_index(repo, "text/html;q=0, */*;q=0.1") == (
+        repo / "index.json",
+        "application/vnd.pypi.simple.v1+json",
+    )
+    assert choose_index(repo, "image/png") is None
+
+
+def test_file_url_to_path() -> None:
+    assert file_url_to_path("file:///srv/simple/foo%20bar/") == Path(
+        "/srv/simple/foo bar"
+    )
+    assert file_url_to_path("file://localhost/srv/") == Path("/srv")
+    assert file_url_to_path("file://example.com/srv/") is None
+    assert file_url_to_path("https://example.com/srv/") is None
+
+
+@responses.activate
+def test_remote_redirect_to_file(repo: Path) -> None:
+    target = repo.parent / "packages" / "foo-1.0.tar.gz"
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/foo/",
+        status=302,
+        headers={"Location": target.as_uri()},
+    )
+    with PyPISimple("https://test.nil/simple/") as client:
+        assert not client.is_local
+        with pytest.raises(requests.exceptions.InvalidSchema):
+            client.get_project_page("foo")
+
+
+def test_remote_file_package_url(repo: Path, tmp_path: Path) -> None:
+    pkg = DistributionPackage(
+        filename="foo-1.0.tar.gz",
+        url=(repo.parent / "packages" / "foo-1.0.tar.gz").as_uri(),
+        project="foo",
+        version="1.0",
+        package_type="sdist",
+        digests={},
+        requires_python=None,
+        has_sig=None,
+    )
+    target = tmp_path / "dl" / "foo-1.0.tar.gz"
+    with PyPISimple("https://test.nil/simple/") as client:
+        with pytest.raises(requests.exceptions.InvalidSchema):
+            client.download_package(pkg, target, verify=False)
+    assert not target.exists()
+    with PyPISimple(repo) as client:
+        assert client.is_local
+        client.download_package(pkg, target, verify=False)
+    assert target.read_bytes() == CONTENTS
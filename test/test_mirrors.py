@@ -0,0 +1,227 @@
+from __future__ import annotations
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+import time
+from typing import Any
+import pytest
+from pytest_mock import MockerFixture
+import requests
+import responses
+from pypi_simple import (
+    CircuitBreaker,
+    CircuitState,
+    MultiMirrorClient,
+    NoMirrorsAvailableError,
+    NoSuchProjectError,
+)
+from pypi_simple.mirrors import LatencyWindow
+
+PAGE = '<a href="../../files/foo-1.0.tar.gz">foo-1.0.tar.gz</a>'
+
+
+def add_page(
+    mirror: str, delay: float = 0, status: int = 200, body: str = PAGE
+) -> None:
+    def callback(
+        _req: requests.PreparedRequest,
+    ) -> tuple[int, dict[str, str], str]:
+        time.sleep(delay)
+        return (status, {"Content-Type": "text/html"}, body)
+
+    responses.add_callback(
+        responses.GET, f"https://{mirror}.nil/simple/foo/", callback=callback
+    )
+
+
+def calls_to(mirror: str) -> int:
+    return sum(1 for c in responses.calls if f"//{mirror}.nil/" in str(c.request.url))
+
+
+def state(breaker: CircuitBreaker) -> CircuitState:
+    # Prevent mypy from narrowing the property's type across assertions
+    return breaker.state
+
+
+def test_circuit_breaker(mocker: MockerFixture) -> None:
+    now = 100.0
+    mocker.patch("pypi_simple.mirrors.time.monotonic", side_effect=lambda: now)
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=10)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert state(breaker) is CircuitState.CLOSED
+    breaker.record_failure()
+    assert state(breaker) is CircuitState.OPEN
+    assert not breaker.allow()
+    now += 10
+    assert state(breaker) is CircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert state(breaker) is CircuitState.OPEN
+    now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert state(breaker) is CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_circuit_breaker_cancel_probe() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    breaker.record_failure()
+    assert state(breaker) is CircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.cancel_probe()
+    assert breaker.allow()
+
+
+def test_latency_window() -> None:
+    window = LatencyWindow(size=10)
+    assert window.percentile(95) is None
+    for i in range(1, 21):
+        window.add(i / 10)
+    assert len(window) == 10
+    assert window.percentile(50) == 1.5
+    assert window.percentile(95) == 2.0
+    assert window.percentile(0) == 1.1
+
+
+@responses.activate
+def test_no_hedge_when_fast() -> None:
+    add_page("one")
+    add_page("two")
+    with MultiMirrorClient(
+        ["https://one.nil/simple/", "https://two.nil/simple/"],
+        initial_hedge_delay=5,
+    ) as client:
+        page = client.get_project_page("foo")
+        assert [p.filename for p in page.packages] == ["foo-1.0.tar.gz"]
+        assert client.hedges_sent == 0
+    assert calls_to("one") == 1
+    assert calls_to("two") == 0
+
+
+@responses.activate
+def test_hedge_wins() -> None:
+    add_page("one", delay=1)
+    add_page("two")
+    with MultiMirrorClient(
+        ["https://one.nil/simple/", "https://two.nil/simple/"],
+        initial_hedge_delay=0.05,
+    ) as client:
+        start = time.monotonic()
+        page = client.get_project_page("foo")
+        assert time.monotonic() - start < 0.9
+        assert page.project == "foo"
+        assert client.hedges_sent == 1
+        assert client.hedges_won == 1
+    assert calls_to("one") == 1
+    assert calls_to("two") == 1
+
+
+@responses.activate
+def test_hedge_delay_from_percentile() -> None:
+    add_page("one", delay=0.01)
+    with MultiMirrorClient(
+        ["https://one.nil/simple/", "https://two.nil/simple/"],
+        initial_hedge_delay=7,
+        min_samples=3,
+        min_hedge_delay=0,
+    ) as client:
+        mirror = client.mirrors[0]
+        assert client.hedge_delay(mirror) == 7
+        for _ in range(3):
+            client.get_project_page("foo")
+        assert 0.01 <= client.hedge_delay(mirror) < 1
+
+
+@responses.activate
+def test_failure_falls_over_and_trips_breaker() -> None:
+    add_page("one", status=503, body="")
+    add_page("two")
+    with MultiMirrorClient(
+        ["https://one.nil/simple/", "https://two.nil/simple/"],
+        initial_hedge_delay=5,
+        failure_threshold=2,
+    ) as client:
+        for _ in range(4):
+            page = client.get_project_page("foo")
+            assert page.project == "foo"
+        assert client.mirrors[0].breaker.state is CircuitState.OPEN
+        # The healthy mirror is now tried first
+        assert [m.endpoint for m in client.ranked()] == [
+            "https://two.nil/simple/",
+            "https://one.nil/simple/",
+        ]
+    assert calls_to("one") == 2
+    assert calls_to("two") == 4
+
+
+@responses.activate
+def test_all_mirrors_fail() -> None:
+    add_page("one", status=502, body="")
+    add_page("two", status=502, body="")
+    with MultiMirrorClient(
+        ["https://one.nil/simple/", "https://two.nil/simple/"],
+        failure_threshold=1,
+    ) as client:
+        with pytest.raises(requests.HTTPError):
+            client.get_project_page("foo")
+        with pytest.raises(NoMirrorsAvailableError) as excinfo:
+            client.get_project_page("foo")
+    assert excinfo.value.endpoints == [
+        "https://one.nil/simple/",
+        "https://two.nil/simple/",
+    ]
+
+
+@responses.activate
+def test_not_found_is_definitive() -> None:
+    add_page("one", status=404, body="")
+    add_page("two")
+    with MultiMirrorClient(
+        ["https://one.nil/simple/", "https://two.nil/simple/"]
+    ) as client:
+        with pytest.raises(NoSuchProjectError):
+            client.get_project_page("foo")
+        assert client.mirrors[0].breaker.state is CircuitState.CLOSED
+    assert calls_to("two") == 0
+
+
+class StalledPool(ThreadPoolExecutor):
+    """
+    A thread pool in which only the first task ever starts, as though the pool
+    were saturated
+    """
+
+    def submit(  # type: ignore[override]
+        self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> Future[Any]:
+        if getattr(self, "started", False):
+            return Future()
+        self.started = True
+        return super().submit(fn, *args, **kwargs)
+
+
+@responses.activate
+def test_cancelled_hedge_releases_probe() -> None:
+    add_page("one", delay=0.3)
+    add_page("two")
+    with MultiMirrorClient(
+        ["https://one.nil/simple/", "https://two.nil/simple/"],
+        initial_hedge_delay=0.05,
+        failure_threshold=1,
+        cooldown=0,
+    ) as client:
+        client.pool.shutdown()
+        client.pool = StalledPool()
+        breaker = client.mirrors[1].breaker
+        breaker.record_failure()
+        assert state(breaker) is CircuitState.HALF_OPEN
+        # The hedge to the half-open mirror never starts and is cancelled once
+        # the request to the first mirror succeeds.
+        page = client.get_project_page("foo")
+        assert page.project == "foo"
+        assert client.hedges_sent == 1
+        assert breaker.allow()
+    assert calls_to("two") == 0
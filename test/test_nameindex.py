@@ -0,0 +1,126 @@
+from __future__ import annotations
+import io
+from pathlib import Path
+import pytest
+from pypi_simple import SnapshotError
+from pypi_simple.nameindex import NameIndex, write_name_index
+
+NAMES = [
+    "Flask",
+    "flask-login",
+    "Flask_SQLAlchemy",
+    "flake8",
+    "numpy",
+    "numpy-financial",
+    "numpy",
+    "NumPy",
+    "pandas",
+    "zope.interface",
+    "a",
+    "",
+]
+
+
+def build(names: list[str] | dict[str, int], block_size: int = 3) -> NameIndex:
+    fp = io.BytesIO()
+    write_name_index(fp, names, block_size=block_size)
+    return NameIndex(fp.getvalue())
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 16])
+def test_name_index(block_size: int) -> None:
+    index = build(NAMES, block_size)
+    expected = sorted(
+        {
+            "",
+            "a",
+            "flake8",
+            "flask",
+            "flask-login",
+            "flask-sqlalchemy",
+            "numpy",
+            "numpy-financial",
+            "pandas",
+            "zope-interface",
+        }
+    )
+    assert list(index) == expected
+    assert len(index) == len(expected)
+    for name in NAMES:
+        assert name in index
+    assert "Zope_Interface" in index
+    assert "flask-" not in index
+    assert "flas" not in index
+    assert "zzz" not in index
+    assert "0" not in index
+    assert 42 not in index
+    assert not index.has_serials
+    assert index.serial("flask") is None
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 16])
+def test_prefix(block_size: int) -> None:
+    index = build(NAMES, block_size)
+    assert list(index.prefix("Flask")) == [
+        "flask",
+        "flask-login",
+        "flask-sqlalchemy",
+    ]
+    assert list(index.prefix("fla")) == [
+        "flake8",
+        "flask",
+        "flask-login",
+        "flask-sqlalchemy",
+    ]
+    assert list(index.prefix("NUMPY_")) == ["numpy-financial"]
+    assert list(index.prefix("zope")) == ["zope-interface"]
+    assert list(index.prefix("q")) == []
+    assert list(index.prefix("zz")) == []
+    assert list(index.prefix("")) == list(index)
+
+
+def test_serials() -> None:
+    index = build({"Foo": 5, "foo": 3, "bar": 10, "baz.quux": 1 << 40})
+    assert index.has_serials
+    assert list(index.items()) == [
+        ("bar", 10),
+        ("baz-quux", 1 << 40),
+        ("foo", 5),
+    ]
+    assert index.serial("FOO") == 5
+    assert index.serial("baz_quux") == 1 << 40
+    assert index.serial("nope") is None
+    assert "bar" in index
+
+
+def test_empty() -> None:
+    index = build([])
+    assert len(index) == 0
+    assert list(index) == []
+    assert "foo" not in index
+    assert list(index.prefix("f")) == []
+
+
+def test_open_mmap(tmp_path: Path) -> None:
+    path = tmp_path / "names.idx"
+    with path.open("wb") as fp:
+        assert write_name_index(fp, [f"project-{i}" for i in range(1000)]) == 1000
+    with NameIndex.open(path) as index:
+        assert len(index) == 1000
+        assert "Project_999" in index
+        assert "project-1000" not in index
+        assert len(list(index.prefix("project-99"))) == 11
+    assert index.mmap is None
+
+
+def test_invalid() -> None:
+    with pytest.raises(SnapshotError, match="Not a pypi-simple name index"):
+        NameIndex(b"PYSS" + b"\0" * 20)
+    with pytest.raises(SnapshotError):
+        NameIndex(b"PYNI")
+    fp = io.BytesIO()
+    write_name_index(fp, ["foo"])
+    data = bytearray(fp.getvalue())
+    data[4] = 99
+    with pytest.raises(SnapshotError, match="Unsupported name index version"):
+        NameIndex(data)
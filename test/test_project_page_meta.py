@@ -0,0 +1,127 @@
+from __future__ import annotations
+from collections.abc import Iterator
+import json
+from pathlib import Path
+import pytest
+import responses
+from pypi_simple import (
+    ProjectPage,
+    ProjectPageMeta,
+    ProjectStatus,
+    PyPISimple,
+    UnsupportedRepoVersionError,
+    parse_head_stream,
+)
+from pypi_simple.json_stream import scan_project_meta_json
+
+DATA_DIR = Path(__file__).with_name("data")
+
+
+def test_parse_head_stream_stops_at_head() -> None:
+    consumed: list[str] = []
+
+    def pieces() -> Iterator[str]:
+        for piece in [
+            "<html><head><title>Links for foo</title>",
+            '<meta name="pypi:repository-version" content="1.1"/>',
+            '<meta name="pypi:project-status" content="archived"/></head>',
+            "<body>",
+            "<unclosed",
+        ]:
+            consumed.append(piece)
+            yield piece
+
+    page = parse_head_stream(pieces())
+    assert page.repository_version == "1.1"
+    assert page.status is ProjectStatus.ARCHIVED
+    assert page.links == []
+    assert len(consumed) == 3
+
+
+def test_parse_head_stream_implicit_end() -> None:
+    page = parse_head_stream(
+        [
+            b'<meta name="pypi:tracks" content="https://a.nil/"/>',
+            b'<a href="foo-1.0.tar.gz">foo-1.0.tar.gz</a>',
+            b'<meta name="pypi:tracks" content="https://b.nil/"/>',
+        ]
+    )
+    assert page.tracks == ["https://a.nil/"]
+    assert page.repository_version is None
+
+
+def test_parse_head_stream_unsupported_version() -> None:
+    with pytest.raises(UnsupportedRepoVersionError):
+        parse_head_stream(['<meta name="pypi:repository-version" content="2.0"/>'])
+
+
+def test_scan_project_meta_json() -> None:
+    text = (DATA_DIR / "argset-708.json").read_text()
+    meta = scan_project_meta_json([text], "ArgSet")
+    page = ProjectPage.from_json_data(json.loads(text))
+    assert meta == ProjectPageMeta.from_page(page)
+    assert meta.last_serial == "10562871"
+
+
+def test_scan_project_meta_json_stops_early() -> None:
+    consumed: list[str] = []
+
+    def pieces() -> Iterator[str]:
+        for piece in [
+            '{"meta": {"api-version": "1.1"}, "name": "foo",',
+            ' "alternate-locations": [], "project-status": {},',
+            ' "files": [{"filename": ',
+        ]:
+            consumed.append(piece)
+            yield piece
+
+    meta = scan_project_meta_json(pieces(), "FOO")
+    assert meta == ProjectPageMeta(
+        project="foo", repository_version="1.1", last_serial=None
+    )
+    assert len(consumed) == 2
+
+
+def test_scan_project_meta_json_no_meta() -> None:
+    with pytest.raises(ValueError):
+        scan_project_meta_json(['{"name": "foo", "files": []}'], "foo")
+
+
+@responses.activate
+def test_get_project_page_meta_html() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/qypi/",
+        body=(DATA_DIR / "qypi-708.html").read_text(),
+        content_type="text/html",
+        headers={"X-PyPI-Last-Serial": "12345"},
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        meta = simple.get_project_page_meta("qypi", chunk_size=256)
+        assert meta == ProjectPageMeta.from_page(simple.get_project_page("qypi"))
+    assert meta.last_serial == "12345"
+    assert meta.status is ProjectStatus.DEPRECATED
+    assert meta.alternate_locations == [
+        "https://alt.package/pypi/qypi/",
+        "https://test.alt.package/pypi/qypi/",
+    ]
+
+
+@responses.activate
+def test_get_project_page_meta_json() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/argset/",
+        body=(DATA_DIR / "argset-708.json").read_text(),
+        content_type="application/vnd.pypi.simple.v1+json",
+        headers={"X-PyPI-Last-Serial": "12345"},
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        meta = simple.get_project_page_meta("argset")
+    assert meta.project == "argset"
+    assert meta.repository_version == "1.2"
+    assert meta.last_serial == "10562871"
+    assert meta.tracks == [
+        "https://tracks.package/pypi/argset/",
+        "https://test.tracks.package/pypi/argset",
+    ]
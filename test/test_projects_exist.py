@@ -0,0 +1,91 @@
+from __future__ import annotations
+from io import BytesIO
+import pytest
+import requests
+import responses
+from pypi_simple import IndexPage, PyPISimple
+from pypi_simple.nameindex import NameIndex, write_name_index
+from pypi_simple.util import normalize
+
+
+@responses.activate
+def test_projects_exist_head() -> None:
+    responses.add(method=responses.HEAD, url="https://test.nil/simple/foo/")
+    responses.add(method=responses.HEAD, url="https://test.nil/simple/foo-bar/")
+    responses.add(
+        method=responses.HEAD, url="https://test.nil/simple/nexists/", status=404
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        assert simple.project_exists("foo")
+        assert not simple.project_exists("nexists")
+        assert simple.projects_exist(["Foo_Bar", "nexists", "FOO", "foo"]) == {
+            "Foo_Bar": True,
+            "nexists": False,
+            "FOO": True,
+            "foo": True,
+        }
+    # Names that normalize to the same name are only checked once:
+    assert [c.request.method for c in responses.calls] == ["HEAD"] * 5
+
+
+@responses.activate
+def test_project_exists_get_fallback() -> None:
+    responses.add(method=responses.HEAD, url="https://test.nil/simple/foo/", status=405)
+    responses.add(
+        method=responses.GET, url="https://test.nil/simple/foo/", body="x" * 65536
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        assert simple.project_exists("foo")
+        assert simple.stats.body_bytes == 0
+
+
+@responses.activate
+def test_projects_exist_error() -> None:
+    responses.add(method=responses.HEAD, url="https://test.nil/simple/foo/", status=403)
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(requests.HTTPError):
+            simple.projects_exist(["foo"])
+
+
+@responses.activate
+def test_projects_exist_from_index() -> None:
+    page = IndexPage(
+        projects=["Foo.Bar", "baz"], repository_version=None, last_serial=None
+    )
+    fp = BytesIO()
+    write_name_index(fp, page.projects)
+    indices: list[IndexPage | NameIndex] = [page, NameIndex(fp.getvalue())]
+    with PyPISimple("https://test.nil/simple/") as simple:
+        for index in indices:
+            assert simple.projects_exist(["foo-bar", "BAZ", "quux"], index=index) == {
+                "foo-bar": True,
+                "BAZ": True,
+                "quux": False,
+            }
+    assert len(responses.calls) == 0
+
+
+def test_normalize_cached() -> None:
+    assert normalize("Foo.Bar_baz") == "foo-bar-baz"
+    hits = normalize.cache_info().hits
+    assert normalize("Foo.Bar_baz") == "foo-bar-baz"
+    assert normalize.cache_info().hits == hits + 1
+
+
+def test_projects_exist_index_normalized_once() -> None:
+    page = IndexPage(
+        projects=[f"Project_{i}" for i in range(100)],
+        repository_version=None,
+        last_serial=None,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.projects_exist(["project-1"], index=page)
+        known = page.normalized_projects
+        # Index names bypass the `normalize()` cache:
+        size = normalize.cache_info().currsize
+        assert simple.projects_exist(["PROJECT_2", "quux"], index=page) == {
+            "PROJECT_2": True,
+            "quux": False,
+        }
+        assert page.normalized_projects is known
+        assert normalize.cache_info().currsize <= size + 2
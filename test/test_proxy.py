@@ -0,0 +1,240 @@
+from __future__ import annotations
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import logging
+from pathlib import Path
+import threading
+from typing import Any
+import pytest
+import requests
+from pypi_simple import ACCEPT_HTML_ONLY, ProjectPage, PyPISimple
+from pypi_simple.local import FileAdapter
+from pypi_simple.proxy import (
+    JSON_TYPE,
+    ProxyServer,
+    PullThroughCache,
+    negotiate,
+)
+
+CONTENTS = b"This is foo 1.0.\n"
+METADATA = b"Metadata-Version: 2.1\nName: foo\nVersion: 1.0\n"
+
+
+class CountingAdapter(FileAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()
+        self.counts: Counter[str] = Counter()
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        with self.lock:
+            self.counts[str(request.url).rsplit("/upstream/", 1)[-1]] += 1
+        return super().send(request, **kwargs)
+
+
+@pytest.fixture
+def upstream(tmp_path: Path) -> Path:
+    root = tmp_path / "upstream"
+    (root / "simple" / "foo").mkdir(parents=True)
+    (root / "files").mkdir()
+    (root / "files" / "foo-1.0.tar.gz").write_bytes(CONTENTS)
+    (root / "files" / "foo-1.0-py3-none-any.whl").write_bytes(CONTENTS)
+    (root / "files" / "foo-1.0-py3-none-any.whl.metadata").write_bytes(METADATA)
+    digest = hashlib.sha256(CONTENTS).hexdigest()
+    (root / "simple" / "index.json").write_text(
+        json.dumps(
+            {
+                "meta": {"api-version": "1.1"},
+                "projects": [{"name": "foo", "_last-serial": 5}],
+            }
+        )
+    )
+    (root / "simple" / "foo" / "index.json").write_text(
+        json.dumps(
+            {
+                "meta": {"api-version": "1.1", "_last-serial": 5},
+                "name": "foo",
+                "files": [
+                    {
+                        "filename": "foo-1.0.tar.gz",
+                        "url": "../../files/foo-1.0.tar.gz",
+                        "hashes": {"sha256": digest},
+                        "requires-python": ">=3.8",
+                    },
+                    {
+                        "filename": "foo-1.0-py3-none-any.whl",
+                        "url": "../../files/foo-1.0-py3-none-any.whl",
+                        "hashes": {"sha256": digest},
+                        "core-metadata": {
+                            "sha256": hashlib.sha256(METADATA).hexdigest()
+                        },
+                    },
+                ],
+                "versions": ["1.0"],
+            }
+        )
+    )
+    return root
+
+
+@pytest.fixture
+def adapter() -> CountingAdapter:
+    return CountingAdapter()
+
+
+@pytest.fixture
+def cache(upstream: Path, adapter: CountingAdapter, tmp_path: Path) -> PullThroughCache:
+    client = PyPISimple(upstream / "simple")
+    client.s.mount("file://", adapter)
+    return PullThroughCache(client, tmp_path / "cache")
+
+
+@pytest.fixture
+def proxy_url(cache: PullThroughCache) -> Iterator[str]:
+    server = ProxyServer(("127.0.0.1", 0), cache)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host!s}:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        cache.client.s.close()
+
+
+def test_negotiate() -> None:
+    assert negotiate(None) == JSON_TYPE
+    assert negotiate("text/html") == "text/html"
+    assert negotiate(ACCEPT_HTML_ONLY) == "application/vnd.pypi.simple.v1+html"
+    assert negotiate("text/html;q=0.5, application/*;q=0.9") == JSON_TYPE
+    assert negotiate("image/png") is None
+
+
+def test_proxy_pages_and_files(
+    proxy_url: str, cache: PullThroughCache, adapter: CountingAdapter, tmp_path: Path
+) -> None:
+    with PyPISimple(f"{proxy_url}/simple/") as client:
+        assert client.get_index_page().projects == ["foo"]
+        page = client.get_project_page("foo")
+        assert page.last_serial == "5"
+        assert [p.filename for p in page.packages] == [
+            "foo-1.0.tar.gz",
+            "foo-1.0-py3-none-any.whl",
+        ]
+        assert page.packages[0].url.startswith(f"{proxy_url}/files/")
+        assert page.packages[0].requires_python == ">=3.8"
+        html_page = client.get_project_page("FOO", accept=ACCEPT_HTML_ONLY)
+        assert [p.url for p in html_page.packages] == [p.url for p in page.packages]
+        for pkg in page.packages:
+            client.download_package(pkg, tmp_path / "dl" / pkg.filename)
+            assert (tmp_path / "dl" / pkg.filename).read_bytes() == CONTENTS
+        assert client.get_package_metadata_bytes(page.packages[1]) == METADATA
+    # Both packages have the same contents and are thus stored (and fetched)
+    # only once:
+    assert adapter.counts["simple/foo/"] == 1
+    assert adapter.counts["files/foo-1.0-py3-none-any.whl.metadata"] == 1
+    # index, project page, one package file, one metadata file:
+    assert cache.upstream_requests == 4
+    assert len([p for p in (tmp_path / "cache").rglob("*") if p.is_file()]) == 2
+
+
+def test_etags(proxy_url: str) -> None:
+    r = requests.get(f"{proxy_url}/simple/foo/")
+    r.raise_for_status()
+    assert r.headers["Content-Type"] == JSON_TYPE
+    assert r.headers["X-PyPI-Last-Serial"] == "5"
+    assert r.headers["Vary"] == "Accept"
+    etag = r.headers["ETag"]
+    r2 = requests.get(f"{proxy_url}/simple/foo/", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+    r3 = requests.get(
+        f"{proxy_url}/simple/foo/",
+        headers={"If-None-Match": etag, "Accept": "text/html"},
+    )
+    assert r3.status_code == 200
+    assert r3.headers["ETag"] != etag
+    url = ProjectPage.from_response(r, "foo").packages[0].url
+    r4 = requests.get(url)
+    assert r4.content == CONTENTS
+    r5 = requests.get(url, headers={"If-None-Match": r4.headers["ETag"]})
+    assert r5.status_code == 304
+
+
+def test_errors(proxy_url: str) -> None:
+    assert requests.get(f"{proxy_url}/simple/bar/").status_code == 404
+    assert requests.get(f"{proxy_url}/files/{'0' * 64}/x.tar.gz").status_code == 404
+    assert requests.get(f"{proxy_url}/elsewhere").status_code == 404
+    r = requests.get(f"{proxy_url}/simple/foo", allow_redirects=False)
+    assert r.status_code == 301
+    assert r.headers["Location"] == "/simple/foo/"
+    r = requests.get(f"{proxy_url}/simple/foo/", headers={"Accept": "image/png"})
+    assert r.status_code == 406
+
+
+def test_upstream_error_logged(
+    proxy_url: str, upstream: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    (upstream / "simple" / "foo" / "index.json").write_text("{")
+    with caplog.at_level(logging.WARNING, logger="pypi_simple.proxy"):
+        r = requests.get(f"{proxy_url}/simple/foo/")
+    assert r.status_code == 502
+    (record,) = caplog.records
+    assert record.levelno == logging.WARNING
+    assert "/simple/foo/" in record.getMessage()
+    assert record.exc_info is None
+
+
+def test_internal_error_logged(
+    proxy_url: str,
+    cache: PullThroughCache,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    def broken(_project: str) -> None:
+        raise TypeError("bug")
+
+    monkeypatch.setattr(cache, "get_project", broken)
+    with caplog.at_level(logging.WARNING, logger="pypi_simple.proxy"):
+        r = requests.get(f"{proxy_url}/simple/foo/")
+    assert r.status_code == 500
+    (record,) = caplog.records
+    assert record.levelno == logging.ERROR
+    assert record.exc_info is not None
+    assert record.exc_info[0] is TypeError
+
+
+def test_coalesce_concurrent_misses(proxy_url: str, adapter: CountingAdapter) -> None:
+    with ThreadPoolExecutor(8) as pool:
+        codes = list(
+            pool.map(
+                lambda _: requests.get(f"{proxy_url}/simple/foo/").status_code,
+                range(16),
+            )
+        )
+    assert codes == [200] * 16
+    assert adapter.counts["simple/foo/"] == 1
+
+
+def test_ttl_and_stale_on_error(upstream: Path, adapter: CountingAdapter) -> None:
+    now = [0.0]
+    client = PyPISimple(upstream / "simple")
+    client.s.mount("file://", adapter)
+    cache = PullThroughCache(client, upstream / "cache", ttl=60, clock=lambda: now[0])
+    page = cache.get_project("foo")
+    assert cache.get_project("foo") is page
+    now[0] = 61
+    page2 = cache.get_project("foo")
+    assert page2 is not page
+    assert adapter.counts["simple/foo/"] == 2
+    # A failed refresh serves the stale page:
+    (upstream / "simple" / "foo" / "index.json").write_text("{")
+    now[0] = 200
+    assert cache.get_project("foo") is page2
+    client.s.close()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+import threading
+import pytest
+from pytest_mock import MockerFixture
+import responses
+from pypi_simple import PyPISimple, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, delay: float) -> None:
+        self.now += delay
+
+
+@pytest.fixture
+def clock(mocker: MockerFixture) -> FakeClock:
+    c = FakeClock()
+    mocker.patch("pypi_simple.ratelimit.time.monotonic", c.monotonic)
+    mocker.patch("pypi_simple.ratelimit.time.sleep", c.sleep)
+    return c
+
+
+def test_token_bucket(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=2, capacity=4)
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0, 0]
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+    clock.now += 1.0
+    assert bucket.reserve() == 0.5
+    clock.now += 100
+    assert bucket.reserve(3) == 0
+    assert bucket.reserve(10) == 4.5
+
+
+def test_token_bucket_bad_rate() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_rate_limiter_requests(clock: FakeClock) -> None:
+    limiter = RateLimiter(requests_per_second=10, request_burst=1)
+    start = clock.now
+    for _ in range(21):
+        limiter.acquire_request("https://test.nil/simple/foo/")
+    assert clock.now - start == pytest.approx(2.0)
+    assert limiter.waited == pytest.approx(2.0)
+
+
+def test_rate_limiter_per_host(clock: FakeClock) -> None:
+    limiter = RateLimiter(requests_per_second=1)
+    start = clock.now
+    limiter.acquire_request("https://one.nil/simple/")
+    limiter.acquire_request("https://two.nil/simple/")
+    assert clock.now == start
+    limiter.acquire_request("https://one.nil/simple/foo/")
+    assert clock.now == start + 1
+
+
+def test_rate_limiter_shared_hosts(clock: FakeClock) -> None:
+    limiter = RateLimiter(requests_per_second=1, per_host=False)
+    start = clock.now
+    limiter.acquire_request("https://one.nil/simple/")
+    limiter.acquire_request("https://two.nil/simple/")
+    assert clock.now == start + 1
+
+
+def test_rate_limiter_bytes(clock: FakeClock) -> None:
+    limiter = RateLimiter(bytes_per_second=1000)
+    start = clock.now
+    limiter.consume_bytes("https://test.nil/x", 1000)
+    assert clock.now == start
+    limiter.consume_bytes("https://test.nil/x", 5000)
+    assert clock.now == start + 5
+
+
+@pytest.mark.usefixtures("clock")
+def test_rate_limiter_threads() -> None:
+    limiter = RateLimiter(requests_per_second=100, request_burst=1)
+    lock = threading.Lock()
+
+    def worker() -> None:
+        for _ in range(50):
+            with lock:
+                limiter.acquire_request("https://test.nil/")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert limiter.waited == pytest.approx(1.99)
+
+
+@responses.activate
+def test_client_rate_limiter(clock: FakeClock) -> None:
+    body = '<a href="../files/project-0.1.0.tar.gz">project-0.1.0.tar.gz</a>'
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/project/",
+        body=body,
+        content_type="text/html",
+    )
+    limiter = RateLimiter(requests_per_second=2, request_burst=1, bytes_per_second=10)
+    start = clock.now
+    with PyPISimple("https://test.nil/simple/", rate_limiter=limiter) as simple:
+        simple.get_project_page("project")
+        simple.get_project_page("project")
+    # The second request waits for the debt from the first body to be paid off
+    # (the byte bucket starts out holding 10 bytes' worth of tokens):
+    assert clock.now - start == pytest.approx((2 * len(body) - 10) / 10)
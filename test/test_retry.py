@@ -0,0 +1,236 @@
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+import pytest
+from pytest_mock import MockerFixture
+import requests
+import responses
+from pypi_simple import DistributionPackage, PyPISimple, RetryEvent, RetryPolicy
+
+DATA_DIR = Path(__file__).with_name("data")
+
+PAGE = '<a href="../files/project-0.1.0.tar.gz">project-0.1.0.tar.gz</a>'
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(mocker: MockerFixture) -> None:
+    mocker.patch("pypi_simple.retry.time.sleep")
+
+
+def test_backoff_bounds() -> None:
+    policy = RetryPolicy(backoff_base=1, backoff_max=5)
+    for attempt, limit in [(1, 1), (2, 2), (3, 4), (4, 5), (10, 5)]:
+        for _ in range(20):
+            assert 0 <= policy.backoff(attempt) <= limit
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("120", 120.0),
+        (" 3 ", 3.0),
+        ("soon", None),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ],
+)
+def test_retry_after(value: str, expected: float | None) -> None:
+    r = requests.Response()
+    r.headers["Retry-After"] = value
+    assert RetryPolicy().retry_after(r) == expected
+
+
+def test_retry_after_future_date() -> None:
+    r = requests.Response()
+    when = datetime.now(timezone.utc) + timedelta(seconds=60)
+    r.headers["Retry-After"] = format_datetime(when, usegmt=True)
+    delay = RetryPolicy().retry_after(r)
+    assert delay is not None
+    assert 55 < delay <= 60
+    assert RetryPolicy(respect_retry_after=False).retry_after(r) is None
+
+
+@responses.activate
+def test_retry_after_too_long(mocker: MockerFixture) -> None:
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/project/",
+        status=503,
+        headers={"Retry-After": "86400"},
+    )
+    sleep = mocker.patch("pypi_simple.retry.time.sleep")
+    with PyPISimple("https://test.nil/simple/", retry=RetryPolicy()) as simple:
+        with pytest.raises(requests.HTTPError):
+            simple.get_project_page("project")
+        assert simple.stats.retries == 0
+    sleep.assert_not_called()
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_retry_statuses(mocker: MockerFixture) -> None:
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/project/",
+        status=503,
+        headers={"Retry-After": "2"},
+    )
+    responses.add(responses.GET, "https://test.nil/simple/project/", status=429)
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/project/",
+        body=PAGE,
+        content_type="text/html",
+    )
+    events: list[RetryEvent] = []
+    sleep = mocker.patch("pypi_simple.retry.time.sleep")
+    with PyPISimple(
+        "https://test.nil/simple/",
+        retry=RetryPolicy(backoff_base=1, on_retry=events.append),
+    ) as simple:
+        page = simple.get_project_page("project")
+        assert [p.filename for p in page.packages] == ["project-0.1.0.tar.gz"]
+        assert simple.stats.retries == 2
+    assert [(e.attempt, e.status_code, e.error) for e in events] == [
+        (1, 503, None),
+        (2, 429, None),
+    ]
+    assert 2 <= events[0].delay <= 2.5
+    assert 0 <= events[1].delay <= 2
+    assert [c.args[0] for c in sleep.call_args_list] == [e.delay for e in events]
+
+
+@responses.activate
+def test_retry_exhausted() -> None:
+    responses.add(responses.GET, "https://test.nil/simple/project/", status=502)
+    with PyPISimple(
+        "https://test.nil/simple/", retry=RetryPolicy(max_attempts=3)
+    ) as simple:
+        with pytest.raises(requests.HTTPError) as excinfo:
+            simple.get_project_page("project")
+        assert excinfo.value.response is not None
+        assert excinfo.value.response.status_code == 502
+        assert simple.stats.retries == 2
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_no_retry_by_default() -> None:
+    responses.add(responses.GET, "https://test.nil/simple/project/", status=503)
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(requests.HTTPError):
+            simple.get_project_page("project")
+        assert simple.stats.retries == 0
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_no_retry_on_404() -> None:
+    responses.add(responses.GET, "https://test.nil/simple/project/", status=404)
+    with PyPISimple("https://test.nil/simple/", retry=RetryPolicy()) as simple:
+        with pytest.raises(Exception, match="No details about project"):
+            simple.get_project_page("project")
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_retry_deadline() -> None:
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/project/",
+        status=503,
+        headers={"Retry-After": "60"},
+    )
+    with PyPISimple(
+        "https://test.nil/simple/", retry=RetryPolicy(deadline=30)
+    ) as simple:
+        with pytest.raises(requests.HTTPError):
+            simple.get_project_page("project")
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_retry_connection_error() -> None:
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/project/",
+        body=requests.ConnectionError("Connection refused"),
+    )
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/project/",
+        body=PAGE,
+        content_type="text/html",
+    )
+    with PyPISimple("https://test.nil/simple/", retry=RetryPolicy()) as simple:
+        page = simple.get_project_page("project")
+        assert [p.filename for p in page.packages] == ["project-0.1.0.tar.gz"]
+        assert simple.stats.retries == 1
+
+
+def test_stream_project_names_restart(mocker: MockerFixture) -> None:
+    body = (DATA_DIR / "simple01.html").read_bytes()
+    calls = 0
+
+    def iter_content(
+        self: requests.Response, chunk_size: int = 1  # noqa: U100
+    ) -> object:
+        nonlocal calls
+        calls += 1
+        yield body[:10]
+        if calls == 1:
+            raise requests.exceptions.ChunkedEncodingError("Connection broken")
+        yield body[10:]
+
+    mocker.patch.object(requests.Response, "iter_content", iter_content)
+    with responses.RequestsMock() as rsps:
+        rsps.add(
+            responses.GET,
+            "https://test.nil/simple/",
+            body=body,
+            content_type="text/html",
+        )
+        with PyPISimple("https://test.nil/simple/", retry=RetryPolicy()) as simple:
+            names = list(simple.stream_project_names())
+            assert simple.stats.retries == 1
+    assert len(names) == 20
+    assert calls == 2
+
+
+@responses.activate
+def test_download_restart(mocker: MockerFixture, tmp_path: Path) -> None:
+    blob = (DATA_DIR / "click_loglevel-0.4.0.post1-py3-none-any.whl").read_bytes()
+    responses.add(
+        responses.GET,
+        "https://test.nil/simple/packages/click_loglevel-0.4.0.post1-py3-none-any.whl",
+        body=blob,
+    )
+    real_iter_content = requests.Response.iter_content
+    calls = 0
+
+    def iter_content(self: requests.Response, chunk_size: int = 1) -> object:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            yield blob[:100]
+            raise requests.exceptions.ChunkedEncodingError("Connection broken")
+        yield from real_iter_content(self, chunk_size)
+
+    mocker.patch.object(requests.Response, "iter_content", iter_content)
+    pkg = DistributionPackage(
+        filename="click_loglevel-0.4.0.post1-py3-none-any.whl",
+        url="https://test.nil/simple/packages/click_loglevel-0.4.0.post1-py3-none-any.whl",
+        project="click-loglevel",
+        version="0.4.0.post1",
+        package_type="wheel",
+        digests={
+            "sha256": "f3449b5d28d6921c38f53fcee1d1f4b2aafad7f2e8d6c4cd4e1b8a2dc9e0e0fa"
+        },
+        requires_python=None,
+        has_sig=None,
+    )
+    dest = tmp_path / pkg.filename
+    with PyPISimple("https://test.nil/simple/", retry=RetryPolicy()) as simple:
+        simple.download_package(pkg, dest, verify=False)
+    assert dest.read_bytes() == blob
+    assert calls == 2
@@ -0,0 +1,154 @@
+from __future__ import annotations
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import pytest
+import requests
+import responses
+from pypi_simple import (
+    ACCEPT_HTML_ONLY,
+    ACCEPT_JSON_ONLY,
+    NoSuchProjectError,
+    PyPISimple,
+    SingleFlight,
+)
+
+THREADS = 6
+
+
+def wait_for(cond: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not cond():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.001)
+
+
+def test_single_flight() -> None:
+    flights = SingleFlight()
+    calls = 0
+    release = threading.Event()
+
+    def work() -> list[int]:
+        nonlocal calls
+        calls += 1
+        release.wait()
+        return [42]
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        futures = [pool.submit(flights.do, "key", work) for _ in range(THREADS)]
+        wait_for(lambda: flights.shared == THREADS - 1)
+        release.set()
+        results = [f.result() for f in futures]
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+    assert flights.calls == {}
+    # Keys are forgotten once the call finishes:
+    assert flights.do("key", lambda: [23]) == [23]
+
+
+def test_single_flight_error() -> None:
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def work() -> None:
+        release.wait()
+        raise ValueError("Nope")
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        futures = [pool.submit(flights.do, "key", work) for _ in range(THREADS)]
+        wait_for(lambda: flights.shared == THREADS - 1)
+        release.set()
+        for f in futures:
+            with pytest.raises(ValueError, match="Nope"):
+                f.result()
+    assert flights.calls == {}
+
+
+def add_gated_page(release: threading.Event, status: int = 200) -> None:
+    def callback(
+        _req: requests.PreparedRequest,
+    ) -> tuple[int, dict[str, str], str]:
+        release.wait()
+        return (
+            status,
+            {"Content-Type": "text/html"},
+            '<a href="../../files/foo-1.0.tar.gz">foo-1.0.tar.gz</a>',
+        )
+
+    responses.add_callback(
+        responses.GET, "https://test.nil/simple/foo/", callback=callback
+    )
+
+
+@responses.activate
+def test_coalesce_project_page() -> None:
+    release = threading.Event()
+    add_gated_page(release)
+    with PyPISimple("https://test.nil/simple/", coalesce=True) as client:
+        assert client.flights is not None
+        flights = client.flights
+        with ThreadPoolExecutor(THREADS) as pool:
+            futures = [
+                pool.submit(client.get_project_page, "foo") for _ in range(THREADS)
+            ]
+            wait_for(lambda: flights.shared == THREADS - 1)
+            release.set()
+            pages = [f.result() for f in futures]
+    assert len(responses.calls) == 1
+    assert all(p is pages[0] for p in pages)
+    assert [p.filename for p in pages[0].packages] == ["foo-1.0.tar.gz"]
+
+
+@responses.activate
+def test_coalesce_not_found() -> None:
+    release = threading.Event()
+    add_gated_page(release, status=404)
+    with PyPISimple("https://test.nil/simple/", coalesce=True) as client:
+        assert client.flights is not None
+        flights = client.flights
+        with ThreadPoolExecutor(THREADS) as pool:
+            futures = [
+                pool.submit(client.get_project_page, "foo") for _ in range(THREADS)
+            ]
+            wait_for(lambda: flights.shared == THREADS - 1)
+            release.set()
+            for f in futures:
+                with pytest.raises(NoSuchProjectError):
+                    f.result()
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_coalesce_distinguishes_accept() -> None:
+    release = threading.Event()
+    add_gated_page(release)
+    with PyPISimple("https://test.nil/simple/", coalesce=True) as client:
+        assert client.flights is not None
+        flights = client.flights
+        with ThreadPoolExecutor(2) as pool:
+            futures = [
+                pool.submit(client.get_project_page, "foo", accept=accept)
+                for accept in [ACCEPT_HTML_ONLY, ACCEPT_JSON_ONLY]
+            ]
+            wait_for(lambda: len(flights.calls) == 2)
+            release.set()
+            page1, page2 = [f.result() for f in futures]
+    assert page1 is not page2
+    assert flights.shared == 0
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_no_coalesce_by_default() -> None:
+    release = threading.Event()
+    release.set()
+    add_gated_page(release)
+    with PyPISimple("https://test.nil/simple/") as client:
+        assert client.flights is None
+        with ThreadPoolExecutor(THREADS) as pool:
+            for f in [
+                pool.submit(client.get_project_page, "foo") for _ in range(THREADS)
+            ]:
+                f.result()
+    assert len(responses.calls) == THREADS
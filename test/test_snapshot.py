@@ -0,0 +1,231 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+import io
+import json
+from pathlib import Path
+import pytest
+import responses
+from pypi_simple import (
+    DistributionPackage,
+    IndexPage,
+    NoSuchProjectError,
+    ProjectPage,
+    ProjectStatus,
+    PyPISimple,
+    SnapshotError,
+    UnsupportedContentTypeError,
+)
+from pypi_simple.snapshot import (
+    SNAPSHOT_VERSION,
+    dump,
+    dumps,
+    load,
+    loads,
+    parse_project_page,
+)
+
+DATA_DIR = Path(__file__).with_name("data")
+
+
+def pkg(**kwargs: object) -> DistributionPackage:
+    fields: dict = {
+        "filename": "foo-1.0.tar.gz",
+        "url": "https://test.nil/files/foo-1.0.tar.gz",
+        "project": "foo",
+        "version": "1.0",
+        "package_type": "sdist",
+        "digests": {"sha256": "0" * 64},
+        "requires_python": None,
+        "has_sig": None,
+    }
+    fields.update(kwargs)
+    return DistributionPackage(**fields)
+
+
+@pytest.mark.parametrize(
+    "filename", ["argset.json", "argset-700.json", "argset-708.json", "yanked.json"]
+)
+def test_roundtrip_json_pages(filename: str) -> None:
+    with (DATA_DIR / filename).open() as fp:
+        page = ProjectPage.from_json_data(
+            json.load(fp), base_url="https://test.nil/simple/argset/"
+        )
+    assert loads(dumps(page)) == page
+
+
+@pytest.mark.parametrize("filename", ["qypi.html", "qypi-708.html", "devpi_devpi.html"])
+def test_roundtrip_html_pages(filename: str) -> None:
+    html = (DATA_DIR / filename).read_text()
+    page = ProjectPage.from_html("qypi", html, "https://test.nil/simple/qypi/")
+    assert loads(dumps(page)) == page
+
+
+def test_roundtrip_edge_cases() -> None:
+    page = ProjectPage(
+        project="foo",
+        packages=[
+            pkg(
+                has_sig=False,
+                is_yanked=True,
+                yanked_reason="",
+                has_metadata=True,
+                metadata_digests={},
+                size=0,
+                upload_time=datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+                provenance_url="https://test.nil/files/foo-1.0.tar.gz.provenance",
+            ),
+            pkg(
+                filename="foo-1.0-py3-none-any.whl",
+                url="https://test.nil/files/foo-1.0-py3-none-any.whl",
+                package_type="wheel",
+                digests={},
+                requires_python=">=3.10",
+                has_sig=True,
+                has_metadata=False,
+                metadata_digests={"sha256": "1" * 64, "md5": "2" * 32},
+                size=1 << 40,
+                upload_time=datetime(
+                    1969, 12, 31, 23, 0, tzinfo=timezone(timedelta(hours=-5))
+                ),
+            ),
+            pkg(
+                filename="\udcff-weird.zip",
+                project=None,
+                version=None,
+                package_type=None,
+                upload_time=datetime(2024, 1, 2, 3, 4, 5),
+            ),
+        ],
+        repository_version="1.4",
+        last_serial="12345",
+        versions=["1.0", "2.0 ☃"],
+        tracks=["https://other.nil/simple/foo/"],
+        alternate_locations=["https://alt.nil/simple/foo/"],
+        status=ProjectStatus.QUARANTINED,
+        status_reason="Malware",
+    )
+    page2 = loads(dumps(page))
+    assert page2 == page
+    assert isinstance(page2, ProjectPage)
+    for a, b in zip(page.packages, page2.packages):
+        assert a.upload_time == b.upload_time
+        if a.upload_time is not None:
+            assert a.upload_time.utcoffset() == b.upload_time.utcoffset()  # type: ignore[union-attr]
+
+
+def test_roundtrip_empty_project() -> None:
+    page = ProjectPage(
+        project="foo", packages=[], repository_version=None, last_serial=None
+    )
+    assert loads(dumps(page)) == page
+
+
+def test_roundtrip_index_page() -> None:
+    page = IndexPage(
+        projects=["foo", "Bar", "baz_quux", "foo"],
+        repository_version="1.0",
+        last_serial=None,
+    )
+    fp = io.BytesIO()
+    dump(page, fp)
+    fp.seek(0)
+    assert load(fp) == page
+
+
+def test_strings_are_interned() -> None:
+    page = ProjectPage(
+        project="foo",
+        packages=[pkg(filename=f"foo-{i}.tar.gz") for i in range(100)],
+        repository_version=None,
+        last_serial=None,
+    )
+    data = dumps(page)
+    # The URL and digest are stored only once:
+    assert data.count(b"https://test.nil/files/foo-1.0.tar.gz") == 1
+    assert data.count(b"0" * 64) == 1
+
+
+def test_bad_magic() -> None:
+    with pytest.raises(SnapshotError, match="Not a pypi-simple snapshot"):
+        loads(b"PK\x03\x04" + b"\0" * 20)
+
+
+def test_bad_version() -> None:
+    data = bytearray(dumps(IndexPage([], None, None)))
+    data[4] = SNAPSHOT_VERSION + 1
+    with pytest.raises(SnapshotError, match="Unsupported snapshot version"):
+        loads(data)
+
+
+def test_truncated() -> None:
+    data = dumps(ProjectPage("foo", [pkg()], None, None))
+    for n in [0, 5, 20, len(data) - 1]:
+        with pytest.raises(SnapshotError):
+            loads(data[:n])
+
+
+def test_bad_type() -> None:
+    with pytest.raises(TypeError):
+        dumps(pkg())  # type: ignore[arg-type]
+
+
+def test_parse_project_page_html() -> None:
+    body = (DATA_DIR / "qypi.html").read_bytes()
+    url = "https://test.nil/simple/qypi/"
+    page = loads(parse_project_page("qypi", body, "text/html", url, "42"))
+    expected = ProjectPage.from_html("qypi", body, base_url=url)
+    expected.last_serial = "42"
+    assert page == expected
+
+
+def test_parse_project_page_json() -> None:
+    body = (DATA_DIR / "argset-708.json").read_bytes()
+    url = "https://test.nil/simple/argset/"
+    page = loads(
+        parse_project_page(
+            "argset", body, "application/vnd.pypi.simple.v1+json", url, "42"
+        )
+    )
+    assert page == ProjectPage.from_json_data(json.loads(body), base_url=url)
+    assert isinstance(page, ProjectPage)
+    assert page.last_serial == "10562871"
+
+
+def test_parse_project_page_bad_content_type() -> None:
+    with pytest.raises(UnsupportedContentTypeError):
+        parse_project_page("foo", b"{}", "application/json", "https://test.nil/")
+
+
+@responses.activate
+def test_get_project_pages_parse_executor() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/qypi/",
+        body=(DATA_DIR / "qypi.html").read_text(),
+        content_type="text/html",
+        headers={"X-PyPI-Last-Serial": "12345"},
+    )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/argset/",
+        body=(DATA_DIR / "argset-708.json").read_text(),
+        content_type="application/vnd.pypi.simple.v1+json",
+    )
+    responses.add(
+        method=responses.GET, url="https://test.nil/simple/nexists/", status=404
+    )
+    projects = ["qypi", "argset", "nexists"]
+    with PyPISimple("https://test.nil/simple/") as simple:
+        expected = {r.item: r for r in simple.get_project_pages(projects)}
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = {
+                r.item: r
+                for r in simple.get_project_pages(projects, parse_executor=pool)
+            }
+            snapshot = simple.get_project_snapshot("qypi", parse_executor=pool)
+    assert results["qypi"].unwrap() == expected["qypi"].unwrap()
+    assert results["qypi"].unwrap().last_serial == "12345"
+    assert results["argset"].unwrap() == expected["argset"].unwrap()
+    assert isinstance(results["nexists"].error, NoSuchProjectError)
+    assert loads(snapshot) == expected["qypi"].unwrap()
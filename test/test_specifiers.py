@@ -0,0 +1,85 @@
+from __future__ import annotations
+from packaging.version import Version
+from pypi_simple import (
+    DistributionPackage,
+    ProjectPage,
+    SpecifierCache,
+    filter_requires_python,
+)
+
+
+def pkg(filename: str, requires_python: str | None) -> DistributionPackage:
+    return DistributionPackage(
+        filename=filename,
+        url=f"https://test.nil/files/{filename}",
+        project="foo",
+        version=None,
+        package_type=None,
+        digests={},
+        requires_python=requires_python,
+        has_sig=None,
+    )
+
+
+def make_page(n: int) -> ProjectPage:
+    specs = [">=3.8", ">=3.10", "<3", None, "", "not a specifier", ">=3.8"]
+    return ProjectPage(
+        project="foo",
+        packages=[pkg(f"foo-{i}.tar.gz", specs[i % len(specs)]) for i in range(n)],
+        repository_version=None,
+        last_serial=None,
+    )
+
+
+def test_allows() -> None:
+    cache = SpecifierCache()
+    assert cache.allows(None, "3.9")
+    assert cache.allows("  ", "3.9")
+    assert cache.allows(">=3.8", "3.9")
+    assert not cache.allows(">=3.10", "3.9")
+    assert cache.allows(">=3.10", "3.13.0rc1")
+    assert cache.allows("not a specifier", "3.9")
+    assert cache.parse("not a specifier") is None
+
+
+def test_filter_page() -> None:
+    page = make_page(7)
+    cache = SpecifierCache()
+    assert [p.requires_python for p in page.filter_requires_python("3.9", cache)] == [
+        ">=3.8",
+        None,
+        "",
+        "not a specifier",
+        ">=3.8",
+    ]
+    assert [
+        p.requires_python for p in page.filter_requires_python(Version("2.7"), cache)
+    ] == ["<3", None, "", "not a specifier"]
+    assert len(page.filter_requires_python("3.12")) == 6
+
+
+def test_filter_many_pages_shares_cache() -> None:
+    pages = [make_page(700) for _ in range(10)]
+    cache = SpecifierCache()
+    results = list(filter_requires_python(pages, ["3.9", "3.12", "2.7"], cache))
+    assert [page for page, _ in results] == pages
+    for _, by_version in results:
+        assert list(by_version) == [Version("3.9"), Version("3.12"), Version("2.7")]
+        assert len(by_version[Version("3.9")]) == 500
+        assert len(by_version[Version("3.12")]) == 600
+        assert len(by_version[Version("2.7")]) == 400
+    # Each distinct specifier is parsed once and evaluated once per version:
+    assert len(cache.specifiers) == 4
+    assert len(cache.results) == 4 * 3
+
+
+def test_cache_bounded() -> None:
+    cache = SpecifierCache(maxsize=3)
+    for minor in range(10):
+        assert cache.allows(f">=3.{minor}", "3.5") == (minor <= 5)
+        assert len(cache.specifiers) <= 3
+        assert len(cache.results) <= 3
+    unbounded = SpecifierCache(maxsize=None)
+    for minor in range(10):
+        unbounded.allows(f">=3.{minor}", "3.5")
+    assert len(unbounded.specifiers) == 10
@@ -0,0 +1,205 @@
+from __future__ import annotations
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+import pytest
+import responses
+from pypi_simple import ACCEPT_HTML_ONLY, PyPISimple
+from pypi_simple.sync import CHECKPOINT_FILE, LocalMirror
+from pypi_simple.util import normalize
+
+JSON_TYPE = "application/vnd.pypi.simple.v1+json"
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def add_project(name: str, serial: int, files: dict[str, bytes], **extra: Any) -> None:
+    entries = []
+    for filename, contents in files.items():
+        url = f"https://test.nil/files/{filename}"
+        responses.add(responses.GET, url, body=contents)
+        entries.append(
+            {"filename": filename, "url": url, "hashes": {"sha256": sha256(contents)}}
+            | extra
+        )
+    responses.add(
+        responses.GET,
+        f"https://test.nil/simple/{name}/",
+        json={
+            "meta": {"api-version": "1.1", "_last-serial": serial},
+            "name": name,
+            "files": entries,
+        },
+        content_type=JSON_TYPE,
+    )
+
+
+def fetched(url: str) -> int:
+    return sum(1 for c in responses.calls if c.request.url == url)
+
+
+@pytest.fixture
+def client() -> PyPISimple:
+    return PyPISimple("https://test.nil/simple/")
+
+
+@responses.activate
+def test_sync_and_read_back(client: PyPISimple, tmp_path: Path) -> None:
+    add_project("foo", 10, {"foo-1.0.tar.gz": b"foo 1.0", "foo-2.0.tar.gz": b"2.0"})
+    add_project(
+        "bar",
+        20,
+        {"bar-1.0-py3-none-any.whl": b"bar wheel"},
+        **{"core-metadata": {"sha256": sha256(b"Name: bar\n")}},
+    )
+    responses.add(
+        responses.GET,
+        "https://test.nil/files/bar-1.0-py3-none-any.whl.metadata",
+        body=b"Name: bar\n",
+    )
+    mirror = LocalMirror(client, tmp_path, concurrency=2)
+    report = mirror.sync(["Foo", "bar"])
+    assert sorted(report.updated) == ["bar", "foo"]
+    assert report.files_downloaded == 4
+    assert not report.failed
+    assert mirror.pending == {}
+    assert mirror.projects["foo"].serial == 10
+    assert not list(tmp_path.rglob("*.tmp"))
+    with PyPISimple(tmp_path / "simple") as local:
+        assert local.get_index_page().projects == ["bar", "foo"]
+        page = local.get_project_page("foo")
+        assert page.last_serial == "10"
+        assert [p.filename for p in page.packages] == [
+            "foo-1.0.tar.gz",
+            "foo-2.0.tar.gz",
+        ]
+        assert page.packages[0].size == 7
+        local.download_package(page.packages[0], tmp_path / "out" / "foo.tar.gz")
+        assert (tmp_path / "out" / "foo.tar.gz").read_bytes() == b"foo 1.0"
+        html_page = local.get_project_page("bar", accept=ACCEPT_HTML_ONLY)
+        (pkg,) = html_page.packages
+        assert pkg.has_metadata
+        assert local.get_package_metadata(pkg).startswith("Name: bar")
+        assert local.get_package_metadata_bytes(
+            local.get_project_page("bar").packages[0]
+        ) == (b"Name: bar\n")
+
+
+@responses.activate
+def test_unchanged_serial_skips(client: PyPISimple, tmp_path: Path) -> None:
+    add_project("foo", 10, {"foo-1.0.tar.gz": b"foo 1.0"})
+    LocalMirror(client, tmp_path).sync(["foo"])
+    mirror = LocalMirror(client, tmp_path)
+    report = mirror.sync(["foo"])
+    assert report.unchanged == ["foo"]
+    assert report.files_downloaded == 0
+    assert fetched("https://test.nil/simple/foo/") == 2
+    assert fetched("https://test.nil/files/foo-1.0.tar.gz") == 1
+    # With a known serial, the page is not even fetched:
+    report = mirror.sync([("foo", 10)])
+    assert report.unchanged == ["foo"]
+    assert fetched("https://test.nil/simple/foo/") == 2
+
+
+@responses.activate
+def test_changed_project(client: PyPISimple, tmp_path: Path) -> None:
+    add_project("foo", 10, {"foo-1.0.tar.gz": b"foo 1.0", "foo-2.0.tar.gz": b"2.0"})
+    mirror = LocalMirror(client, tmp_path)
+    mirror.sync(["foo"])
+    responses.reset()
+    add_project("foo", 11, {"foo-2.0.tar.gz": b"2.0", "foo-3.0.tar.gz": b"3.0"})
+    report = mirror.sync([("foo", 11)])
+    assert report.updated == ["foo"]
+    assert report.files_downloaded == 1
+    assert fetched("https://test.nil/files/foo-2.0.tar.gz") == 0
+    pkgdir = tmp_path / "packages" / "foo"
+    assert sorted(p.name for p in pkgdir.iterdir()) == [
+        "foo-2.0.tar.gz",
+        "foo-3.0.tar.gz",
+    ]
+    assert mirror.projects["foo"].serial == 11
+
+
+@responses.activate
+def test_removed_project(client: PyPISimple, tmp_path: Path) -> None:
+    add_project("foo", 10, {"foo-1.0.tar.gz": b"foo 1.0"})
+    add_project("bar", 11, {"bar-1.0.tar.gz": b"bar 1.0"})
+    mirror = LocalMirror(client, tmp_path)
+    mirror.sync(["foo", "bar"])
+    responses.replace(responses.GET, "https://test.nil/simple/foo/", status=404)
+    report = mirror.sync(["foo"])
+    assert report.removed == ["foo"]
+    assert not (tmp_path / "simple" / "foo").exists()
+    assert not (tmp_path / "packages" / "foo").exists()
+    index = json.loads((tmp_path / "simple" / "index.json").read_text())
+    assert index["projects"] == [{"name": "bar", "_last-serial": 11}]
+
+
+@responses.activate
+def test_failure_and_resume(client: PyPISimple, tmp_path: Path) -> None:
+    add_project("foo", 10, {"foo-1.0.tar.gz": b"foo 1.0"})
+    add_project("bar", 11, {"bar-1.0.tar.gz": b"bar 1.0"})
+    responses.replace(
+        responses.GET, "https://test.nil/files/bar-1.0.tar.gz", body=b"corrupt"
+    )
+    report = LocalMirror(client, tmp_path).sync(["foo", "bar"])
+    assert report.updated == ["foo"]
+    assert list(report.failed) == ["bar"]
+    assert not list((tmp_path / "packages").rglob("*bar-1.0*"))
+    checkpoint = json.loads((tmp_path / CHECKPOINT_FILE).read_text())
+    assert checkpoint["pending"] == [["bar", None]]
+    responses.replace(
+        responses.GET, "https://test.nil/files/bar-1.0.tar.gz", body=b"bar 1.0"
+    )
+    mirror = LocalMirror(client, tmp_path)
+    assert mirror.pending == {"bar": None}
+    report = mirror.resume()
+    assert report.updated == ["bar"]
+    assert mirror.pending == {}
+    assert fetched("https://test.nil/simple/foo/") == 1
+    assert (tmp_path / "packages" / "bar" / "bar-1.0.tar.gz").read_bytes() == (
+        b"bar 1.0"
+    )
+
+
+@responses.activate
+def test_unsafe_filename(client: PyPISimple, tmp_path: Path) -> None:
+    add_project("foo", 10, {"..evil.tar.gz": b"evil"})
+    report = LocalMirror(client, tmp_path).sync(["foo"])
+    assert isinstance(report.failed["foo"], ValueError)
+    assert not (tmp_path / "packages").exists()
+
+
+@responses.activate
+def test_unsafe_project_name(client: PyPISimple, tmp_path: Path) -> None:
+    victim = tmp_path / "victim"
+    victim.mkdir()
+    (victim / "precious.txt").write_text("precious")
+    add_project("foo", 10, {"foo-1.0.tar.gz": b"foo 1.0"})
+    mirror = LocalMirror(client, tmp_path / "mirror")
+    unsafe = [str(victim), "../victim", "a/../../victim"]
+    report = mirror.sync(["foo", *unsafe])
+    assert report.updated == ["foo"]
+    assert sorted(report.failed) == sorted(normalize(n) for n in unsafe)
+    assert all(isinstance(e, ValueError) for e in report.failed.values())
+    assert mirror.pending == {}
+    assert (victim / "precious.txt").read_text() == "precious"
+    assert len(responses.calls) == 2
+    with pytest.raises(ValueError):
+        mirror.remove(str(victim))
+    assert victim.exists()
+
+
+def test_check_contained(client: PyPISimple, tmp_path: Path) -> None:
+    mirror = LocalMirror(client, tmp_path / "mirror")
+    mirror.check_contained(tmp_path / "mirror" / "simple" / "foo")
+    for path in [
+        tmp_path / "mirror",
+        tmp_path / "victim",
+        tmp_path / "mirror" / "simple" / ".." / "..",
+    ]:
+        with pytest.raises(ValueError):
+            mirror.check_contained(path)
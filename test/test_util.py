@@ -1,6 +1,9 @@
+from pathlib import Path
+import subprocess
+import sys
 import pytest
 from pypi_simple import UnexpectedRepoVersionWarning
-from pypi_simple.util import check_repo_version
+from pypi_simple.util import atomic_open, atomic_write, check_repo_version
 
 
 def test_check_repo_version_greater_minor() -> None:
@@ -11,3 +14,29 @@ def test_check_repo_version_greater_minor() -> None:
         "Repository's version (1.3) has greater minor component than supported"
         " version (1.2)"
     )
+
+
+def test_atomic_write(tmp_path: Path) -> None:
+    path = tmp_path / "sub" / "file.txt"
+    atomic_write(path, b"one")
+    assert path.read_bytes() == b"one"
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as fp:
+            fp.write("two")
+            raise RuntimeError("interrupted")
+    assert path.read_bytes() == b"one"
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_crawl_does_not_import_sync() -> None:
+    r = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, pypi_simple.crawl; print('pypi_simple.sync' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert r.stdout.strip() == "False"
@@ -0,0 +1,126 @@
+from __future__ import annotations
+from dataclasses import replace
+from packaging.version import Version
+from pypi_simple import (
+    DistributionPackage,
+    ProjectPage,
+    UnparsableFilenameError,
+    VersionIndex,
+    parse_filename,
+)
+
+
+def pkg(filename: str, yanked: bool = False) -> DistributionPackage:
+    project: str | None
+    version: str | None
+    package_type: str | None
+    try:
+        project, version, package_type = parse_filename(filename)
+    except UnparsableFilenameError:
+        project = version = package_type = None
+    return DistributionPackage(
+        filename=filename,
+        url=f"https://test.nil/files/{filename}",
+        project=project,
+        version=version,
+        package_type=package_type,
+        digests={},
+        requires_python=None,
+        has_sig=None,
+        is_yanked=yanked,
+    )
+
+
+def make_page(versions: list[str] | None = None) -> ProjectPage:
+    return ProjectPage(
+        project="foo",
+        packages=[
+            pkg("foo-1.0.tar.gz"),
+            pkg("foo-1.0-py3-none-any.whl"),
+            pkg("foo-1.10.tar.gz"),
+            pkg("foo-1.9.tar.gz"),
+            pkg("foo-2.0a1.tar.gz"),
+            pkg("foo-1.11.tar.gz", yanked=True),
+            pkg("foo-1.11-py3-none-any.whl", yanked=True),
+            pkg("foo-1.12.tar.gz", yanked=True),
+            pkg("foo-1.12-py3-none-any.whl"),
+            pkg("foo-bar.tar.gz"),
+            pkg("README.txt"),
+        ],
+        repository_version=None,
+        last_serial=None,
+        versions=versions,
+    )
+
+
+def test_version_index() -> None:
+    page = make_page()
+    index = page.version_index
+    assert index is page.version_index
+    assert isinstance(index, VersionIndex)
+    assert list(index) == [
+        Version(v) for v in ["1.0", "1.9", "1.10", "1.11", "1.12", "2.0a1"]
+    ]
+    assert len(index) == 6
+    assert [p.filename for p in index.get("1.0.0")] == [
+        "foo-1.0.tar.gz",
+        "foo-1.0-py3-none-any.whl",
+    ]
+    assert index.get(Version("1.9"))[0].filename == "foo-1.9.tar.gz"
+    assert index.get("3.0") == []
+    assert "1.10" in index
+    assert "3.0" not in index
+    assert [p.filename for p in index.get("bar")] == ["foo-bar.tar.gz"]
+    assert "bar" in index
+    assert [p.filename for p in index.unversioned] == ["README.txt"]
+
+
+def test_latest() -> None:
+    index = make_page().version_index
+    assert index.latest() == Version("1.12")
+    assert [p.filename for p in index.latest_packages()] == [
+        "foo-1.12-py3-none-any.whl"
+    ]
+    assert index.latest(prereleases=True) == Version("2.0a1")
+    assert index.is_yanked("1.11")
+    assert not index.is_yanked("1.12")
+    assert not index.is_yanked("3.0")
+    assert [p.filename for p in index.latest_packages(yanked=True)] == [
+        "foo-1.12.tar.gz",
+        "foo-1.12-py3-none-any.whl",
+    ]
+
+
+def test_latest_all_yanked() -> None:
+    page = ProjectPage("foo", [pkg("foo-1.0.tar.gz", yanked=True)], None, None)
+    assert page.version_index.latest() is None
+    assert page.version_index.latest_packages() == []
+    assert page.version_index.latest(yanked=True) == Version("1.0")
+
+
+def test_pep700_versions() -> None:
+    index = make_page(versions=["1.0", "3.0", "not a version"]).version_index
+    assert Version("3.0") in list(index)
+    assert "3.0" in index
+    assert Version("3.0.0") in index
+    assert "4.0" not in index
+    assert index.version_set == set(index.versions)
+    assert index.get("3.0") == []
+    # Versions without any files are not "latest":
+    assert index.latest() == Version("1.12")
+    assert "not a version" in index
+
+
+def test_cache_invalidation() -> None:
+    page = make_page()
+    assert page.version_index.latest() == Version("1.12")
+    page.packages.append(pkg("foo-5.0.tar.gz"))
+    del page.version_index
+    assert page.version_index.latest() == Version("5.0")
+
+
+def test_cached_index_does_not_affect_equality() -> None:
+    page = make_page()
+    page.version_index
+    assert page == make_page()
+    assert replace(page).version_index is not page.version_index
@@ -0,0 +1,103 @@
+from __future__ import annotations
+from packaging.tags import Tag, parse_tag
+from pypi_simple import DistributionPackage, ProjectPage, WheelTagIndex
+
+LINUX_311 = [
+    *parse_tag("cp311-cp311-manylinux_2_28_x86_64"),
+    *parse_tag("cp311-cp311-manylinux_2_17_x86_64"),
+    *parse_tag("cp311-abi3-manylinux_2_17_x86_64"),
+    *parse_tag("cp38-abi3-manylinux_2_17_x86_64"),
+    *parse_tag("py3-none-any"),
+]
+
+MACOS_312 = [
+    *parse_tag("cp312-cp312-macosx_11_0_arm64"),
+    *parse_tag("cp312-abi3-macosx_11_0_arm64"),
+    *parse_tag("py3-none-any"),
+]
+
+
+def wheel(filename: str, yanked: bool = False) -> DistributionPackage:
+    return DistributionPackage(
+        filename=filename,
+        url=f"https://test.nil/files/{filename}",
+        project="foo",
+        version=filename.split("-")[1],
+        package_type="wheel" if filename.endswith(".whl") else "sdist",
+        digests={},
+        requires_python=None,
+        has_sig=None,
+        is_yanked=yanked,
+    )
+
+
+PAGE = ProjectPage(
+    project="foo",
+    packages=[
+        wheel("foo-1.0.tar.gz"),
+        wheel("foo-1.0-py3-none-any.whl"),
+        wheel("foo-1.0-cp311-cp311-manylinux_2_17_x86_64.manylinux2014_x86_64.whl"),
+        wheel("foo-2.0-py3-none-any.whl"),
+        wheel("foo-2.0-1-py3-none-any.whl"),
+        wheel("foo-2.0-cp38-abi3-manylinux_2_17_x86_64.whl"),
+        wheel("foo-3.0-cp312-cp312-macosx_11_0_arm64.whl", yanked=True),
+        wheel("foo-3.0.whl"),
+    ],
+    repository_version=None,
+    last_serial=None,
+)
+
+
+def names(pkgs: list[DistributionPackage]) -> list[str]:
+    return [p.filename for p in pkgs]
+
+
+def test_index() -> None:
+    index = PAGE.wheel_tag_index
+    assert isinstance(index, WheelTagIndex)
+    assert index is PAGE.wheel_tag_index
+    assert len(index) == 6
+    assert names(index.invalid) == ["foo-3.0.whl"]
+    assert names(index.get(Tag("py3", "none", "any"))) == [
+        "foo-1.0-py3-none-any.whl",
+        "foo-2.0-py3-none-any.whl",
+        "foo-2.0-1-py3-none-any.whl",
+    ]
+    assert index.tags(PAGE.packages[2]) == frozenset(
+        parse_tag("cp311-cp311-manylinux_2_17_x86_64.manylinux2014_x86_64")
+    )
+    assert index.tags(PAGE.packages[0]) == frozenset()
+
+
+def test_best() -> None:
+    index = PAGE.wheel_tag_index
+    best = index.best(LINUX_311)
+    assert best is not None
+    assert best.filename == (
+        "foo-1.0-cp311-cp311-manylinux_2_17_x86_64.manylinux2014_x86_64.whl"
+    )
+    best = index.best(LINUX_311, version="2.0")
+    assert best is not None
+    assert best.filename == "foo-2.0-cp38-abi3-manylinux_2_17_x86_64.whl"
+    best = index.best(MACOS_312)
+    assert best is not None
+    # Higher build tags win ties:
+    assert best.filename == "foo-2.0-1-py3-none-any.whl"
+    best = index.best(MACOS_312, yanked=True)
+    assert best is not None
+    assert best.filename == "foo-3.0-cp312-cp312-macosx_11_0_arm64.whl"
+    assert index.best(parse_tag("cp27-cp27m-win32")) is None
+
+
+def test_compatible() -> None:
+    index = PAGE.wheel_tag_index
+    assert names(index.compatible(LINUX_311)) == [
+        "foo-1.0-cp311-cp311-manylinux_2_17_x86_64.manylinux2014_x86_64.whl",
+        "foo-2.0-cp38-abi3-manylinux_2_17_x86_64.whl",
+        "foo-2.0-1-py3-none-any.whl",
+        "foo-2.0-py3-none-any.whl",
+        "foo-1.0-py3-none-any.whl",
+    ]
+    assert names(index.compatible(MACOS_312, version="1.0")) == [
+        "foo-1.0-py3-none-any.whl"
+    ]
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from dataclasses import replace
+from datetime import datetime, timezone
+import io
+import json
+from pathlib import Path
+import pytest
+from pypi_simple import (
+    SUPPORTED_REPOSITORY_VERSION,
+    DistributionPackage,
+    IndexPage,
+    ProjectPage,
+    ProjectStatus,
+)
+from pypi_simple.nameindex import NameIndex, write_name_index
+from pypi_simple.writers import (
+    write_index_html,
+    write_index_json,
+    write_project_html,
+    write_project_json,
+)
+
+DATA_DIR = Path(__file__).with_name("data")
+
+
+def to_html(page: ProjectPage) -> str:
+    fp = io.StringIO()
+    write_project_html(page, fp)
+    return fp.getvalue()
+
+
+def to_json(page: ProjectPage) -> str:
+    fp = io.StringIO()
+    write_project_json(page, fp)
+    return fp.getvalue()
+
+
+@pytest.mark.parametrize(
+    "filename", ["argset.json", "argset-700.json", "argset-708.json", "yanked.json"]
+)
+def test_roundtrip_json(filename: str) -> None:
+    base_url = "https://test.nil/simple/argset/"
+    with (DATA_DIR / filename).open() as fp:
+        page = ProjectPage.from_json_data(json.load(fp), base_url=base_url)
+    page2 = ProjectPage.from_json_data(json.loads(to_json(page)), base_url=base_url)
+    expected = replace(page, repository_version=SUPPORTED_REPOSITORY_VERSION)
+    if page.versions is None:
+        expected.versions = sorted({p.version for p in page.packages if p.version})
+    assert page2 == expected
+
+
+@pytest.mark.parametrize(
+    "filename", ["qypi.html", "qypi-708.html", "devpi_devpi.html", "qypi_mixed.html"]
+)
+def test_roundtrip_html(filename: str) -> None:
+    base_url = "https://test.nil/simple/qypi/"
+    page = ProjectPage.from_html("qypi", (DATA_DIR / filename).read_text(), base_url)
+    page2 = ProjectPage.from_html("qypi", to_html(page), base_url)
+    assert page2 == replace(page, repository_version=SUPPORTED_REPOSITORY_VERSION)
+
+
+def test_write_project_all_fields() -> None:
+    pkg = DistributionPackage(
+        filename="foo-1.0-py3-none-any.whl",
+        url="https://test.nil/files/foo-1.0-py3-none-any.whl",
+        project="foo",
+        version="1.0",
+        package_type="wheel",
+        digests={"md5": "0" * 32, "sha256": "1" * 64},
+        requires_python=">=3.8,<4",
+        has_sig=False,
+        is_yanked=True,
+        yanked_reason='Broken "badly" <sorry>',
+        has_metadata=True,
+        metadata_digests={"sha256": "2" * 64},
+        size=1234,
+        upload_time=datetime(2024, 1, 2, 3, 4, 5, 600000, tzinfo=timezone.utc),
+        provenance_url="https://test.nil/files/foo-1.0-py3-none-any.whl.provenance",
+    )
+    page = ProjectPage(
+        project="foo",
+        packages=[pkg],
+        repository_version=None,
+        last_serial="42",
+        versions=["1.0", "2.0"],
+        tracks=["https://upstream.nil/simple/foo/"],
+        alternate_locations=["https://alt.nil/simple/foo/"],
+        status=ProjectStatus.ARCHIVED,
+        status_reason="Done & dusted",
+    )
+    expected = replace(page, repository_version=SUPPORTED_REPOSITORY_VERSION)
+    data = json.loads(to_json(page))
+    assert ProjectPage.from_json_data(data) == expected
+    (entry,) = data["files"]
+    assert entry["core-metadata"] == {"sha256": "2" * 64}
+    assert entry["dist-info-metadata"] == {"sha256": "2" * 64}
+    assert "data-dist-info-metadata" not in entry
+    html = to_html(page)
+    assert 'data-requires-python="&gt;=3.8,&lt;4"' in html
+    assert f'data-core-metadata="sha256={"2" * 64}"' in html
+    assert f'data-dist-info-metadata="sha256={"2" * 64}"' in html
+    assert f'#sha256={"1" * 64}"' in html
+    html_page = ProjectPage.from_html("foo", html)
+    assert html_page == replace(
+        expected,
+        last_serial=None,
+        versions=None,
+        packages=[
+            replace(
+                pkg,
+                digests={"sha256": "1" * 64},
+                size=None,
+                upload_time=None,
+            )
+        ],
+    )
+
+
+def test_write_index_listings(tmp_path: Path) -> None:
+    fp = io.StringIO()
+    assert write_index_json([("Foo.Bar", 3), ("baz", None)], fp, last_serial=7) == 2
+    assert json.loads(fp.getvalue()) == {
+        "meta": {"api-version": SUPPORTED_REPOSITORY_VERSION, "_last-serial": 7},
+        "projects": [{"name": "Foo.Bar", "_last-serial": 3}, {"name": "baz"}],
+    }
+    page = IndexPage(["Foo.Bar", "bäz"], None, None)
+    fp = io.StringIO()
+    write_index_json(page, fp)
+    assert IndexPage.from_json_data(json.loads(fp.getvalue())).projects == [
+        "Foo.Bar",
+        "bäz",
+    ]
+    fp = io.StringIO()
+    assert write_index_html(page, fp) == 2
+    assert '<a href="foo-bar/">Foo.Bar</a>' in fp.getvalue()
+    assert IndexPage.from_html(fp.getvalue()).projects == ["Foo.Bar", "bäz"]
+    with (tmp_path / "names.idx").open("wb") as f:
+        write_name_index(f, {"foo": 1, "bar": 2})
+    with NameIndex.open(tmp_path / "names.idx") as index:
+        fp = io.StringIO()
+        write_index_json(index, fp)
+    assert json.loads(fp.getvalue())["projects"] == [
+        {"name": "bar", "_last-serial": 2},
+        {"name": "foo", "_last-serial": 1},
+    ]
+
+
+def test_write_index_html_escapes_names() -> None:
+    names = ['evil"><script>alert(1)</script>', "a&b", "foo bar?#"]
+    fp = io.StringIO()
+    assert write_index_html(names, fp) == 3
+    html = fp.getvalue()
+    assert "<script>" not in html
+    assert '"><' not in html
+    assert '<a href="a%26b/">a&amp;b</a>' in html
+    assert '<a href="foo%20bar%3F%23/">foo bar?#</a>' in html
+    assert 'href="evil%22%3E%3Cscript%3Ealert%281%29%3C%2Fscript%3E/"' in html
+    page = IndexPage.from_html(html)
+    assert page.projects == names
+
+
+def test_write_large_index_streams() -> None:
+    class CountingWriter(io.StringIO):
+        max_write = 0
+
+        def write(self, s: str) -> int:
+            self.max_write = max(self.max_write, len(s))
+            return super().write(s)
+
+    fp = CountingWriter()
+    n = write_index_json((f"project-{i}" for i in range(100_000)), fp)
+    assert n == 100_000
+    assert fp.max_write < 100
+    assert len(json.loads(fp.getvalue())["projects"]) == 100_000